@@ -0,0 +1,44 @@
+"""add usage event rollups and retention indexes
+
+Revision ID: 20261019_0006
+Revises: 20260409_0005
+Create Date: 2026-10-19 09:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0006"
+down_revision: Union[str, None] = "20260409_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_event_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("workspace_id", sa.Uuid(), nullable=True),
+        sa.Column("event_name", sa.String(length=128), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("distinct_users", sa.Integer(), nullable=False),
+        sa.Column("user_sketch", sa.Text(), nullable=False),
+        sa.Column("rolled_up_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(["workspace_id"], ["workspaces.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("day", "workspace_id", "event_name", name="uq_usage_event_rollups_day_workspace_event"),
+    )
+    op.create_index("ix_usage_event_rollups_workspace_day", "usage_event_rollups", ["workspace_id", "day"], unique=False)
+    op.create_index("ix_usage_events_created_at", "usage_events", ["created_at"], unique=False)
+    op.create_index("ix_usage_events_workspace_created_at", "usage_events", ["workspace_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usage_events_workspace_created_at", table_name="usage_events")
+    op.drop_index("ix_usage_events_created_at", table_name="usage_events")
+    op.drop_index("ix_usage_event_rollups_workspace_day", table_name="usage_event_rollups")
+    op.drop_table("usage_event_rollups")
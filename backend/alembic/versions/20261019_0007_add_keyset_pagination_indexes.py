@@ -0,0 +1,32 @@
+"""add composite indexes backing keyset pagination
+
+Revision ID: 20261019_0007
+Revises: 20261019_0006
+Create Date: 2026-10-19 11:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0007"
+down_revision: Union[str, None] = "20261019_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_projects_workspace_created_id", "projects", ["workspace_id", "created_at", "id"], unique=False)
+    op.create_index("ix_surveys_project_created_id", "surveys", ["project_id", "created_at", "id"], unique=False)
+    op.create_index(
+        "ix_survey_responses_survey_submitted_id", "survey_responses", ["survey_id", "submitted_at", "id"], unique=False
+    )
+    op.create_index("ix_report_jobs_survey_created_id", "report_jobs", ["survey_id", "created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_report_jobs_survey_created_id", table_name="report_jobs")
+    op.drop_index("ix_survey_responses_survey_submitted_id", table_name="survey_responses")
+    op.drop_index("ix_surveys_project_created_id", table_name="surveys")
+    op.drop_index("ix_projects_workspace_created_id", table_name="projects")
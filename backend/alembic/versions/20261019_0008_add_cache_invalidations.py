@@ -0,0 +1,34 @@
+"""add cache invalidation log
+
+Revision ID: 20261019_0008
+Revises: 20261019_0007
+Create Date: 2026-10-19 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0008"
+down_revision: Union[str, None] = "20261019_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_invalidations",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), autoincrement=True, nullable=False),
+        sa.Column("topic", sa.String(length=64), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_cache_invalidations_created_at", "cache_invalidations", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cache_invalidations_created_at", table_name="cache_invalidations")
+    op.drop_table("cache_invalidations")
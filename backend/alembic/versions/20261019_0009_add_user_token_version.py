@@ -0,0 +1,25 @@
+"""add user token version
+
+Revision ID: 20261019_0009
+Revises: 20261019_0008
+Create Date: 2026-10-19 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0009"
+down_revision: Union[str, None] = "20261019_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("token_version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
@@ -0,0 +1,33 @@
+"""add shared rate limit counters
+
+Revision ID: 20261019_0010
+Revises: 20261019_0009
+Create Date: 2026-10-19 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0010"
+down_revision: Union[str, None] = "20261019_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_counters",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("window_index", sa.BigInteger(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("key", "window_index"),
+    )
+    op.create_index("ix_rate_limit_counters_window", "rate_limit_counters", ["window_index"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_counters_window", table_name="rate_limit_counters")
+    op.drop_table("rate_limit_counters")
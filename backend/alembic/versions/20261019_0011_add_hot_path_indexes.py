@@ -0,0 +1,40 @@
+"""add indexes for hot read paths
+
+Revision ID: 20261019_0011
+Revises: 20261019_0010
+Create Date: 2026-10-19 13:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0011"
+down_revision: Union[str, None] = "20261019_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_response_answers_response_id", "response_answers", ["response_id"]),
+    ("ix_survey_questions_survey_order", "survey_questions", ["survey_id", "order_index"]),
+    ("ix_insight_runs_survey_status", "insight_runs", ["survey_id", "status"]),
+    ("ix_insight_summaries_survey_generated", "insight_summaries", ["survey_id", "generated_at"]),
+    ("ix_insight_themes_summary_id", "insight_themes", ["summary_id"]),
+    ("ix_insight_recommendations_summary_id", "insight_recommendations", ["summary_id"]),
+    ("ix_personas_survey_created", "personas", ["survey_id", "created_at"]),
+    ("ix_workspace_members_user_status", "workspace_members", ["user_id", "status"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; on SQLite the flag is ignored.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,30 @@
+"""add report compression and answers-by-question index
+
+Revision ID: 20261019_0012
+Revises: 20261019_0011
+Create Date: 2026-10-19 15:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0012"
+down_revision: Union[str, None] = "20261019_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("report_jobs", sa.Column("compression", sa.String(length=16), nullable=True))
+    # The responses appendix reads answers question by question.
+    with op.get_context().autocommit_block():
+        op.create_index("ix_response_answers_question_id", "response_answers", ["question_id"], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_response_answers_question_id", table_name="response_answers", postgresql_concurrently=True)
+    op.drop_column("report_jobs", "compression")
@@ -0,0 +1,52 @@
+"""add content-addressed export blobs
+
+Revision ID: 20261019_0013
+Revises: 20261019_0012
+Create Date: 2026-10-19 17:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0013"
+down_revision: Union[str, None] = "20261019_0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_blobs",
+        sa.Column("digest", sa.String(length=64), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("render_key", sa.String(length=64), nullable=True),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("digest"),
+    )
+    op.create_index("ix_export_blobs_render_key", "export_blobs", ["render_key"], unique=False)
+    op.create_index("ix_export_blobs_ref_count_accessed", "export_blobs", ["ref_count", "last_accessed_at"], unique=False)
+    # Existing assets keep serving their files from storage_path and are swept like the rest once they expire.
+    with op.batch_alter_table("export_assets") as batch:
+        batch.add_column(sa.Column("blob_id", sa.Uuid(), nullable=True))
+        batch.create_foreign_key("fk_export_assets_blob_id", "export_blobs", ["blob_id"], ["id"])
+    op.create_index("ix_export_assets_blob_id", "export_assets", ["blob_id"], unique=False)
+    op.create_index("ix_export_assets_expires_at", "export_assets", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_assets_expires_at", table_name="export_assets")
+    op.drop_index("ix_export_assets_blob_id", table_name="export_assets")
+    with op.batch_alter_table("export_assets") as batch:
+        batch.drop_constraint("fk_export_assets_blob_id", type_="foreignkey")
+        batch.drop_column("blob_id")
+    op.drop_index("ix_export_blobs_ref_count_accessed", table_name="export_blobs")
+    op.drop_index("ix_export_blobs_render_key", table_name="export_blobs")
+    op.drop_table("export_blobs")
@@ -1,16 +1,24 @@
-from collections import defaultdict, deque
+from collections.abc import Callable
 from dataclasses import dataclass
-from time import monotonic
-from typing import Deque
 from uuid import UUID
 
-from fastapi import HTTPException, Request, status
-from sqlalchemy import select
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models.user import User
+from app.core.security import CurrentUser, get_current_user, get_current_user_async
+from app.db.replicas import caller_key, replicas
+from app.db.session import get_async_db, get_db
+from app.models.project import Project
+from app.models.survey import Survey
 from app.models.workspace import Workspace, WorkspaceMember, WorkspaceRole
+from app.services.membership_cache import MISS, workspace_roles
+from app.services.rate_limit import public_rate_limiter
 
 ROLE_ORDER = {
     WorkspaceRole.viewer: 1,
@@ -20,60 +28,216 @@ ROLE_ORDER = {
 }
 
 
-@dataclass
-class InMemoryRateLimiter:
-    buckets: dict[str, Deque[float]]
+async def enforce_public_rate_limit(request: Request) -> None:
+    client_ip = request.client.host if request.client else "unknown"
+    key = f"{client_ip}:{request.url.path}"
+    limit, window_seconds = settings.PUBLIC_RATE_LIMIT_REQUESTS, settings.PUBLIC_RATE_LIMIT_WINDOW_SECONDS
+    if public_rate_limiter.blocking:
+        decision = await run_in_threadpool(public_rate_limiter.hit, key, limit, window_seconds)
+    else:
+        decision = public_rate_limiter.hit(key, limit, window_seconds)
+    headers = {"X-RateLimit-Limit": str(decision.limit), "X-RateLimit-Remaining": str(decision.remaining)}
+    if not decision.allowed:
+        headers["Retry-After"] = str(decision.retry_after)
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Rate limit exceeded", headers=headers)
+    request.state.rate_limit_headers = headers
 
-    def allow(self, key: str, limit: int, window_seconds: int) -> bool:
-        now = monotonic()
-        bucket = self.buckets.setdefault(key, deque())
-        while bucket and bucket[0] <= now - window_seconds:
-            bucket.popleft()
-        if len(bucket) >= limit:
-            return False
-        bucket.append(now)
-        return True
 
-    def reset(self) -> None:
-        self.buckets.clear()
+class RateLimitHeadersMiddleware:
+    """Copies the headers set by ``enforce_public_rate_limit`` onto the response.
 
+    A plain ASGI middleware rather than a ``response`` dependency parameter, so
+    endpoints that return a ``Response`` themselves (the cached public survey)
+    get the headers too, and streaming bodies pass through untouched.
+    """
 
-public_rate_limiter = InMemoryRateLimiter(buckets=defaultdict(deque))
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-def enforce_public_rate_limit(request: Request) -> None:
-    client_ip = request.client.host if request.client else "unknown"
-    key = f"{client_ip}:{request.url.path}"
-    allowed = public_rate_limiter.allow(
-        key=key,
-        limit=settings.PUBLIC_RATE_LIMIT_REQUESTS,
-        window_seconds=settings.PUBLIC_RATE_LIMIT_WINDOW_SECONDS,
-    )
-    if not allowed:
-        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Rate limit exceeded")
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = scope.get("state", {}).get("rate_limit_headers")
+                if headers:
+                    response_headers = MutableHeaders(scope=message)
+                    for name, value in headers.items():
+                        response_headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class ReadYourWritesMiddleware:
+    """Records callers whose unsafe request succeeded so ``get_read_db`` keeps them on the primary for a while."""
+
+    SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not replicas.enabled or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_record(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                client = scope.get("client")
+                replicas.note_write(caller_key(Headers(scope=scope).get("authorization"), client[0] if client else None))
+            await send(message)
+
+        await self.app(scope, receive, send_and_record)
 
 
 def require_workspace_role(
     db: Session,
-    current_user: User,
+    current_user: CurrentUser,
     workspace_id: UUID,
     minimum_role: WorkspaceRole = WorkspaceRole.viewer,
-) -> WorkspaceMember:
-    workspace = db.get(Workspace, workspace_id)
-    if not workspace:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found")
-
-    member = db.scalar(
-        select(WorkspaceMember).where(
-            WorkspaceMember.workspace_id == workspace_id,
-            WorkspaceMember.user_id == current_user.id,
-            WorkspaceMember.status == "active",
+) -> WorkspaceRole:
+    generation = workspace_roles.generation()
+    role = workspace_roles.get(current_user.id, workspace_id)
+    if role is MISS:
+        workspace = db.get(Workspace, workspace_id)
+        if not workspace:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found")
+
+        role = db.scalar(
+            select(WorkspaceMember.role).where(
+                WorkspaceMember.workspace_id == workspace_id,
+                WorkspaceMember.user_id == current_user.id,
+                WorkspaceMember.status == "active",
+            )
         )
-    )
-    if not member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a workspace member")
+        workspace_roles.put(current_user.id, workspace_id, role, generation)
+    _check_role(role, minimum_role)
+    return role
+
+
+@dataclass(frozen=True)
+class ProjectAccess:
+    project: Project
+    member: WorkspaceMember | None
+
+
+@dataclass(frozen=True)
+class SurveyAccess:
+    survey: Survey
+    project: Project
+    member: WorkspaceMember | None
 
-    if ROLE_ORDER[member.role] < ROLE_ORDER[minimum_role]:
+
+def _check_role(role: WorkspaceRole | None, minimum_role: WorkspaceRole) -> None:
+    if role is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a workspace member")
+    if ROLE_ORDER[role] < ROLE_ORDER[minimum_role]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
 
-    return member
+
+def _active_membership(user_id: UUID):
+    return and_(
+        WorkspaceMember.workspace_id == Workspace.id,
+        WorkspaceMember.user_id == user_id,
+        WorkspaceMember.status == "active",
+    )
+
+
+def _request_memo(request: Request) -> dict:
+    memo = getattr(request.state, "authz", None)
+    if memo is None:
+        memo = request.state.authz = {}
+    return memo
+
+
+def resolve_survey_access(request: Request, db: Session, user: CurrentUser, survey_id: UUID) -> SurveyAccess:
+    """Load survey, project, workspace and the caller's membership in one query, once per request."""
+    memo = _request_memo(request)
+    key = ("survey", survey_id, user.id)
+    if key not in memo:
+        generation = workspace_roles.generation()
+        row = db.execute(
+            select(Survey, Project, Workspace.id, WorkspaceMember)
+            .outerjoin(Project, Project.id == Survey.project_id)
+            .outerjoin(Workspace, Workspace.id == Project.workspace_id)
+            .outerjoin(WorkspaceMember, _active_membership(user.id))
+            .where(Survey.id == survey_id)
+        ).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Survey not found")
+        survey, project, workspace_id, member = row
+        if project is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        if workspace_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found")
+        workspace_roles.put(user.id, workspace_id, member.role if member else None, generation)
+        memo[key] = SurveyAccess(survey=survey, project=project, member=member)
+    return memo[key]
+
+
+def resolve_project_access(request: Request, db: Session, user: CurrentUser, project_id: UUID) -> ProjectAccess:
+    memo = _request_memo(request)
+    key = ("project", project_id, user.id)
+    if key not in memo:
+        generation = workspace_roles.generation()
+        row = db.execute(
+            select(Project, Workspace.id, WorkspaceMember)
+            .outerjoin(Workspace, Workspace.id == Project.workspace_id)
+            .outerjoin(WorkspaceMember, _active_membership(user.id))
+            .where(Project.id == project_id)
+        ).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        project, workspace_id, member = row
+        if workspace_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found")
+        workspace_roles.put(user.id, workspace_id, member.role if member else None, generation)
+        memo[key] = ProjectAccess(project=project, member=member)
+    return memo[key]
+
+
+def survey_with_role(minimum_role: WorkspaceRole) -> Callable[..., SurveyAccess]:
+    def dependency(
+        survey_id: UUID,
+        request: Request,
+        db: Session = Depends(get_db),
+        user: CurrentUser = Depends(get_current_user),
+    ) -> SurveyAccess:
+        access = resolve_survey_access(request, db, user, survey_id)
+        _check_role(access.member.role if access.member else None, minimum_role)
+        return access
+
+    return dependency
+
+
+def project_with_role(minimum_role: WorkspaceRole) -> Callable[..., ProjectAccess]:
+    def dependency(
+        project_id: UUID,
+        request: Request,
+        db: Session = Depends(get_db),
+        user: CurrentUser = Depends(get_current_user),
+    ) -> ProjectAccess:
+        access = resolve_project_access(request, db, user, project_id)
+        _check_role(access.member.role if access.member else None, minimum_role)
+        return access
+
+    return dependency
+
+
+def survey_with_role_async(minimum_role: WorkspaceRole) -> Callable[..., SurveyAccess]:
+    """``survey_with_role`` for ``async def`` endpoints; the same lookup runs on the request's ``AsyncSession``."""
+
+    async def dependency(
+        survey_id: UUID,
+        request: Request,
+        db: AsyncSession = Depends(get_async_db),
+        user: CurrentUser = Depends(get_current_user_async),
+    ) -> SurveyAccess:
+        access = await db.run_sync(lambda session: resolve_survey_access(request, session, user, survey_id))
+        _check_role(access.member.role if access.member else None, minimum_role)
+        return access
+
+    return dependency
@@ -0,0 +1,78 @@
+from datetime import UTC, date, datetime, timedelta
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.v1.deps import require_workspace_role
+from app.core.security import CurrentUser, get_current_user
+from app.db.replicas import get_read_db
+from app.db.session import get_db
+from app.models.hardening import UsageEventRollup
+from app.models.workspace import WorkspaceRole
+from app.schemas.analytics import AnalyticsDailyCount, AnalyticsEventSummary, AnalyticsOverview
+from app.services.usage_rollups import HyperLogLog
+
+router = APIRouter()
+
+MAX_OVERVIEW_DAYS = 366
+
+
+@router.get("/workspaces/{workspace_id}/analytics/overview", response_model=AnalyticsOverview)
+def get_analytics_overview(
+    workspace_id: UUID,
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
+    user: CurrentUser = Depends(get_current_user),
+) -> AnalyticsOverview:
+    require_workspace_role(db, user, workspace_id, WorkspaceRole.viewer)
+    to_date = to_date or datetime.now(UTC).date()
+    from_date = from_date or to_date - timedelta(days=29)
+    if from_date > to_date:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="'from' must not be after 'to'")
+    if (to_date - from_date).days >= MAX_OVERVIEW_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Date range cannot exceed {MAX_OVERVIEW_DAYS} days",
+        )
+
+    # Served from daily rollups only; raw usage_events are never scanned here.
+    rows = read_db.execute(
+        select(
+            UsageEventRollup.day,
+            UsageEventRollup.event_name,
+            UsageEventRollup.event_count,
+            UsageEventRollup.user_sketch,
+        ).where(
+            UsageEventRollup.workspace_id == workspace_id,
+            UsageEventRollup.day >= from_date,
+            UsageEventRollup.day <= to_date,
+        )
+    ).all()
+
+    overall = HyperLogLog()
+    per_event: dict[str, tuple[int, HyperLogLog]] = {}
+    per_day: dict[date, int] = {}
+    for day, event_name, event_count, user_sketch in rows:
+        sketch = HyperLogLog.from_text(user_sketch)
+        overall.merge(sketch)
+        count, event_sketch = per_event.get(event_name, (0, HyperLogLog()))
+        event_sketch.merge(sketch)
+        per_event[event_name] = (count + event_count, event_sketch)
+        per_day[day] = per_day.get(day, 0) + event_count
+
+    return AnalyticsOverview(
+        workspace_id=workspace_id,
+        from_date=from_date,
+        to_date=to_date,
+        total_events=sum(per_day.values()),
+        distinct_users=overall.estimate(),
+        events=[
+            AnalyticsEventSummary(event_name=name, count=count, distinct_users=sketch.estimate())
+            for name, (count, sketch) in sorted(per_event.items(), key=lambda item: (-item[1][0], item[0]))
+        ],
+        daily=[AnalyticsDailyCount(day=day, count=count) for day, count in sorted(per_day.items())],
+    )
@@ -4,20 +4,23 @@ from urllib.parse import urlencode
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.security import (
+    access_token_claims,
+    check_token_version,
     create_access_token,
     create_password_reset_token,
     create_refresh_token,
     decode_token,
-    get_current_user,
-    get_password_hash,
-    verify_password,
+    get_current_db_user,
+    token_user_id,
 )
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.user import User
 from app.models.workspace import WorkspaceInvitation, WorkspaceMember
 from app.schemas.auth import (
@@ -34,12 +37,16 @@ from app.schemas.auth import (
     VerifyResetTokenRequest,
 )
 from app.services.email import send_password_reset_email, send_welcome_email
+from app.services.invalidation import MEMBERSHIP_TOPIC, TOKEN_VERSION_TOPIC, invalidation_bus
+from app.services.membership_cache import membership_key
+from app.services.password_hashing import HasherBusyError, password_hasher
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def _claim_workspace_invitations(db: Session, user: User) -> None:
+def _claim_workspace_invitations(db: Session, user: User) -> list[UUID]:
+    """Turn pending invitations into memberships; returns the workspaces joined so callers can invalidate after commit."""
     invitations = db.scalars(
         select(WorkspaceInvitation).where(
             WorkspaceInvitation.email == user.email,
@@ -47,6 +54,7 @@ def _claim_workspace_invitations(db: Session, user: User) -> None:
         )
     ).all()
 
+    claimed: list[UUID] = []
     for invitation in invitations:
         existing_membership = db.scalar(
             select(WorkspaceMember).where(
@@ -66,65 +74,97 @@ def _claim_workspace_invitations(db: Session, user: User) -> None:
                 status="active",
             )
         )
+        claimed.append(invitation.workspace_id)
         db.delete(invitation)
+    return claimed
 
 
+async def _hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HasherBusyError as exc:
+        raise _hasher_busy() from exc
+
+
+async def _verify_password(password: str, password_hash: str) -> bool:
+    try:
+        return await password_hasher.verify(password, password_hash)
+    except HasherBusyError as exc:
+        raise _hasher_busy() from exc
+
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy. Please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _issue_tokens(user: User) -> TokenPair:
+    return TokenPair(
+        access_token=create_access_token(
+            str(user.id),
+            timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            access_token_claims(user),
+        ),
+        refresh_token=create_refresh_token(
+            str(user.id),
+            timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            {"ver": user.token_version},
+        ),
+        token_type="bearer",
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+# Register, login and reset await the hasher pool, so they use the AsyncSession and never block the event loop on the database.
 @router.post("/register", response_model=AuthSession, status_code=status.HTTP_201_CREATED)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> AuthSession:
-    existing = db.scalar(select(User).where(User.email == payload.email.lower()))
+async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_async_db)) -> AuthSession:
+    existing = await db.scalar(select(User).where(User.email == payload.email.lower()))
     if existing:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
 
     user = User(
         email=payload.email.lower(),
         full_name=payload.full_name,
-        password_hash=get_password_hash(payload.password),
+        password_hash=await _hash_password(payload.password),
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
-    _claim_workspace_invitations(db, user)
-    db.commit()
-    if not send_welcome_email(user.email, user.full_name):
+    await db.commit()
+    await db.refresh(user)
+    claimed = await db.run_sync(_claim_workspace_invitations, user)
+    await db.commit()
+    for workspace_id in claimed:
+        await run_in_threadpool(invalidation_bus.publish, MEMBERSHIP_TOPIC, membership_key(workspace_id, user.id))
+    if not await run_in_threadpool(send_welcome_email, user.email, user.full_name):
         logger.warning("Welcome email delivery failed for user_id=%s email=%s", user.id, user.email)
 
-    tokens = TokenPair(
-        access_token=create_access_token(str(user.id), timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)),
-        refresh_token=create_refresh_token(str(user.id), timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)),
-        token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
+    tokens = _issue_tokens(user)
     return AuthSession(user=UserProfile.model_validate(user), tokens=tokens)
 
 
 @router.post("/login", response_model=AuthSession)
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> AuthSession:
-    user = db.scalar(select(User).where(User.email == payload.email.lower()))
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_async_db)) -> AuthSession:
+    user = await db.scalar(select(User).where(User.email == payload.email.lower()))
+    if not user or not await _verify_password(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    tokens = TokenPair(
-        access_token=create_access_token(str(user.id), timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)),
-        refresh_token=create_refresh_token(str(user.id), timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)),
-        token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
+    tokens = _issue_tokens(user)
     return AuthSession(user=UserProfile.model_validate(user), tokens=tokens)
 
 
 @router.post("/refresh", response_model=TokenPair)
-def refresh(_: RefreshRequest) -> TokenPair:
+def refresh(_: RefreshRequest, db: Session = Depends(get_db)) -> TokenPair:
     token_payload = decode_token(_.refresh_token, expected_type="refresh")
-    user_id = token_payload.get("sub")
-    if not user_id:
+    if not token_payload.get("sub"):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    return TokenPair(
-        access_token=create_access_token(user_id, timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)),
-        refresh_token=create_refresh_token(user_id, timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)),
-        token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
+    user = db.get(User, token_user_id(token_payload))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    check_token_version(token_payload, user.token_version)
+    return _issue_tokens(user)
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
@@ -168,7 +208,7 @@ def verify_reset_token(payload: VerifyResetTokenRequest, db: Session = Depends(g
 
 
 @router.post("/password/reset", response_model=ForgotPasswordResponse)
-def reset_password(payload: ResetPasswordRequest, db: Session = Depends(get_db)) -> ForgotPasswordResponse:
+async def reset_password(payload: ResetPasswordRequest, db: AsyncSession = Depends(get_async_db)) -> ForgotPasswordResponse:
     token_payload = decode_token(payload.token, expected_type="password_reset")
     user_id = token_payload.get("sub")
     if not user_id:
@@ -179,17 +219,18 @@ def reset_password(payload: ResetPasswordRequest, db: Session = Depends(get_db))
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
-    user = db.get(User, user_uuid)
+    user = await db.get(User, user_uuid)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user.password_hash = get_password_hash(payload.new_password)
-    db.add(user)
-    db.commit()
+    user.password_hash = await _hash_password(payload.new_password)
+    user.token_version += 1
+    await db.commit()
+    await run_in_threadpool(invalidation_bus.publish, TOKEN_VERSION_TOPIC, user_uuid)
 
     return ForgotPasswordResponse(message="Password reset successful.")
 
 
 @router.get("/me", response_model=UserProfile)
-def me(user: User = Depends(get_current_user)) -> UserProfile:
+def me(user: User = Depends(get_current_db_user)) -> UserProfile:
     return UserProfile.model_validate(user)
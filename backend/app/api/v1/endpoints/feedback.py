@@ -1,12 +1,16 @@
-from datetime import UTC, datetime
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
 from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import enforce_public_rate_limit, require_workspace_role
-from app.core.security import get_current_user
+from app.api.v1.deps import SurveyAccess, enforce_public_rate_limit, survey_with_role, survey_with_role_async
+from app.api.v1.loaders import RequestLoaders, get_loaders
+from app.api.v1.pagination import paginate
+from app.api.v1.responses import FastJSONResponse
+from app.core.security import CurrentUser, get_current_user
+from app.db.replicas import get_async_read_db, get_read_db
 from app.db.session import get_db
 from app.models.feedback import (
     InsightRecommendation,
@@ -15,12 +19,9 @@ from app.models.feedback import (
     InsightSummary,
     InsightTheme,
     Persona,
-    ResponseAnswer,
     SurveyResponse,
 )
-from app.models.project import Project
-from app.models.survey import Survey, SurveyPublication, SurveyQuestion, SurveyStatus
-from app.models.user import User
+from app.models.survey import SurveyPublication, SurveyStatus
 from app.models.workspace import WorkspaceRole
 from app.schemas.feedback import (
     CompletionMetric,
@@ -32,43 +33,48 @@ from app.schemas.feedback import (
     InsightsRunRequest,
     PersonaGenerateRequest,
     PersonaList,
-    PersonaOut,
     PublicResponseSubmitRequest,
     ResponseAccepted,
-    ResponseAnswerOut,
     SurveyResponseList,
     SurveyResponseOut,
 )
 from app.services.events import log_audit_event, log_usage_event
+from app.services.ingestion import QueueFullError, submission_buffer
 from app.services.insights import generate_personas_for_survey, run_insight_analysis
+from app.services.submissions import (
+    SubmissionValidationError,
+    get_submission_plan,
+    insert_submissions,
+    new_pending_submission,
+)
 
 router = APIRouter()
 public_router = APIRouter(dependencies=[Depends(enforce_public_rate_limit)])
 
 
-def _get_survey_or_404(db: Session, survey_id: UUID) -> Survey:
-    survey = db.get(Survey, survey_id)
-    if not survey:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Survey not found")
-    return survey
-
-
-def _get_project_or_404(db: Session, project_id: UUID) -> Project:
-    project = db.get(Project, project_id)
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    return project
+def _response_item(loaders: RequestLoaders, row: SurveyResponse) -> dict:
+    """``SurveyResponseOut`` as a plain dict; list pages serialise these without building models."""
+    return {
+        "id": row.id,
+        "survey_id": row.survey_id,
+        "submitted_at": row.submitted_at,
+        "respondent_meta": row.respondent_meta,
+        "answers": [{"question_id": a.question_id, "value": a.value} for a in loaders.answers.load(row.id)],
+    }
 
 
-def _response_out(db: Session, row: SurveyResponse) -> SurveyResponseOut:
-    answers = db.scalars(select(ResponseAnswer).where(ResponseAnswer.response_id == row.id)).all()
-    return SurveyResponseOut(
-        id=row.id,
-        survey_id=row.survey_id,
-        submitted_at=row.submitted_at,
-        respondent_meta=row.respondent_meta,
-        answers=[ResponseAnswerOut(question_id=a.question_id, value=a.value) for a in answers],
-    )
+def _persona_item(row: Persona) -> dict:
+    return {
+        "id": row.id,
+        "survey_id": row.survey_id,
+        "run_id": row.run_id,
+        "name": row.name,
+        "summary": row.summary,
+        "key_traits": row.key_traits,
+        "frustrations": row.frustrations,
+        "goals": row.goals,
+        "confidence": row.confidence,
+    }
 
 
 def _build_insight_bundle(db: Session, summary: InsightSummary) -> InsightBundle:
@@ -108,94 +114,94 @@ def submit_public_response(
     public_slug: str,
     payload: PublicResponseSubmitRequest,
     background_tasks: BackgroundTasks,
+    response: Response,
     db: Session = Depends(get_db),
 ) -> ResponseAccepted:
-    publication = db.scalar(select(SurveyPublication).where(SurveyPublication.public_slug == public_slug))
+    publication = db.execute(
+        select(SurveyPublication.survey_id, SurveyPublication.status).where(SurveyPublication.public_slug == public_slug)
+    ).one_or_none()
     if not publication:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Survey not found")
     if publication.status != SurveyStatus.published:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Survey is not currently accepting responses.")
 
-    survey = db.get(Survey, publication.survey_id)
-    questions = db.scalars(select(SurveyQuestion).where(SurveyQuestion.survey_id == survey.id)).all()
-    question_map = {q.id: q for q in questions}
-    required_ids = {q.id for q in questions if q.required}
-    submitted_ids = {a.question_id for a in payload.answers}
-    missing = required_ids - submitted_ids
-    if missing:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Missing required answers")
-
-    for answer in payload.answers:
-        if answer.question_id not in question_map:
-            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid question_id")
-
-    response = SurveyResponse(
-        survey_id=survey.id,
-        submitted_at=datetime.now(UTC),
-        respondent_meta=payload.respondent_meta,
-    )
-    db.add(response)
-    db.flush()
-
-    for answer in payload.answers:
-        db.add(
-            ResponseAnswer(
-                response_id=response.id,
-                question_id=answer.question_id,
-                value=answer.value,
-            )
+    answers = [(answer.question_id, answer.value) for answer in payload.answers]
+    plan = get_submission_plan(db, publication.survey_id)
+    try:
+        plan.validate(answers)
+    except SubmissionValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+    submission = new_pending_submission(publication.survey_id, answers, payload.respondent_meta, plan.workspace_id)
+    if submission_buffer.enabled:
+        try:
+            submission_buffer.enqueue(submission)
+        except QueueFullError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Submission queue is full. Please retry shortly.",
+                headers={"Retry-After": "1"},
+            ) from exc
+        response.status_code = status.HTTP_202_ACCEPTED
+        return ResponseAccepted(
+            response_id=submission.response_id,
+            survey_id=submission.survey_id,
+            status="queued",
+            submitted_at=submission.submitted_at,
         )
-    db.commit()
-    db.refresh(response)
 
-    # Auto-trigger an insight run for latest responses.
-    run = InsightRun(survey_id=survey.id, status=InsightRunStatus.queued)
-    db.add(run)
-    log_usage_event(db, event_name="response.submitted", payload={"survey_id": str(survey.id)})
+    # Auto-trigger an insight run for latest responses; it is queued in the same transaction.
+    run_ids = insert_submissions(db, [submission])
     db.commit()
-    db.refresh(run)
-    background_tasks.add_task(run_insight_analysis, run.id)
+    for run_id in run_ids:
+        background_tasks.add_task(run_insight_analysis, run_id)
 
     return ResponseAccepted(
-        response_id=response.id,
-        survey_id=survey.id,
+        response_id=submission.response_id,
+        survey_id=submission.survey_id,
         status="accepted",
-        submitted_at=response.submitted_at,
+        submitted_at=submission.submitted_at,
     )
 
 
 @router.get("/surveys/{survey_id}/responses", response_model=SurveyResponseList)
-def list_responses(
+async def list_responses(
     survey_id: UUID,
     cursor: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=100),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-) -> SurveyResponseList:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.viewer)
+    access: SurveyAccess = Depends(survey_with_role_async(WorkspaceRole.viewer)),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> FastJSONResponse:
+    def build_page(session: Session) -> FastJSONResponse:
+        loaders = RequestLoaders(session)
+        rows, next_cursor = paginate(
+            session,
+            select(SurveyResponse).where(SurveyResponse.survey_id == survey_id),
+            sort_column=SurveyResponse.submitted_at,
+            id_column=SurveyResponse.id,
+            scope=f"responses:{survey_id}",
+            cursor=cursor,
+            limit=limit,
+        )
+        loaders.answers.load_many(row.id for row in rows)
+        items = [_response_item(loaders, row) for row in rows]
+        return FastJSONResponse({"items": items, "next_cursor": next_cursor, "count": len(items)})
 
-    rows = db.scalars(
-        select(SurveyResponse).where(SurveyResponse.survey_id == survey_id).order_by(SurveyResponse.submitted_at.desc()).limit(limit)
-    ).all()
-    return SurveyResponseList(items=[_response_out(db, row) for row in rows], count=len(rows))
+    return await db.run_sync(build_page)
 
 
 @router.get("/surveys/{survey_id}/responses/{response_id}", response_model=SurveyResponseOut)
 def get_response(
     survey_id: UUID,
     response_id: UUID,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.viewer)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
 ) -> SurveyResponseOut:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.viewer)
     row = db.scalar(select(SurveyResponse).where(SurveyResponse.id == response_id, SurveyResponse.survey_id == survey_id))
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Response not found")
-    return _response_out(db, row)
+    return SurveyResponseOut.model_validate(_response_item(loaders, row))
 
 
 @router.post("/surveys/{survey_id}/insights/run", response_model=InsightRunAccepted, status_code=status.HTTP_202_ACCEPTED)
@@ -203,12 +209,11 @@ def run_insights(
     survey_id: UUID,
     _: InsightsRunRequest,
     background_tasks: BackgroundTasks,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> InsightRunAccepted:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
+    project = access.project
     run = InsightRun(survey_id=survey_id, status=InsightRunStatus.queued)
     db.add(run)
     log_audit_event(
@@ -234,37 +239,32 @@ def run_insights(
 
 
 @router.get("/surveys/{survey_id}/insights/latest", response_model=InsightBundle)
-def latest_insights(
+async def latest_insights(
     survey_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    access: SurveyAccess = Depends(survey_with_role_async(WorkspaceRole.viewer)),
+    db: AsyncSession = Depends(get_async_read_db),
 ) -> InsightBundle:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.viewer)
-    summary = db.scalar(select(InsightSummary).where(InsightSummary.survey_id == survey_id).order_by(InsightSummary.generated_at.desc()))
+    summary = await db.scalar(
+        select(InsightSummary).where(InsightSummary.survey_id == survey_id).order_by(InsightSummary.generated_at.desc()).limit(1)
+    )
     if not summary:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No insights available")
-    return _build_insight_bundle(db, summary)
+    return await db.run_sync(_build_insight_bundle, summary)
 
 
 @router.get("/surveys/{survey_id}/insights/runs/{run_id}", response_model=InsightRunDetail)
-def insight_run_detail(
+async def insight_run_detail(
     survey_id: UUID,
     run_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    access: SurveyAccess = Depends(survey_with_role_async(WorkspaceRole.viewer)),
+    db: AsyncSession = Depends(get_async_read_db),
 ) -> InsightRunDetail:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.viewer)
-
-    run = db.scalar(select(InsightRun).where(InsightRun.id == run_id, InsightRun.survey_id == survey_id))
+    run = await db.scalar(select(InsightRun).where(InsightRun.id == run_id, InsightRun.survey_id == survey_id))
     if not run:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Insight run not found")
 
-    summary = db.scalar(select(InsightSummary).where(InsightSummary.run_id == run.id))
-    bundle = _build_insight_bundle(db, summary) if summary else None
+    summary = await db.scalar(select(InsightSummary).where(InsightSummary.run_id == run.id))
+    bundle = await db.run_sync(_build_insight_bundle, summary) if summary else None
     return InsightRunDetail(
         run_id=run.id,
         survey_id=run.survey_id,
@@ -280,67 +280,33 @@ def insight_run_detail(
 def generate_personas(
     survey_id: UUID,
     _: PersonaGenerateRequest,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-) -> PersonaList:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
+) -> FastJSONResponse:
     generate_personas_for_survey(survey_id)
     rows = db.scalars(select(Persona).where(Persona.survey_id == survey_id).order_by(Persona.created_at.desc())).all()
-    items = [
-        PersonaOut(
-            id=row.id,
-            survey_id=row.survey_id,
-            run_id=row.run_id,
-            name=row.name,
-            summary=row.summary,
-            key_traits=row.key_traits,
-            frustrations=row.frustrations,
-            goals=row.goals,
-            confidence=row.confidence,
-        )
-        for row in rows
-    ]
-    return PersonaList(items=items, count=len(items))
+    items = [_persona_item(row) for row in rows]
+    return FastJSONResponse({"items": items, "count": len(items)})
 
 
 @router.get("/surveys/{survey_id}/personas", response_model=PersonaList)
 def list_personas(
     survey_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-) -> PersonaList:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.viewer)
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.viewer)),
+    db: Session = Depends(get_read_db),
+) -> FastJSONResponse:
     rows = db.scalars(select(Persona).where(Persona.survey_id == survey_id).order_by(Persona.created_at.desc())).all()
-    items = [
-        PersonaOut(
-            id=row.id,
-            survey_id=row.survey_id,
-            run_id=row.run_id,
-            name=row.name,
-            summary=row.summary,
-            key_traits=row.key_traits,
-            frustrations=row.frustrations,
-            goals=row.goals,
-            confidence=row.confidence,
-        )
-        for row in rows
-    ]
-    return PersonaList(items=items, count=len(items))
+    items = [_persona_item(row) for row in rows]
+    return FastJSONResponse({"items": items, "count": len(items)})
 
 
 @router.get("/surveys/{survey_id}/analytics/completion", response_model=CompletionMetric)
 def completion_metric(
     survey_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.viewer)),
+    db: Session = Depends(get_read_db),
 ) -> CompletionMetric:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.viewer)
+    survey = access.survey
 
     total_responses = db.scalar(select(func.count(SurveyResponse.id)).where(SurveyResponse.survey_id == survey_id)) or 0
     generated_ai_surveys = 1 if survey.generated_by_ai else 0
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy import inspect, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.replicas import replicas
+from app.db.session import get_db, pool_monitors
+from app.services.events import event_pipeline
+from app.services.exports import export_sweeper
+from app.services.ingestion import submission_buffer
+from app.services.invalidation import invalidation_bus
+from app.services.membership_cache import workspace_roles
+from app.services.password_hashing import password_hasher
+from app.services.rate_limit import public_rate_limiter
+from app.services.report_workers import report_renderer
+from app.services.reporting import render_cache_stats
+from app.services.survey_cache import public_surveys
+from app.services.token_versions import token_versions
 
 router = APIRouter()
 
@@ -38,7 +52,12 @@ def ready(db: Session = Depends(get_db)) -> dict:
             detail={"status": "not_ready", "checks": {"db": "error"}, "error": str(exc)},
         ) from exc
 
-    return {"status": "ready", "checks": checks}
+    pools = {name: monitor.metrics() for name, monitor in pool_monitors.items()}
+    saturated = any(pool["in_use"] >= pool["pool_size"] + pool["max_overflow"] for pool in pools.values())
+    checks["db_pool"] = "saturated" if saturated else "ok"
+    if replicas.enabled:
+        checks["replicas"] = "ok" if any(replica.usable for replica in replicas.replicas) else "primary_fallback"
+    return {"status": "ready", "checks": checks, "pools": pools}
 
 
 @router.get("/meta")
@@ -47,3 +66,34 @@ def meta() -> dict[str, str]:
         "service": settings.APP_SLUG,
         "version": settings.APP_VERSION,
     }
+
+
+def require_metrics_token(authorization: str | None = Header(default=None)) -> None:
+    # Metrics expose internal queue, cache and storage state, so the route only exists once a token is configured.
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+def metrics() -> dict:
+    return {
+        "ingestion": submission_buffer.metrics(),
+        "events": event_pipeline.metrics(),
+        "public_survey_cache": public_surveys.metrics(),
+        "membership_cache": workspace_roles.metrics(),
+        "token_versions": token_versions.metrics(),
+        "password_hashing": password_hasher.metrics(),
+        "public_rate_limit": public_rate_limiter.metrics(),
+        "cache_invalidation": invalidation_bus.metrics(),
+        "read_replicas": replicas.metrics(),
+        "report_render_cache": dict(render_cache_stats),
+        "report_rendering": report_renderer.metrics(),
+        "export_storage": export_sweeper.metrics(),
+    }
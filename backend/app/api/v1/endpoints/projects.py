@@ -5,10 +5,10 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.v1.deps import require_workspace_role
-from app.core.security import get_current_user
+from app.api.v1.pagination import paginate
+from app.core.security import CurrentUser, get_current_user
 from app.db.session import get_db
 from app.models.project import Project
-from app.models.user import User
 from app.models.workspace import WorkspaceRole
 from app.schemas.project import ProjectCreateRequest, ProjectListResponse, ProjectResponse, ProjectUpdateRequest
 from app.services.events import log_audit_event, log_usage_event
@@ -21,7 +21,7 @@ def create_project(
     workspace_id: UUID,
     payload: ProjectCreateRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> ProjectResponse:
     require_workspace_role(db, user, workspace_id, WorkspaceRole.editor)
     project = Project(
@@ -61,7 +61,7 @@ def list_projects(
     cursor: str | None = Query(default=None),
     limit: int = Query(default=20, ge=1, le=100),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> ProjectListResponse:
     require_workspace_role(db, user, workspace_id, WorkspaceRole.viewer)
 
@@ -69,10 +69,18 @@ def list_projects(
     if status_filter:
         query = query.where(Project.status == status_filter)
 
-    projects = db.scalars(query.order_by(Project.created_at.desc()).limit(limit)).all()
+    projects, next_cursor = paginate(
+        db,
+        query,
+        sort_column=Project.created_at,
+        id_column=Project.id,
+        scope=f"projects:{workspace_id}:{status_filter or ''}",
+        cursor=cursor,
+        limit=limit,
+    )
     return ProjectListResponse(
         items=[ProjectResponse.model_validate(item) for item in projects],
-        next_cursor=None,
+        next_cursor=next_cursor,
         count=len(projects),
     )
 
@@ -81,7 +89,7 @@ def list_projects(
 def get_project(
     project_id: UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> ProjectResponse:
     project = db.get(Project, project_id)
     if not project:
@@ -95,7 +103,7 @@ def update_project(
     project_id: UUID,
     payload: ProjectUpdateRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> ProjectResponse:
     project = db.get(Project, project_id)
     if not project:
@@ -119,7 +127,7 @@ def update_project(
 def archive_project(
     project_id: UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     project = db.get(Project, project_id)
     if not project:
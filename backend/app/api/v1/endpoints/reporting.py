@@ -2,22 +2,23 @@ from datetime import UTC, datetime
 from pathlib import Path
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import require_workspace_role
-from app.core.security import get_current_user
-from app.db.session import get_db
-from app.models.hardening import ExportAsset, ReportJob, ReportStatus
-from app.models.project import Project
-from app.models.survey import Survey
-from app.models.user import User
+from app.api.v1.deps import SurveyAccess, survey_with_role, survey_with_role_async
+from app.api.v1.loaders import RequestLoaders, get_read_loaders
+from app.api.v1.pagination import paginate
+from app.api.v1.responses import FastJSONResponse
+from app.core.security import CurrentUser, get_current_user, get_current_user_async
+from app.db.replicas import get_read_db
+from app.db.session import get_async_db, get_db
+from app.models.hardening import ExportAsset, ExportBlob, ReportJob, ReportStatus
 from app.models.workspace import WorkspaceRole
 from app.schemas.reporting import (
     DownloadAssetResponse,
-    ReportAssetOut,
     ReportCreateRequest,
     ReportJobAccepted,
     ReportJobList,
@@ -25,57 +26,74 @@ from app.schemas.reporting import (
     TrackEventRequest,
 )
 from app.services.events import log_audit_event, log_usage_event
+from app.services.export_storage import get_export_storage
+from app.services.exports import touch_blob
+from app.services.report_workers import RenderQueueFullError, report_renderer
 from app.services.reporting import generate_report_job
 
 router = APIRouter()
 
 
-def _get_survey_and_workspace(db: Session, survey_id: UUID) -> tuple[Survey, UUID]:
-    survey = db.get(Survey, survey_id)
-    if not survey:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Survey not found")
-    project = db.get(Project, survey.project_id)
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    return survey, project.workspace_id
-
-
-def _job_out(db: Session, job: ReportJob) -> ReportJobOut:
-    asset = db.scalar(select(ExportAsset).where(ExportAsset.report_job_id == job.id))
-    asset_out = None
+def _job_item(loaders: RequestLoaders, job: ReportJob) -> dict:
+    """``ReportJobOut`` as a plain dict; list pages serialise these without building models."""
+    asset = loaders.assets.load(job.id)
+    asset_item = None
     if asset:
-        asset_out = ReportAssetOut(
-            asset_id=asset.id,
-            file_name=asset.file_name,
-            mime_type=asset.mime_type,
-            expires_at=asset.expires_at,
-            download_token=asset.download_token,
-        )
-    return ReportJobOut(
-        id=job.id,
-        survey_id=job.survey_id,
-        status=job.status,
-        format=job.format,
-        template=job.template,
-        include_sections=job.include_sections,
-        created_at=job.created_at,
-        updated_at=job.updated_at,
-        completed_at=job.completed_at,
-        error=job.error,
-        asset=asset_out,
-    )
+        asset_item = {
+            "asset_id": asset.id,
+            "file_name": asset.file_name,
+            "mime_type": asset.mime_type,
+            "expires_at": asset.expires_at,
+            "download_token": asset.download_token,
+        }
+    return {
+        "id": job.id,
+        "survey_id": job.survey_id,
+        "status": job.status,
+        "format": job.format,
+        "template": job.template,
+        "include_sections": job.include_sections,
+        "compression": job.compression,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "completed_at": job.completed_at,
+        "error": job.error,
+        "asset": asset_item,
+    }
 
 
 @router.post("/surveys/{survey_id}/reports", response_model=ReportJobAccepted, status_code=status.HTTP_202_ACCEPTED)
-def create_report(
+async def create_report(
     survey_id: UUID,
     payload: ReportCreateRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    access: SurveyAccess = Depends(survey_with_role_async(WorkspaceRole.editor)),
+    db: AsyncSession = Depends(get_async_db),
+    user: CurrentUser = Depends(get_current_user_async),
 ) -> ReportJobAccepted:
-    survey, workspace_id = _get_survey_and_workspace(db, survey_id)
-    require_workspace_role(db, user, workspace_id, WorkspaceRole.editor)
+    try:
+        report_renderer.admit()
+    except RenderQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Report rendering is busy. Please retry shortly.",
+            headers={"Retry-After": "5"},
+        ) from exc
+    try:
+        accepted = await db.run_sync(_queue_report_job, access, payload, user)
+    except Exception:
+        report_renderer.release()
+        raise
+    # Background tasks run before request-scoped dependencies exit, so hand the connection back now
+    # rather than holding it for the whole render.
+    await db.close()
+    background_tasks.add_task(generate_report_job, accepted.report_id)
+    return accepted
+
+
+def _queue_report_job(db: Session, access: SurveyAccess, payload: ReportCreateRequest, user: CurrentUser) -> ReportJobAccepted:
+    survey = access.survey
+    workspace_id = access.project.workspace_id
     job = ReportJob(
         survey_id=survey.id,
         created_by=user.id,
@@ -83,6 +101,7 @@ def create_report(
         format=payload.format,
         template=payload.template,
         include_sections=payload.include_sections,
+        compression=payload.compression,
     )
     db.add(job)
     db.flush()
@@ -93,51 +112,101 @@ def create_report(
         entity_id=str(job.id),
         actor_user_id=user.id,
         workspace_id=workspace_id,
-        metadata={"survey_id": str(survey_id), "format": payload.format},
+        metadata={"survey_id": str(survey.id), "format": payload.format},
     )
     log_usage_event(
         db,
         event_name="report.created",
         user_id=user.id,
         workspace_id=workspace_id,
-        payload={"survey_id": str(survey_id), "format": payload.format},
+        payload={"survey_id": str(survey.id), "format": payload.format},
     )
     db.commit()
     db.refresh(job)
-    background_tasks.add_task(generate_report_job, job.id)
     return ReportJobAccepted(report_id=job.id, status=job.status, accepted_at=job.created_at)
 
 
 @router.get("/surveys/{survey_id}/reports", response_model=ReportJobList)
 def list_reports(
     survey_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-) -> ReportJobList:
-    _, workspace_id = _get_survey_and_workspace(db, survey_id)
-    require_workspace_role(db, user, workspace_id, WorkspaceRole.viewer)
-    rows = db.scalars(select(ReportJob).where(ReportJob.survey_id == survey_id).order_by(ReportJob.created_at.desc())).all()
-    return ReportJobList(items=[_job_out(db, row) for row in rows], count=len(rows))
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.viewer)),
+    db: Session = Depends(get_read_db),
+    loaders: RequestLoaders = Depends(get_read_loaders),
+) -> FastJSONResponse:
+    rows, next_cursor = paginate(
+        db,
+        select(ReportJob).where(ReportJob.survey_id == survey_id),
+        sort_column=ReportJob.created_at,
+        id_column=ReportJob.id,
+        scope=f"reports:{survey_id}",
+        cursor=cursor,
+        limit=limit,
+    )
+    loaders.assets.load_many(row.id for row in rows)
+    items = [_job_item(loaders, row) for row in rows]
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor, "count": len(items)})
 
 
 @router.get("/surveys/{survey_id}/reports/{report_id}", response_model=ReportJobOut)
 def report_detail(
     survey_id: UUID,
     report_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.viewer)),
+    db: Session = Depends(get_read_db),
+    loaders: RequestLoaders = Depends(get_read_loaders),
 ) -> ReportJobOut:
-    _, workspace_id = _get_survey_and_workspace(db, survey_id)
-    require_workspace_role(db, user, workspace_id, WorkspaceRole.viewer)
     row = db.scalar(select(ReportJob).where(ReportJob.id == report_id, ReportJob.survey_id == survey_id))
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found")
-    return _job_out(db, row)
+    return ReportJobOut.model_validate(_job_item(loaders, row))
+
+
+def _cache_headers(expires_at: datetime, etag: str | None = None) -> dict[str, str]:
+    # The URL carries the download token, so only the downloader's own cache may keep the file, and only until the link expires.
+    max_age = max(int((expires_at - datetime.now(UTC)).total_seconds()), 0)
+    headers = {"Cache-Control": f"private, max-age={max_age}"}
+    if etag:
+        headers["ETag"] = etag
+    return headers
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison.
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def _byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """The inclusive range asked for by a single-range ``Range`` header, or None to serve the whole file."""
+    unit, _, spec = header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or not dash or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        # Malformed or multiple ranges may be ignored, and a full response is always valid.
+        return None
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or (not first and int(last) == 0):
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
 
 
 @router.get("/exports/{asset_id}/download")
 def download_export(
     asset_id: UUID,
+    request: Request,
     token: str = Query(...),
     db: Session = Depends(get_db),
 ):
@@ -150,17 +219,47 @@ def download_export(
     if expires_at <= datetime.now(UTC):
         raise HTTPException(status_code=status.HTTP_410_GONE, detail="Download link expired")
 
-    file_path = Path(asset.storage_path)
-    if not file_path.exists():
+    if asset.blob_id is None:
+        file_path = Path(asset.storage_path)
+        if not file_path.exists():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset file missing")
+        return FileResponse(path=str(file_path), filename=asset.file_name, media_type=asset.mime_type, headers=_cache_headers(expires_at))
+
+    blob = db.get(ExportBlob, asset.blob_id)
+    storage = get_export_storage()
+    touch_blob(db, blob.id)
+    # Blobs are addressed by the SHA-256 of their bytes, so the digest is a strong validator.
+    headers = _cache_headers(expires_at, f'"{blob.digest}"')
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    file_path = storage.local_path(blob.digest)
+    if file_path is not None:
+        # Handles Range and If-Range itself, and hands the path to servers that offer the pathsend extension.
+        return FileResponse(path=str(file_path), filename=asset.file_name, media_type=asset.mime_type, headers=headers)
+
+    byte_range = None
+    if "range" in request.headers and request.headers.get("if-range", headers["ETag"]) == headers["ETag"]:
+        byte_range = _byte_range(request.headers["range"], blob.size_bytes)
+    chunks = storage.stream(blob.digest, byte_range)
+    if chunks is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset file missing")
-    return FileResponse(path=str(file_path), filename=asset.file_name, media_type=asset.mime_type)
+    headers |= {"Accept-Ranges": "bytes", "Content-Disposition": f'attachment; filename="{asset.file_name}"'}
+    if byte_range is None:
+        return StreamingResponse(chunks, media_type=asset.mime_type, headers=headers | {"Content-Length": str(blob.size_bytes)})
+    start, end = byte_range
+    return StreamingResponse(
+        chunks,
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=asset.mime_type,
+        headers=headers | {"Content-Length": str(end - start + 1), "Content-Range": f"bytes {start}-{end}/{blob.size_bytes}"},
+    )
 
 
 @router.post("/events/track", status_code=status.HTTP_202_ACCEPTED)
 def track_event(
     payload: TrackEventRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> dict:
     log_usage_event(
         db,
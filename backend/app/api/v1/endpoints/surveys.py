@@ -3,16 +3,17 @@ import secrets
 import string
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import enforce_public_rate_limit, require_workspace_role
-from app.core.security import get_current_user
-from app.db.session import get_db
-from app.models.project import Project
+from app.api.v1.deps import ProjectAccess, SurveyAccess, enforce_public_rate_limit, project_with_role, survey_with_role
+from app.api.v1.loaders import RequestLoaders, get_loaders
+from app.api.v1.pagination import paginate
+from app.core.security import CurrentUser, get_current_user
+from app.db.session import get_async_db, get_db
 from app.models.survey import QuestionOption, QuestionType, Survey, SurveyPublication, SurveyQuestion, SurveyStatus
-from app.models.user import User
 from app.models.workspace import WorkspaceRole
 from app.schemas.survey import (
     BiasCheckRequest,
@@ -34,6 +35,9 @@ from app.schemas.survey import (
 )
 from app.services.events import log_audit_event, log_usage_event
 from app.services.llm import LLMClient, LLMServiceError, get_llm_client
+from app.services.invalidation import SURVEY_TOPIC, invalidation_bus
+from app.services.submissions import build_submission_plan, submission_plans
+from app.services.survey_cache import public_surveys
 
 router = APIRouter()
 public_router = APIRouter(dependencies=[Depends(enforce_public_rate_limit)])
@@ -64,20 +68,6 @@ def get_llm_dep() -> LLMClient:
     return get_llm_client()
 
 
-def _get_project_or_404(db: Session, project_id: UUID) -> Project:
-    project = db.get(Project, project_id)
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    return project
-
-
-def _get_survey_or_404(db: Session, survey_id: UUID) -> Survey:
-    survey = db.get(Survey, survey_id)
-    if not survey:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Survey not found")
-    return survey
-
-
 def _get_question_or_404(db: Session, survey_id: UUID, question_id: UUID) -> SurveyQuestion:
     question = db.scalar(select(SurveyQuestion).where(SurveyQuestion.id == question_id, SurveyQuestion.survey_id == survey_id))
     if not question:
@@ -85,10 +75,7 @@ def _get_question_or_404(db: Session, survey_id: UUID, question_id: UUID) -> Sur
     return question
 
 
-def _build_question_response(db: Session, question: SurveyQuestion) -> QuestionResponse:
-    options = db.scalars(
-        select(QuestionOption).where(QuestionOption.question_id == question.id).order_by(QuestionOption.order_index.asc())
-    ).all()
+def _question_response(question: SurveyQuestion, options: list[QuestionOption]) -> QuestionResponse:
     return QuestionResponse(
         id=question.id,
         survey_id=question.survey_id,
@@ -109,8 +96,26 @@ def _build_question_response(db: Session, question: SurveyQuestion) -> QuestionR
     )
 
 
-def _build_survey_response(db: Session, survey: Survey) -> SurveyResponse:
-    publication = db.scalar(select(SurveyPublication).where(SurveyPublication.survey_id == survey.id))
+def _build_question_responses(db: Session, questions: list[SurveyQuestion]) -> list[QuestionResponse]:
+    """Serialise questions with their options fetched in a single ``IN`` query."""
+    options_by_question: dict[UUID, list[QuestionOption]] = {question.id: [] for question in questions}
+    if options_by_question:
+        options = db.scalars(
+            select(QuestionOption)
+            .where(QuestionOption.question_id.in_(options_by_question))
+            .order_by(QuestionOption.order_index.asc())
+        ).all()
+        for option in options:
+            options_by_question[option.question_id].append(option)
+    return [_question_response(question, options_by_question[question.id]) for question in questions]
+
+
+def _build_question_response(db: Session, question: SurveyQuestion) -> QuestionResponse:
+    return _build_question_responses(db, [question])[0]
+
+
+def _build_survey_response(loaders: RequestLoaders, survey: Survey) -> SurveyResponse:
+    publication = loaders.publications.load(survey.id)
     return SurveyResponse(
         id=survey.id,
         project_id=survey.project_id,
@@ -128,13 +133,13 @@ def _build_survey_response(db: Session, survey: Survey) -> SurveyResponse:
     )
 
 
-def _survey_detail(db: Session, survey: Survey) -> SurveyDetailResponse:
+def _survey_detail(db: Session, loaders: RequestLoaders, survey: Survey) -> SurveyDetailResponse:
     questions = db.scalars(
         select(SurveyQuestion).where(SurveyQuestion.survey_id == survey.id).order_by(SurveyQuestion.order_index.asc())
     ).all()
     return SurveyDetailResponse(
-        survey=_build_survey_response(db, survey),
-        questions=[_build_question_response(db, q) for q in questions],
+        survey=_build_survey_response(loaders, survey),
+        questions=_build_question_responses(db, questions),
     )
 
 
@@ -218,11 +223,11 @@ def _create_slug() -> str:
 def create_survey(
     project_id: UUID,
     payload: SurveyCreateRequest,
+    access: ProjectAccess = Depends(project_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
+    user: CurrentUser = Depends(get_current_user),
 ) -> SurveyResponse:
-    project = _get_project_or_404(db, project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
     survey = Survey(
         project_id=project_id,
         title=payload.title,
@@ -236,47 +241,57 @@ def create_survey(
     db.add(survey)
     db.commit()
     db.refresh(survey)
-    return _build_survey_response(db, survey)
+    return _build_survey_response(loaders, survey)
 
 
 @router.get("/projects/{project_id}/surveys", response_model=SurveyListResponse)
 def list_surveys(
     project_id: UUID,
     status_filter: SurveyStatus | None = Query(default=None, alias="status"),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    access: ProjectAccess = Depends(project_with_role(WorkspaceRole.viewer)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
 ) -> SurveyListResponse:
-    project = _get_project_or_404(db, project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.viewer)
     query = select(Survey).where(Survey.project_id == project_id)
     if status_filter:
         query = query.where(Survey.status == status_filter)
-    items = db.scalars(query.order_by(Survey.created_at.desc())).all()
-    return SurveyListResponse(items=[_build_survey_response(db, x) for x in items], count=len(items))
+    items, next_cursor = paginate(
+        db,
+        query,
+        sort_column=Survey.created_at,
+        id_column=Survey.id,
+        scope=f"surveys:{project_id}:{status_filter.value if status_filter else ''}",
+        cursor=cursor,
+        limit=limit,
+    )
+    loaders.publications.load_many(item.id for item in items)
+    return SurveyListResponse(
+        items=[_build_survey_response(loaders, x) for x in items], next_cursor=next_cursor, count=len(items)
+    )
 
 
 @router.get("/surveys/{survey_id}", response_model=SurveyDetailResponse)
 def get_survey(
     survey_id: UUID,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.viewer)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
 ) -> SurveyDetailResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.viewer)
-    return _survey_detail(db, survey)
+    survey = access.survey
+    return _survey_detail(db, loaders, survey)
 
 
 @router.patch("/surveys/{survey_id}", response_model=SurveyResponse)
 def update_survey(
     survey_id: UUID,
     payload: SurveyUpdateRequest,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
 ) -> SurveyResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
+    survey = access.survey
     if payload.title is not None:
         survey.title = payload.title
     if payload.goal is not None:
@@ -289,21 +304,18 @@ def update_survey(
         survey.language = payload.language
     db.add(survey)
     db.commit()
+    invalidation_bus.publish(SURVEY_TOPIC, survey_id)
     db.refresh(survey)
-    return _build_survey_response(db, survey)
+    return _build_survey_response(loaders, survey)
 
 
 @router.post("/surveys/{survey_id}/questions", response_model=QuestionResponse, status_code=status.HTTP_201_CREATED)
 def add_question(
     survey_id: UUID,
     payload: QuestionCreateRequest,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
 ) -> QuestionResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
-
     question = SurveyQuestion(
         survey_id=survey_id,
         type=payload.type,
@@ -325,6 +337,7 @@ def add_question(
             )
         )
     db.commit()
+    invalidation_bus.publish(SURVEY_TOPIC, survey_id)
     db.refresh(question)
     return _build_question_response(db, question)
 
@@ -334,12 +347,9 @@ def update_question(
     survey_id: UUID,
     question_id: UUID,
     payload: QuestionUpdateRequest,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
 ) -> QuestionResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
     question = _get_question_or_404(db, survey_id, question_id)
     if payload.type is not None:
         question.type = payload.type
@@ -364,6 +374,7 @@ def update_question(
             )
     db.add(question)
     db.commit()
+    invalidation_bus.publish(SURVEY_TOPIC, survey_id)
     db.refresh(question)
     return _build_question_response(db, question)
 
@@ -372,15 +383,13 @@ def update_question(
 def delete_question(
     survey_id: UUID,
     question_id: UUID,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
 ) -> None:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
     question = _get_question_or_404(db, survey_id, question_id)
     db.delete(question)
     db.commit()
+    invalidation_bus.publish(SURVEY_TOPIC, survey_id)
     return None
 
 
@@ -388,13 +397,11 @@ def delete_question(
 def ai_generate_questions(
     survey_id: UUID,
     payload: SurveyGenerateRequest,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
     llm: LLMClient = Depends(get_llm_dep),
 ) -> SurveyQuestionsBundleResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
+    survey = access.survey
 
     schema = {
         "type": "object",
@@ -453,6 +460,7 @@ def ai_generate_questions(
     survey.generated_by_ai = True
     db.add(survey)
     db.commit()
+    invalidation_bus.publish(SURVEY_TOPIC, survey_id)
     return SurveyQuestionsBundleResponse(
         questions=generated_questions,
         generation_meta={"provider": "groq", "generated_at": datetime.now(UTC).isoformat()},
@@ -463,14 +471,10 @@ def ai_generate_questions(
 def bias_check(
     survey_id: UUID,
     payload: BiasCheckRequest,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
     llm: LLMClient = Depends(get_llm_dep),
 ) -> BiasCheckResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
-
     if payload.questions is not None:
         question_inputs = payload.questions
     else:
@@ -527,12 +531,12 @@ def bias_check(
 def publish_survey(
     survey_id: UUID,
     payload: SurveyPublishRequest,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> SurveyPublicationResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
+    survey = access.survey
+    project = access.project
     if survey.status not in {SurveyStatus.draft, SurveyStatus.closed}:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Survey cannot be published in current state")
     question_count = db.scalar(select(func.count()).select_from(SurveyQuestion).where(SurveyQuestion.survey_id == survey_id))
@@ -574,6 +578,10 @@ def publish_survey(
     )
     db.add(survey)
     db.commit()
+    invalidation_bus.publish(SURVEY_TOPIC, survey_id)
+    # Compile the submission validator now so the first respondent does not pay for it.
+    generation = submission_plans.generation()
+    submission_plans.put(build_submission_plan(db, survey_id), generation)
     db.refresh(publication)
     return SurveyPublicationResponse.model_validate(publication)
 
@@ -581,56 +589,70 @@ def publish_survey(
 @router.post("/surveys/{survey_id}/close", response_model=SurveyResponse)
 def close_survey(
     survey_id: UUID,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
 ) -> SurveyResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
+    survey = access.survey
     survey.status = SurveyStatus.closed
     publication = db.scalar(select(SurveyPublication).where(SurveyPublication.survey_id == survey_id))
     if publication:
         publication.status = SurveyStatus.closed
         db.add(publication)
+    loaders.publications.prime(survey.id, publication)
     db.add(survey)
     db.commit()
+    invalidation_bus.publish(SURVEY_TOPIC, survey_id)
     db.refresh(survey)
-    return _build_survey_response(db, survey)
+    return _build_survey_response(loaders, survey)
 
 
 @router.post("/surveys/{survey_id}/archive", response_model=SurveyResponse)
 def archive_survey(
     survey_id: UUID,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.editor)),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
 ) -> SurveyResponse:
-    survey = _get_survey_or_404(db, survey_id)
-    project = _get_project_or_404(db, survey.project_id)
-    require_workspace_role(db, user, project.workspace_id, WorkspaceRole.editor)
+    survey = access.survey
     survey.status = SurveyStatus.archived
     publication = db.scalar(select(SurveyPublication).where(SurveyPublication.survey_id == survey_id))
     if publication:
         publication.status = SurveyStatus.archived
         db.add(publication)
+    loaders.publications.prime(survey.id, publication)
     db.add(survey)
     db.commit()
+    invalidation_bus.publish(SURVEY_TOPIC, survey_id)
     db.refresh(survey)
-    return _build_survey_response(db, survey)
+    return _build_survey_response(loaders, survey)
 
 
 @public_router.get("/public/surveys/{public_slug}", response_model=PublicSurveyResponse)
-def public_get_survey(public_slug: str, db: Session = Depends(get_db)) -> PublicSurveyResponse:
-    publication = db.scalar(select(SurveyPublication).where(SurveyPublication.public_slug == public_slug))
+async def public_get_survey(public_slug: str, db: AsyncSession = Depends(get_async_db)) -> Response:
+    # Hits are served from pre-encoded bytes; the session is never used, so no connection is checked out.
+    cached = public_surveys.get(public_slug)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    generation = public_surveys.generation()
+    publication = await db.scalar(select(SurveyPublication).where(SurveyPublication.public_slug == public_slug))
     if not publication:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Survey not found")
     if publication.status != SurveyStatus.published:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Survey is not currently accepting responses.")
 
-    survey = _get_survey_or_404(db, publication.survey_id)
-    questions = db.scalars(
-        select(SurveyQuestion).where(SurveyQuestion.survey_id == survey.id).order_by(SurveyQuestion.order_index.asc())
+    survey = await db.get(Survey, publication.survey_id)
+    if not survey:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Survey not found")
+    questions = (
+        await db.scalars(
+            select(SurveyQuestion).where(SurveyQuestion.survey_id == survey.id).order_by(SurveyQuestion.order_index.asc())
+        )
     ).all()
-    return PublicSurveyResponse(
+    body = PublicSurveyResponse(
         survey={"id": survey.id, "title": survey.title, "description": survey.description},
-        questions=[_build_question_response(db, q) for q in questions],
-    )
+        questions=await db.run_sync(_build_question_responses, questions),
+    ).model_dump_json().encode()
+    public_surveys.put(public_slug, survey.id, body, generation)
+    return Response(content=body, media_type="application/json")
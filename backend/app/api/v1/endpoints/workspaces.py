@@ -6,8 +6,9 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.v1.deps import require_workspace_role
+from app.api.v1.loaders import RequestLoaders, get_loaders
 from app.core.config import settings
-from app.core.security import get_current_user
+from app.core.security import CurrentUser, get_current_user
 from app.db.session import get_db
 from app.models.user import User
 from app.models.workspace import Workspace, WorkspaceInvitation, WorkspaceMember, WorkspaceRole
@@ -23,6 +24,8 @@ from app.schemas.workspace import (
 )
 from app.services.events import log_audit_event, log_usage_event
 from app.services.email import send_workspace_invitation_email
+from app.services.invalidation import MEMBERSHIP_TOPIC, invalidation_bus
+from app.services.membership_cache import membership_key
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -62,7 +65,7 @@ def _build_invitation_response(invitation: WorkspaceInvitation) -> WorkspaceMemb
 def create_workspace(
     payload: WorkspaceCreateRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> WorkspaceResponse:
     workspace = Workspace(name=payload.name, owner_id=user.id)
     db.add(workspace)
@@ -87,6 +90,7 @@ def create_workspace(
     )
     log_usage_event(db, event_name="workspace.created", user_id=user.id, workspace_id=workspace.id)
     db.commit()
+    invalidation_bus.publish(MEMBERSHIP_TOPIC, membership_key(workspace.id, user.id))
     db.refresh(workspace)
     return WorkspaceResponse.model_validate(workspace)
 
@@ -94,7 +98,7 @@ def create_workspace(
 @router.get("", response_model=WorkspaceListResponse)
 def list_workspaces(
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> WorkspaceListResponse:
     workspaces = db.scalars(
         select(Workspace)
@@ -109,7 +113,7 @@ def list_workspaces(
 def get_workspace(
     workspace_id: UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> WorkspaceResponse:
     require_workspace_role(db, user, workspace_id, WorkspaceRole.viewer)
     workspace = db.get(Workspace, workspace_id)
@@ -121,7 +125,7 @@ def update_workspace(
     workspace_id: UUID,
     payload: WorkspaceUpdateRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> WorkspaceResponse:
     require_workspace_role(db, user, workspace_id, WorkspaceRole.admin)
     workspace = db.get(Workspace, workspace_id)
@@ -137,7 +141,7 @@ def invite_member(
     workspace_id: UUID,
     payload: MemberInviteRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> WorkspaceMemberResponse:
     require_workspace_role(db, user, workspace_id, WorkspaceRole.admin)
     workspace = db.get(Workspace, workspace_id)
@@ -215,6 +219,8 @@ def invite_member(
         response_payload = _build_invitation_response(invitation)
 
     db.commit()
+    if invited_user:
+        invalidation_bus.publish(MEMBERSHIP_TOPIC, membership_key(workspace_id, invited_user.id))
 
     invite_link = f"{settings.FRONTEND_APP_URL.rstrip('/')}/pages/login.html"
     invite_email = invited_user.email if invited_user else normalized_email
@@ -237,7 +243,8 @@ def invite_member(
 def list_members(
     workspace_id: UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders),
+    user: CurrentUser = Depends(get_current_user),
 ) -> WorkspaceMemberListResponse:
     require_workspace_role(db, user, workspace_id, WorkspaceRole.viewer)
     members = db.scalars(
@@ -252,8 +259,8 @@ def list_members(
     ).all()
 
     member_items = []
-    for item in members:
-        member_user = db.get(User, item.user_id)
+    member_users = loaders.users.load_many(item.user_id for item in members)
+    for item, member_user in zip(members, member_users):
         if not member_user:
             continue
         member_items.append(_build_member_response(item, member_user))
@@ -268,7 +275,7 @@ def update_member(
     member_id: UUID,
     payload: MemberUpdateRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> WorkspaceMemberResponse:
     require_workspace_role(db, user, workspace_id, WorkspaceRole.admin)
     member = db.scalar(
@@ -288,9 +295,11 @@ def update_member(
     if payload.status is not None:
         member.status = payload.status
     db.add(member)
+    member_user_id = member.user_id
     db.commit()
+    invalidation_bus.publish(MEMBERSHIP_TOPIC, membership_key(workspace_id, member_user_id))
     db.refresh(member)
-    return WorkspaceMemberResponse.model_validate(member)
+    return _build_member_response(member, db.get(User, member_user_id))
 
 
 @router.delete("/{workspace_id}/members/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -298,7 +307,7 @@ def remove_member(
     workspace_id: UUID,
     member_id: UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ) -> None:
     require_workspace_role(db, user, workspace_id, WorkspaceRole.admin)
     member = db.scalar(
@@ -310,8 +319,10 @@ def remove_member(
     if member:
         if member.role == WorkspaceRole.owner:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Owner membership cannot be removed")
+        member_user_id = member.user_id
         db.delete(member)
         db.commit()
+        invalidation_bus.publish(MEMBERSHIP_TOPIC, membership_key(workspace_id, member_user_id))
         return None
 
     invitation = db.scalar(
@@ -0,0 +1,79 @@
+from collections.abc import Callable, Hashable, Iterable
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.replicas import get_read_db
+from app.db.session import get_db
+from app.models.feedback import ResponseAnswer
+from app.models.hardening import ExportAsset
+from app.models.survey import SurveyPublication
+from app.models.user import User
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """Request-scoped DataLoader resolving keys with one ``fetch`` call per batch.
+
+    List endpoints call ``load_many`` with every key on the page before
+    serialising rows, so the per-row ``load`` calls are cache hits. ``fetch``
+    returns a mapping; keys it leaves out resolve to ``default()``.
+    """
+
+    def __init__(self, fetch: Callable[[list[K]], dict[K, V]], default: Callable[[], V] = lambda: None) -> None:
+        self._fetch = fetch
+        self._default = default
+        self._cache: dict[K, V] = {}
+
+    def load(self, key: K) -> V:
+        return self.load_many([key])[0]
+
+    def load_many(self, keys: Iterable[K]) -> list[V]:
+        keys = list(keys)
+        missing = list(dict.fromkeys(key for key in keys if key not in self._cache))
+        if missing:
+            found = self._fetch(missing)
+            for key in missing:
+                self._cache[key] = found[key] if key in found else self._default()
+        return [self._cache[key] for key in keys]
+
+    def prime(self, key: K, value: V) -> None:
+        """Seed a value the handler already holds, e.g. a row it just wrote."""
+        self._cache[key] = value
+
+
+class RequestLoaders:
+    def __init__(self, db: Session) -> None:
+        self.publications: BatchLoader[UUID, SurveyPublication | None] = BatchLoader(
+            lambda ids: {row.survey_id: row for row in db.scalars(select(SurveyPublication).where(SurveyPublication.survey_id.in_(ids)))}
+        )
+        self.assets: BatchLoader[UUID, ExportAsset | None] = BatchLoader(
+            lambda ids: {row.report_job_id: row for row in db.scalars(select(ExportAsset).where(ExportAsset.report_job_id.in_(ids)))}
+        )
+        self.users: BatchLoader[UUID, User | None] = BatchLoader(
+            lambda ids: {row.id: row for row in db.scalars(select(User).where(User.id.in_(ids)))}
+        )
+        self.answers: BatchLoader[UUID, list[ResponseAnswer]] = BatchLoader(
+            lambda ids: _group_by(db.scalars(select(ResponseAnswer).where(ResponseAnswer.response_id.in_(ids))), "response_id"),
+            default=list,
+        )
+
+
+def _group_by(rows: Iterable, attribute: str) -> dict:
+    grouped: dict = {}
+    for row in rows:
+        grouped.setdefault(getattr(row, attribute), []).append(row)
+    return grouped
+
+
+def get_loaders(db: Session = Depends(get_db)) -> RequestLoaders:
+    return RequestLoaders(db)
+
+
+def get_read_loaders(db: Session = Depends(get_read_db)) -> RequestLoaders:
+    return RequestLoaders(db)
@@ -0,0 +1,69 @@
+import base64
+from datetime import datetime
+import hashlib
+import hmac
+import json
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.core.config import settings
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _signature(scope: str, body: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode(), scope.encode() + b"|" + body, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(scope: str, sort_value: datetime, row_id: UUID) -> str:
+    body = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":")).encode()
+    return f"{_b64encode(body)}.{_b64encode(_signature(scope, body))}"
+
+
+def decode_cursor(scope: str, cursor: str) -> tuple[datetime, UUID]:
+    """Verify and unpack a cursor; ``scope`` binds it to one listing so it cannot be replayed elsewhere."""
+    try:
+        encoded_body, encoded_signature = cursor.split(".", 1)
+        body = _b64decode(encoded_body)
+        if not hmac.compare_digest(_b64decode(encoded_signature), _signature(scope, body)):
+            raise ValueError("bad signature")
+        sort_value, row_id = json.loads(body)
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
+
+
+def paginate(
+    db: Session,
+    query: Select,
+    *,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    scope: str,
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[Any], str | None]:
+    """Newest-first keyset page over ``(sort_column, id_column)``.
+
+    The seek predicate lets the composite index start at the cursor, so every page
+    costs the same; one extra row is fetched to decide whether a next page exists.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(scope, cursor)
+        query = query.where(or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id)))
+    rows = db.scalars(query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = rows[:limit]
+    last = rows[-1]
+    return list(rows), encode_cursor(scope, getattr(last, sort_column.key), getattr(last, id_column.key))
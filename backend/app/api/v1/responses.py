@@ -0,0 +1,17 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+import pydantic_core
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON encoded by pydantic-core, which writes UUIDs, datetimes, enums and models natively.
+
+    An endpoint that returns one bypasses response-model validation and
+    serialisation. List endpoints use it with plain dicts built from ORM rows in
+    the shape of their declared ``response_model``, which keeps that model in
+    the OpenAPI schema but skips building a model per item.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.api.v1.endpoints.analytics import router as analytics_router
 from app.api.v1.endpoints.auth import router as auth_router
 from app.api.v1.endpoints.feedback import public_router as public_feedback_router
 from app.api.v1.endpoints.feedback import router as feedback_router
@@ -16,5 +17,6 @@ api_v1_router.include_router(projects_router, tags=["projects"])
 api_v1_router.include_router(surveys_router, tags=["surveys"])
 api_v1_router.include_router(feedback_router, tags=["feedback"])
 api_v1_router.include_router(reporting_router, tags=["reporting"])
+api_v1_router.include_router(analytics_router, tags=["analytics"])
 api_v1_router.include_router(public_survey_router, tags=["public"])
 api_v1_router.include_router(public_feedback_router, tags=["public"])
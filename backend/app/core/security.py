@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 from uuid import UUID
@@ -6,11 +7,14 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.user import User
+from app.services.token_versions import token_versions
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 bearer_scheme = HTTPBearer(auto_error=True)
@@ -24,18 +28,35 @@ def verify_password(plain_password: str, password_hash: str) -> bool:
     return pwd_context.verify(plain_password, password_hash)
 
 
-def _create_token(subject: str, token_type: str, expires_delta: timedelta) -> str:
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Caller rebuilt from access-token claims when ``STATELESS_ACCESS_TOKENS`` is on."""
+
+    id: UUID
+    email: str
+    full_name: str
+    token_version: int
+
+
+CurrentUser = User | Principal
+
+
+def _create_token(subject: str, token_type: str, expires_delta: timedelta, claims: dict[str, Any] | None = None) -> str:
     expire = datetime.now(UTC) + expires_delta
-    payload: dict[str, Any] = {"sub": subject, "type": token_type, "exp": expire}
+    payload: dict[str, Any] = {**(claims or {}), "sub": subject, "type": token_type, "exp": expire}
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-def create_access_token(subject: str, expires_delta: timedelta) -> str:
-    return _create_token(subject, "access", expires_delta)
+def access_token_claims(user: User) -> dict[str, Any]:
+    return {"email": user.email, "name": user.full_name, "ver": user.token_version}
+
 
+def create_access_token(subject: str, expires_delta: timedelta, claims: dict[str, Any] | None = None) -> str:
+    return _create_token(subject, "access", expires_delta, claims)
 
-def create_refresh_token(subject: str, expires_delta: timedelta) -> str:
-    return _create_token(subject, "refresh", expires_delta)
+
+def create_refresh_token(subject: str, expires_delta: timedelta, claims: dict[str, Any] | None = None) -> str:
+    return _create_token(subject, "refresh", expires_delta, claims)
 
 
 def create_password_reset_token(subject: str, expires_delta: timedelta) -> str:
@@ -54,21 +75,70 @@ def decode_token(token: str, expected_type: str) -> dict[str, Any]:
     return payload
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    payload = decode_token(credentials.credentials, expected_type="access")
+def token_user_id(payload: dict[str, Any]) -> UUID:
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-
     try:
-        user_uuid = UUID(user_id)
+        return UUID(user_id)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload") from exc
 
-    user = db.get(User, user_uuid)
+
+def check_token_version(payload: dict[str, Any], current_version: int) -> None:
+    # Tokens minted before versioning carry no claim and count as version 0.
+    if payload.get("ver", 0) != current_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+
+
+def _load_user(db: Session, payload: dict[str, Any]) -> User:
+    user = db.get(User, token_user_id(payload))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    check_token_version(payload, user.token_version)
     return user
+
+
+def _authenticate(db: Session, payload: dict[str, Any]) -> CurrentUser:
+    if not settings.STATELESS_ACCESS_TOKENS or "ver" not in payload or "email" not in payload:
+        return _load_user(db, payload)
+
+    user_id = token_user_id(payload)
+    version = token_versions.get(user_id)
+    if version is None:
+        generation = token_versions.generation()
+        version = db.scalar(select(User.token_version).where(User.id == user_id))
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        token_versions.put(user_id, version, generation)
+    check_token_version(payload, version)
+    return Principal(id=user_id, email=payload["email"], full_name=payload.get("name", ""), token_version=version)
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """Authenticate the bearer token.
+
+    With ``STATELESS_ACCESS_TOKENS`` a token carrying identity claims yields a
+    ``Principal`` without loading the user row; only the token version is
+    checked, against a short-lived cache.
+    """
+    return _authenticate(db, decode_token(credentials.credentials, expected_type="access"))
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    """``get_current_user`` for ``async def`` endpoints, on the request's ``AsyncSession``."""
+    return await db.run_sync(_authenticate, decode_token(credentials.credentials, expected_type="access"))
+
+
+def get_current_db_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    """Like ``get_current_user`` but always returns the ``User`` row, for endpoints needing more than the claims."""
+    return _load_user(db, decode_token(credentials.credentials, expected_type="access"))
@@ -0,0 +1,108 @@
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+# Upper bounds in milliseconds; the last bucket is +Inf.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMonitor:
+    """Checkout-wait histogram and connection gauges for one engine's pool.
+
+    The gauges are maintained from pool events (``connect``, ``close``,
+    ``checkout``, ``checkin``), so they describe what the pool has actually
+    done rather than what it is configured for. SQLAlchemy has no event for the
+    start of a checkout, so the wait is timed by the pool class returned from
+    ``pool_class``.
+    """
+
+    def __init__(self, name: str, *, pool_size: int, max_overflow: int) -> None:
+        self.name = name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self._lock = Lock()
+        self._wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_sum_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._gauges = {"connections": 0, "in_use": 0, "peak_in_use": 0}
+        self._counters = {"checkouts": 0, "timeouts": 0, "invalidated": 0}
+
+    def pool_class(self, base: type[Pool]) -> type[Pool]:
+        # A per-monitor subclass: ``Pool.recreate`` (used by ``Engine.dispose``) keeps ``self.__class__``.
+        return type(f"Monitored{base.__name__}", (_TimedCheckout, base), {"monitor": self})
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "close_detached", self._on_close)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def observe_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            self._wait_counts[bisect_left(WAIT_BUCKETS_MS, elapsed_ms)] += 1
+            self._wait_sum_ms += elapsed_ms
+            self._wait_max_ms = max(self._wait_max_ms, elapsed_ms)
+            if timed_out:
+                self._counters["timeouts"] += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            observed = sum(self._wait_counts)
+            labels = [str(bound) for bound in WAIT_BUCKETS_MS] + ["+Inf"]
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                **self._gauges,
+                "overflow": max(0, self._gauges["connections"] - self.pool_size),
+                **self._counters,
+                "checkout_wait_ms": {
+                    "buckets": dict(zip(labels, self._wait_counts)),
+                    "count": observed,
+                    "avg": round(self._wait_sum_ms / observed, 3) if observed else 0.0,
+                    "max": round(self._wait_max_ms, 3),
+                },
+            }
+
+    def _on_connect(self, _dbapi_connection, _record) -> None:
+        with self._lock:
+            self._gauges["connections"] += 1
+
+    def _on_close(self, *_args) -> None:
+        with self._lock:
+            self._gauges["connections"] = max(0, self._gauges["connections"] - 1)
+
+    def _on_checkout(self, _dbapi_connection, _record, _proxy) -> None:
+        with self._lock:
+            self._counters["checkouts"] += 1
+            self._gauges["in_use"] += 1
+            self._gauges["peak_in_use"] = max(self._gauges["peak_in_use"], self._gauges["in_use"])
+
+    def _on_checkin(self, _dbapi_connection, _record) -> None:
+        with self._lock:
+            self._gauges["in_use"] = max(0, self._gauges["in_use"] - 1)
+
+    def _on_invalidate(self, _dbapi_connection, _record, _exception) -> None:
+        with self._lock:
+            self._counters["invalidated"] += 1
+
+
+class _TimedCheckout:
+    monitor: PoolMonitor
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.monitor.observe_wait(perf_counter() - started, timed_out=True)
+            raise
+        self.monitor.observe_wait(perf_counter() - started)
+        return connection
@@ -0,0 +1,220 @@
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from hashlib import blake2b
+from itertools import count
+import logging
+from threading import Event, Lock, Thread
+from time import monotonic
+
+from fastapi import Depends, Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import async_database_url, build_async_engine, build_engine, get_async_db, get_db
+
+logger = logging.getLogger(__name__)
+
+# A standby that has replayed everything it received is current even if the primary has been idle for a while.
+POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+RECENT_WRITERS_MAX_ENTRIES = 100000
+
+
+def replica_lag_seconds(connection: Connection) -> float:
+    """Replication lag as seen from the replica; SQLite files carry no replication state and report 0."""
+    if connection.dialect.name == "postgresql":
+        return float(connection.execute(POSTGRES_LAG_SQL).scalar_one())
+    connection.execute(text("SELECT 1"))
+    return 0.0
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: Engine
+    async_engine: AsyncEngine
+    sessions: sessionmaker
+    async_sessions: async_sessionmaker
+    healthy: bool = True
+    lag_seconds: float = 0.0
+    checked_at: float | None = None
+    error: str | None = None
+
+    @property
+    def usable(self) -> bool:
+        return self.healthy and self.lag_seconds <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+
+
+class ReplicaSet:
+    """Routes reads across ``DATABASE_REPLICA_URLS`` round-robin, falling back to the primary.
+
+    Each replica is probed every ``DATABASE_REPLICA_CHECK_INTERVAL_SECONDS`` (by
+    a background thread once ``start`` is called, otherwise lazily on the next
+    read). A replica is skipped while it is unreachable or lags by more than
+    ``DATABASE_REPLICA_MAX_LAG_SECONDS``. A disconnect seen by a request marks it
+    down until the next successful probe. Callers who wrote within that same lag
+    window keep reading from the primary, so they always see their own writes.
+    """
+
+    def __init__(self, urls: list[str], *, lag_probe: Callable[[Connection], float] = replica_lag_seconds) -> None:
+        self.lag_probe = lag_probe
+        self.replicas = [self._build(f"replica{index}", url) for index, url in enumerate(urls)]
+        self._counter = count()
+        self._lock = Lock()
+        self._check_lock = Lock()
+        self._recent_writers: OrderedDict[str, float] = OrderedDict()
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._metrics = {"replica_reads": 0, "primary_fallbacks": 0, "sticky_reads": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Replica | None:
+        if not self.replicas:
+            return None
+        if self._thread is None:
+            self._check_stale()
+        start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.usable:
+                self._metrics["replica_reads"] += 1
+                return replica
+        self._metrics["primary_fallbacks"] += 1
+        return None
+
+    @contextmanager
+    def read_session(self, primary: Session, caller: str | None = None) -> Iterator[Session]:
+        replica = None if caller is not None and self._wrote_recently(caller) else self.pick()
+        if replica is None:
+            yield primary
+            return
+        session = replica.sessions()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    @asynccontextmanager
+    async def read_async_session(self, primary: AsyncSession, caller: str | None = None) -> AsyncIterator[AsyncSession]:
+        replica = None if caller is not None and self._wrote_recently(caller) else self.pick()
+        if replica is None:
+            yield primary
+            return
+        async with replica.async_sessions() as session:
+            yield session
+
+    def note_write(self, caller: str) -> None:
+        with self._lock:
+            self._recent_writers[caller] = monotonic() + settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+            self._recent_writers.move_to_end(caller)
+            while len(self._recent_writers) > RECENT_WRITERS_MAX_ENTRIES:
+                self._recent_writers.popitem(last=False)
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    replica.lag_seconds = self.lag_probe(connection)
+                replica.healthy, replica.error = True, None
+            except Exception as exc:  # noqa: BLE001
+                if replica.healthy:
+                    logger.warning("Read replica %s failed its health check: %s", replica.name, exc)
+                replica.healthy, replica.error = False, str(exc)
+            replica.checked_at = monotonic()
+
+    def start(self) -> None:
+        self.check()
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def metrics(self) -> dict:
+        return {
+            **self._metrics,
+            "replicas": {
+                replica.name: {"healthy": replica.healthy, "lag_seconds": round(replica.lag_seconds, 3), "error": replica.error}
+                for replica in self.replicas
+            },
+        }
+
+    def _wrote_recently(self, caller: str) -> bool:
+        with self._lock:
+            deadline = self._recent_writers.get(caller)
+            if deadline is not None and deadline <= monotonic():
+                del self._recent_writers[caller]
+                deadline = None
+        if deadline is None:
+            return False
+        self._metrics["sticky_reads"] += 1
+        return True
+
+    def _check_stale(self) -> None:
+        now = monotonic()
+        interval = settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS
+        if any(r.checked_at is None or now - r.checked_at >= interval for r in self.replicas) and self._check_lock.acquire(blocking=False):
+            try:
+                self.check()
+            finally:
+                self._check_lock.release()
+
+    def _run(self) -> None:
+        while not self._stop.wait(settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS):
+            self.check()
+
+    def _build(self, name: str, url: str) -> Replica:
+        engine = build_engine(url, name=name)
+        async_engine = build_async_engine(async_database_url(url), name=f"{name}_async")
+        replica = Replica(
+            name=name,
+            engine=engine,
+            async_engine=async_engine,
+            sessions=sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session),
+            async_sessions=async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False),
+        )
+
+        def mark_down(context) -> None:
+            if context.is_disconnect:
+                replica.healthy, replica.error = False, str(context.original_exception)
+
+        event.listen(engine, "handle_error", mark_down)
+        event.listen(async_engine.sync_engine, "handle_error", mark_down)
+        return replica
+
+
+def caller_key(authorization: str | None, client_host: str | None) -> str:
+    """Identify a caller for read-your-writes: the bearer credential if any, otherwise the client address."""
+    return blake2b((authorization or client_host or "unknown").encode(), digest_size=16).hexdigest()
+
+
+def _request_caller(request: Request) -> str:
+    return caller_key(request.headers.get("authorization"), request.client.host if request.client else None)
+
+
+def get_read_db(request: Request, primary: Session = Depends(get_db)) -> Generator[Session, None, None]:
+    """Session for safe reads: a replica when one is current, else the request's primary session."""
+    with replicas.read_session(primary, _request_caller(request)) as db:
+        yield db
+
+
+async def get_async_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)) -> AsyncGenerator[AsyncSession, None]:
+    async with replicas.read_async_session(primary, _request_caller(request)) as db:
+        yield db
+
+
+replicas = ReplicaSet(settings.DATABASE_REPLICA_URLS)
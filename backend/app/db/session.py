@@ -1,13 +1,71 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
 from app.core.config import settings
+from app.db.pool import PoolMonitor
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+pool_monitors: dict[str, PoolMonitor] = {}
+
+
+def async_database_url(database_url: str) -> URL:
+    """Swap the sync driver of ``database_url`` for its asyncio counterpart."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def _engine_options(url: URL, monitor: PoolMonitor, poolclass: type[Pool]) -> dict:
+    options: dict = {"pool_pre_ping": True}
+    # In-memory SQLite keeps one connection per thread, so there is no queue to size.
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=monitor.pool_class(poolclass),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    if url.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def build_engine(database_url: str, *, name: str = "primary") -> Engine:
+    url = make_url(database_url)
+    monitor = PoolMonitor(name, pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
+    engine = create_engine(url, **_engine_options(url, monitor, QueuePool))
+    monitor.attach(engine)
+    pool_monitors[name] = monitor
+    return engine
+
+
+def build_async_engine(database_url: str | URL, *, name: str = "primary_async") -> AsyncEngine:
+    url = make_url(database_url)
+    monitor = PoolMonitor(name, pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
+    engine = create_async_engine(url, **_engine_options(url, monitor, AsyncAdaptedQueuePool))
+    monitor.attach(engine.sync_engine)
+    pool_monitors[name] = monitor
+    return engine
+
+
+engine = build_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
 
+async_engine = build_async_engine(settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -16,3 +74,7 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -5,21 +7,64 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.exc import OperationalError, ProgrammingError, SQLAlchemyError
+from sqlalchemy.exc import OperationalError, ProgrammingError, SQLAlchemyError, TimeoutError as PoolTimeoutError
 
 from app.api.router import api_router
+from app.api.v1.deps import RateLimitHeadersMiddleware, ReadYourWritesMiddleware
 from app.core.config import settings
+from app.db.replicas import replicas
+from app.services.events import event_pipeline
+from app.services.exports import export_sweeper
+from app.services.ingestion import submission_buffer
+from app.services.invalidation import invalidation_bus
+from app.services.password_hashing import password_hasher
+from app.services.report_workers import report_renderer
+from app.services.usage_rollups import usage_maintenance
 
 
 PROJECT_DIR = Path(__file__).resolve().parents[2]
 FRONTEND_DIR = PROJECT_DIR / "frontend"
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if settings.CACHE_INVALIDATION_BACKEND != "local":
+        invalidation_bus.start()
+    if settings.EVENT_PIPELINE_MODE == "buffered":
+        event_pipeline.start()
+    if settings.PUBLIC_INGEST_MODE == "buffered":
+        submission_buffer.start()
+    if settings.USAGE_ROLLUP_INTERVAL_SECONDS > 0:
+        usage_maintenance.start(settings.USAGE_ROLLUP_INTERVAL_SECONDS)
+    if settings.PASSWORD_HASH_WORKERS > 0:
+        password_hasher.start()
+    if settings.REPORT_RENDER_WORKERS > 0:
+        report_renderer.start()
+    if settings.EXPORT_SWEEP_INTERVAL_SECONDS > 0:
+        export_sweeper.start(settings.EXPORT_SWEEP_INTERVAL_SECONDS)
+    if replicas.enabled:
+        replicas.start()
+    try:
+        yield
+    finally:
+        replicas.stop()
+        export_sweeper.stop()
+        report_renderer.stop()
+        password_hasher.stop()
+        usage_maintenance.stop()
+        submission_buffer.stop()
+        event_pipeline.stop()
+        invalidation_bus.stop()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.APP_NAME,
         version=settings.APP_VERSION,
+        lifespan=lifespan,
     )
+    app.add_middleware(RateLimitHeadersMiddleware)
+    app.add_middleware(ReadYourWritesMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.BACKEND_CORS_ORIGINS,
@@ -45,8 +90,22 @@ def create_app() -> FastAPI:
             content={"detail": "Database query failed.", "code": "DB_QUERY_FAILED"},
         )
 
+    @app.exception_handler(PoolTimeoutError)
+    async def handle_pool_timeout(_: Request, __: PoolTimeoutError) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Database connection pool is exhausted.", "code": "DB_POOL_EXHAUSTED"},
+            headers={"Retry-After": "1"},
+        )
+
     @app.exception_handler(OperationalError)
-    async def handle_operational_error(_: Request, __: OperationalError) -> JSONResponse:
+    async def handle_operational_error(_: Request, exc: OperationalError) -> JSONResponse:
+        # 57014 is PostgreSQL's query_canceled, raised when statement_timeout fires.
+        if getattr(getattr(exc, "orig", None), "pgcode", None) == "57014":
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "Database query timed out.", "code": "DB_STATEMENT_TIMEOUT"},
+            )
         return JSONResponse(
             status_code=503,
             content={"detail": "Database connection failed.", "code": "DB_CONNECTION_FAILED"},
@@ -7,7 +7,16 @@ from app.models.feedback import (
     ResponseAnswer,
     SurveyResponse as SurveyResponseModel,
 )
-from app.models.hardening import AuditEvent, ExportAsset, ReportJob, UsageEvent
+from app.models.hardening import (
+    AuditEvent,
+    CacheInvalidation,
+    ExportAsset,
+    ExportBlob,
+    RateLimitCounter,
+    ReportJob,
+    UsageEvent,
+    UsageEventRollup,
+)
 from app.models.project import Project
 from app.models.survey import QuestionOption, Survey, SurveyPublication, SurveyQuestion
 from app.models.user import User
@@ -31,6 +40,10 @@ __all__ = [
     "Persona",
     "ReportJob",
     "ExportAsset",
+    "ExportBlob",
     "AuditEvent",
     "UsageEvent",
+    "UsageEventRollup",
+    "CacheInvalidation",
+    "RateLimitCounter",
 ]
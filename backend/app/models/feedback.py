@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -18,6 +18,7 @@ class InsightRunStatus(str, enum.Enum):
 
 class SurveyResponse(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "survey_responses"
+    __table_args__ = (Index("ix_survey_responses_survey_submitted_id", "survey_id", "submitted_at", "id"),)
 
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
     submitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -26,6 +27,10 @@ class SurveyResponse(Base, UUIDMixin, TimestampMixin):
 
 class ResponseAnswer(Base, UUIDMixin):
     __tablename__ = "response_answers"
+    __table_args__ = (
+        Index("ix_response_answers_response_id", "response_id"),
+        Index("ix_response_answers_question_id", "question_id"),
+    )
 
     response_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("survey_responses.id", ondelete="CASCADE"), nullable=False)
     question_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("survey_questions.id", ondelete="CASCADE"), nullable=False)
@@ -34,6 +39,7 @@ class ResponseAnswer(Base, UUIDMixin):
 
 class InsightRun(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "insight_runs"
+    __table_args__ = (Index("ix_insight_runs_survey_status", "survey_id", "status"),)
 
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
     status: Mapped[InsightRunStatus] = mapped_column(Enum(InsightRunStatus), nullable=False, default=InsightRunStatus.queued)
@@ -44,6 +50,7 @@ class InsightRun(Base, UUIDMixin, TimestampMixin):
 
 class InsightSummary(Base, UUIDMixin):
     __tablename__ = "insight_summaries"
+    __table_args__ = (Index("ix_insight_summaries_survey_generated", "survey_id", "generated_at"),)
 
     run_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("insight_runs.id", ondelete="CASCADE"), nullable=False, unique=True)
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
@@ -54,6 +61,7 @@ class InsightSummary(Base, UUIDMixin):
 
 class InsightTheme(Base, UUIDMixin):
     __tablename__ = "insight_themes"
+    __table_args__ = (Index("ix_insight_themes_summary_id", "summary_id"),)
 
     summary_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("insight_summaries.id", ondelete="CASCADE"), nullable=False)
     label: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -64,6 +72,7 @@ class InsightTheme(Base, UUIDMixin):
 
 class InsightRecommendation(Base, UUIDMixin):
     __tablename__ = "insight_recommendations"
+    __table_args__ = (Index("ix_insight_recommendations_summary_id", "summary_id"),)
 
     summary_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("insight_summaries.id", ondelete="CASCADE"), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -74,6 +83,7 @@ class InsightRecommendation(Base, UUIDMixin):
 
 class Persona(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "personas"
+    __table_args__ = (Index("ix_personas_survey_created", "survey_id", "created_at"),)
 
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
     run_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("insight_runs.id", ondelete="SET NULL"), nullable=True)
@@ -1,8 +1,8 @@
 import enum
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, JSON, String, Text
+from sqlalchemy import BigInteger, Date, DateTime, Enum, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -16,20 +16,44 @@ class ReportStatus(str, enum.Enum):
     failed = "failed"
 
 
+class ExportBlob(Base, UUIDMixin, TimestampMixin):
+    """A stored export, shared by every asset whose file has the same SHA-256.
+
+    ``ref_count`` counts those assets; ``-1`` marks a blob the sweeper is deleting.
+    """
+
+    __tablename__ = "export_blobs"
+    __table_args__ = (Index("ix_export_blobs_ref_count_accessed", "ref_count", "last_accessed_at"),)
+
+    digest: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # The render-cache key that first produced this blob, so repeat exports can skip rendering.
+    render_key: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    last_accessed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 class ExportAsset(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "export_assets"
+    __table_args__ = (
+        Index("ix_export_assets_expires_at", "expires_at"),
+        Index("ix_export_assets_blob_id", "blob_id"),
+    )
 
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
     report_job_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("report_jobs.id", ondelete="CASCADE"), nullable=False)
     file_name: Mapped[str] = mapped_column(String(255), nullable=False)
     mime_type: Mapped[str] = mapped_column(String(64), nullable=False)
     storage_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    # Null for exports written before content-addressed storage; those are served from ``storage_path``.
+    blob_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("export_blobs.id"), nullable=True)
     download_token: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
 
 class ReportJob(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "report_jobs"
+    __table_args__ = (Index("ix_report_jobs_survey_created_id", "survey_id", "created_at", "id"),)
 
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
     created_by: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -37,6 +61,7 @@ class ReportJob(Base, UUIDMixin, TimestampMixin):
     format: Mapped[str] = mapped_column(String(32), nullable=False)
     template: Mapped[str] = mapped_column(String(64), nullable=False, default="executive_summary")
     include_sections: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    compression: Mapped[str | None] = mapped_column(String(16), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
@@ -55,9 +80,52 @@ class AuditEvent(Base, UUIDMixin):
 
 class UsageEvent(Base, UUIDMixin):
     __tablename__ = "usage_events"
+    __table_args__ = (
+        Index("ix_usage_events_created_at", "created_at"),
+        Index("ix_usage_events_workspace_created_at", "workspace_id", "created_at"),
+    )
 
     workspace_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("workspaces.id", ondelete="SET NULL"), nullable=True)
     user_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     event_name: Mapped[str] = mapped_column(String(128), nullable=False)
     payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class UsageEventRollup(Base, UUIDMixin):
+    __tablename__ = "usage_event_rollups"
+    __table_args__ = (
+        UniqueConstraint("day", "workspace_id", "event_name", name="uq_usage_event_rollups_day_workspace_event"),
+        Index("ix_usage_event_rollups_workspace_day", "workspace_id", "day"),
+    )
+
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    workspace_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=True)
+    event_name: Mapped[str] = mapped_column(String(128), nullable=False)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    distinct_users: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_sketch: Mapped[str] = mapped_column(Text, nullable=False)
+    rolled_up_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class CacheInvalidation(Base):
+    """Append-only log that worker processes poll to drop entries from their in-process caches."""
+
+    __tablename__ = "cache_invalidations"
+    __table_args__ = (Index("ix_cache_invalidations_created_at", "created_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    topic: Mapped[str] = mapped_column(String(64), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class RateLimitCounter(Base):
+    """Per-key fixed-window hit counts shared by every worker when the rate limiter uses a database backend."""
+
+    __tablename__ = "rate_limit_counters"
+    __table_args__ = (Index("ix_rate_limit_counters_window", "window_index"),)
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    window_index: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -9,6 +9,7 @@ from app.models.mixins import TimestampMixin, UUIDMixin
 
 class Project(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "projects"
+    __table_args__ = (Index("ix_projects_workspace_created_id", "workspace_id", "created_at", "id"),)
 
     workspace_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -27,6 +27,7 @@ class QuestionType(str, enum.Enum):
 
 class Survey(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "surveys"
+    __table_args__ = (Index("ix_surveys_project_created_id", "project_id", "created_at", "id"),)
 
     project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -41,6 +42,7 @@ class Survey(Base, UUIDMixin, TimestampMixin):
 
 class SurveyQuestion(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "survey_questions"
+    __table_args__ = (Index("ix_survey_questions_survey_order", "survey_id", "order_index"),)
 
     survey_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
     type: Mapped[QuestionType] = mapped_column(Enum(QuestionType), nullable=False)
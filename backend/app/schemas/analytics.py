@@ -0,0 +1,25 @@
+from datetime import date
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class AnalyticsEventSummary(BaseModel):
+    event_name: str
+    count: int
+    distinct_users: int
+
+
+class AnalyticsDailyCount(BaseModel):
+    day: date
+    count: int
+
+
+class AnalyticsOverview(BaseModel):
+    workspace_id: UUID
+    from_date: date
+    to_date: date
+    total_events: int
+    distinct_users: int
+    events: list[AnalyticsEventSummary]
+    daily: list[AnalyticsDailyCount]
@@ -40,6 +40,7 @@ class SurveyResponseOut(BaseModel):
 
 class SurveyResponseList(BaseModel):
     items: list[SurveyResponseOut]
+    next_cursor: str | None = None
     count: int
 
 
@@ -8,8 +8,9 @@ from app.models.hardening import ReportStatus
 
 class ReportCreateRequest(BaseModel):
     format: str = Field(default="pdf", pattern="^(pdf|slides)$")
-    template: str = Field(default="executive_summary", max_length=64)
+    template: str = Field(default="executive_summary", pattern="^(executive_summary|detailed_analysis|stakeholder_brief)$")
     include_sections: list[str] = Field(default_factory=lambda: ["overview", "themes", "recommendations", "personas"])
+    compression: str | None = Field(default=None, pattern="^gzip$")
 
 
 class ReportJobAccepted(BaseModel):
@@ -35,6 +36,7 @@ class ReportJobOut(BaseModel):
     format: str
     template: str
     include_sections: list
+    compression: str | None = None
     created_at: datetime
     updated_at: datetime
     completed_at: datetime | None = None
@@ -44,6 +46,7 @@ class ReportJobOut(BaseModel):
 
 class ReportJobList(BaseModel):
     items: list[ReportJobOut]
+    next_cursor: str | None = None
     count: int
 
 
@@ -114,6 +114,7 @@ class SurveyDetailResponse(BaseModel):
 
 class SurveyListResponse(BaseModel):
     items: list[SurveyResponse]
+    next_cursor: str | None = None
     count: int
 
 
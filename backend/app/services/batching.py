@@ -0,0 +1,151 @@
+from collections.abc import Callable
+import logging
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class BatchWriter(Generic[T]):
+    """Bounded in-process queue drained by a dedicated thread in size- or time-triggered batches.
+
+    ``flush_fn`` receives each batch and is responsible for its own transaction.
+    ``drain()`` flushes synchronously from the calling thread, which is what
+    shutdown hooks and tests use.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn: Callable[[list[T]], None],
+        *,
+        max_queue: int,
+        max_batch: int,
+        flush_interval_ms: int,
+    ) -> None:
+        self.name = name
+        self._flush_fn = flush_fn
+        self._queue: Queue[tuple[float, T]] = Queue(maxsize=max_queue)
+        self._max_batch = max(1, max_batch)
+        self._interval = max(flush_interval_ms, 1) / 1000.0
+        self._stop = Event()
+        self._flush_lock = Lock()
+        self._thread: Thread | None = None
+        self._metrics_lock = Lock()
+        self._metrics = {
+            "enqueued": 0,
+            "flushed": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "last_batch_size": 0,
+            "last_flush_seconds": 0.0,
+            "max_lag_seconds": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, item: T) -> None:
+        try:
+            self._queue.put_nowait((monotonic(), item))
+        except Full as exc:
+            raise self.reject() from exc
+        self._bump("enqueued")
+
+    def reject(self) -> QueueFullError:
+        """Count a drop for a caller that found the queue full; returns the error for it to raise."""
+        self._bump("dropped")
+        return QueueFullError(f"{self.name} queue is full")
+
+    def has_capacity(self) -> bool:
+        return not self._queue.full()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def oldest_pending_age(self) -> float:
+        with self._queue.mutex:
+            oldest = self._queue.queue[0][0] if self._queue.queue else None
+        return monotonic() - oldest if oldest is not None else 0.0
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name=f"{self.name}-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.drain()
+
+    def drain(self) -> None:
+        while True:
+            batch = self._take_batch(block=False)
+            if not batch:
+                return
+            self._flush(batch)
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+        snapshot["pending"] = self.pending()
+        snapshot["oldest_pending_seconds"] = round(self.oldest_pending_age(), 6)
+        snapshot["capacity"] = self._queue.maxsize
+        snapshot["running"] = self.running
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._take_batch(block=True)
+            if batch:
+                self._flush(batch)
+
+    def _take_batch(self, *, block: bool) -> list[tuple[float, T]]:
+        batch: list[tuple[float, T]] = []
+        try:
+            batch.append(self._queue.get(timeout=self._interval) if block else self._queue.get_nowait())
+        except Empty:
+            return batch
+        deadline = monotonic() + self._interval
+        while len(batch) < self._max_batch:
+            remaining = deadline - monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if block and remaining > 0 else self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _flush(self, batch: list[tuple[float, T]]) -> None:
+        started = monotonic()
+        lag = started - batch[0][0]
+        with self._flush_lock:
+            try:
+                self._flush_fn([item for _, item in batch])
+            except Exception:  # noqa: BLE001
+                logger.exception("%s flush of %s items failed", self.name, len(batch))
+                self._bump("failed", len(batch))
+                return
+        with self._metrics_lock:
+            self._metrics["flushed"] += len(batch)
+            self._metrics["batches"] += 1
+            self._metrics["last_batch_size"] = len(batch)
+            self._metrics["last_flush_seconds"] = round(monotonic() - started, 6)
+            self._metrics["max_lag_seconds"] = round(max(self._metrics["max_lag_seconds"], lag), 6)
+
+    def _bump(self, key: str, amount: int = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[key] += amount
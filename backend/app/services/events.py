@@ -1,9 +1,103 @@
 from datetime import UTC, datetime
+import logging
+import uuid
 from uuid import UUID
 
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.hardening import AuditEvent, UsageEvent
+from app.services.batching import BatchWriter, QueueFullError
+
+logger = logging.getLogger(__name__)
+
+PENDING_EVENTS_KEY = "pending_pipeline_events"
+
+
+class EventPipeline:
+    """Buffers audit/usage rows in memory and writes them with bulk multi-row inserts."""
+
+    def __init__(self) -> None:
+        self._writer: BatchWriter[tuple[type, dict]] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._writer is not None
+
+    def start(self, *, background: bool = True) -> None:
+        self._writer = BatchWriter(
+            "events",
+            self._flush,
+            max_queue=settings.EVENT_PIPELINE_QUEUE_MAX,
+            max_batch=settings.EVENT_PIPELINE_FLUSH_MAX_ROWS,
+            flush_interval_ms=settings.EVENT_PIPELINE_FLUSH_INTERVAL_MS,
+        )
+        if background:
+            self._writer.start()
+
+    def stop(self) -> None:
+        if self._writer is not None:
+            self._writer.stop()
+        self._writer = None
+
+    def drain(self) -> None:
+        if self._writer is not None:
+            self._writer.drain()
+
+    def publish(self, rows: list[tuple[type, dict]]) -> None:
+        if self._writer is None:
+            return
+        for row in rows:
+            try:
+                self._writer.submit(row)
+            except QueueFullError:
+                # Events are best-effort telemetry; the drop is counted in metrics.
+                logger.warning("Event pipeline queue full; dropping %s event", row[1].get("event_name") or row[1].get("action"))
+
+    def metrics(self) -> dict:
+        if self._writer is None:
+            return {"mode": settings.EVENT_PIPELINE_MODE, "running": False}
+        return {"mode": settings.EVENT_PIPELINE_MODE, **self._writer.metrics()}
+
+    def _flush(self, batch: list[tuple[type, dict]]) -> None:
+        grouped: dict[type, list[dict]] = {}
+        for model, row in batch:
+            grouped.setdefault(model, []).append(row)
+        db = SessionLocal()
+        try:
+            for model, rows in grouped.items():
+                db.execute(insert(model), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+event_pipeline = EventPipeline()
+
+
+def _stage(db: Session, model: type, row: dict) -> None:
+    row.setdefault("id", uuid.uuid4())
+    if not db.in_transaction():
+        # Staged rows carry no ORM state, so begin explicitly to get commit/rollback hooks.
+        db.begin()
+    db.info.setdefault(PENDING_EVENTS_KEY, []).append((model, row))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_staged_events(db: Session) -> None:
+    staged = db.info.pop(PENDING_EVENTS_KEY, None)
+    if staged:
+        event_pipeline.publish(staged)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_staged_events(db: Session, _previous_transaction) -> None:
+    db.info.pop(PENDING_EVENTS_KEY, None)
 
 
 def log_audit_event(
@@ -15,18 +109,28 @@ def log_audit_event(
     actor_user_id: UUID | None = None,
     workspace_id: UUID | None = None,
     metadata: dict | None = None,
+    sync: bool | None = None,
 ) -> None:
-    db.add(
-        AuditEvent(
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            actor_user_id=actor_user_id,
-            workspace_id=workspace_id,
-            event_data=metadata,
-            created_at=datetime.now(UTC),
-        )
-    )
+    """Record an audit event.
+
+    Audit rows are written in the caller's transaction unless both the pipeline
+    is running and ``sync`` (default ``AUDIT_EVENTS_SYNC``) is false.
+    """
+    if sync is None:
+        sync = settings.AUDIT_EVENTS_SYNC
+    row = {
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "actor_user_id": actor_user_id,
+        "workspace_id": workspace_id,
+        "event_data": metadata,
+        "created_at": datetime.now(UTC),
+    }
+    if event_pipeline.enabled and not sync:
+        _stage(db, AuditEvent, row)
+        return
+    db.add(AuditEvent(**row))
 
 
 def log_usage_event(
@@ -37,12 +141,15 @@ def log_usage_event(
     workspace_id: UUID | None = None,
     payload: dict | None = None,
 ) -> None:
-    db.add(
-        UsageEvent(
-            event_name=event_name,
-            user_id=user_id,
-            workspace_id=workspace_id,
-            payload=payload,
-            created_at=datetime.now(UTC),
-        )
-    )
+    """Record a usage event; buffered through the pipeline once the caller commits when it is running."""
+    row = {
+        "event_name": event_name,
+        "user_id": user_id,
+        "workspace_id": workspace_id,
+        "payload": payload,
+        "created_at": datetime.now(UTC),
+    }
+    if event_pipeline.enabled:
+        _stage(db, UsageEvent, row)
+        return
+    db.add(UsageEvent(**row))
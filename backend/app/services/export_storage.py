@@ -0,0 +1,245 @@
+"""Where rendered exports live, addressed by the SHA-256 of their bytes.
+
+``local`` keeps blobs under ``REPORT_EXPORT_DIR/blobs``; ``s3`` keeps them in an
+S3-compatible bucket (AWS S3, MinIO, ...), so every instance serves every
+export. Bookkeeping (which assets reference which blob) lives in the database;
+see ``app.services.exports``.
+"""
+
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from functools import lru_cache
+import hashlib
+import hmac
+import os
+from pathlib import Path
+from urllib.parse import quote
+
+import httpx
+
+from app.core.config import settings
+
+EMPTY_PAYLOAD_SHA256 = hashlib.sha256(b"").hexdigest()
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def exports_dir() -> Path:
+    path = Path(settings.REPORT_EXPORT_DIR)
+    if not path.is_absolute():
+        path = Path(__file__).resolve().parents[2] / path
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def scratch_dir() -> Path:
+    """Local working space for renders before they are stored, whatever the backend."""
+    path = exports_dir() / "tmp"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class LocalExportStorage:
+    name = "local"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / digest
+
+    def location(self, digest: str) -> str:
+        return str(self.path(digest))
+
+    def local_path(self, digest: str) -> Path | None:
+        path = self.path(digest)
+        return path if path.exists() else None
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def put(self, digest: str, source: Path) -> None:
+        """Move ``source`` into place; a blob that is already stored is kept as is."""
+        target = self.path(digest)
+        if target.exists():
+            source.unlink(missing_ok=True)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+
+    def delete(self, digest: str) -> None:
+        self.path(digest).unlink(missing_ok=True)
+
+    def stream(self, digest: str, byte_range: tuple[int, int] | None = None) -> Iterator[bytes] | None:
+        path = self.local_path(digest)
+        if path is None:
+            return None
+        return _read_chunks(path, byte_range)
+
+
+def _read_chunks(path: Path, byte_range: tuple[int, int] | None = None) -> Iterator[bytes]:
+    start, end = byte_range or (0, None)
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            chunk = handle.read(STREAM_CHUNK_BYTES if remaining is None else min(STREAM_CHUNK_BYTES, remaining))
+            if not chunk:
+                return
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def _hmac(key: bytes, value: str) -> bytes:
+    return hmac.new(key, value.encode(), hashlib.sha256).digest()
+
+
+class S3ExportStorage:
+    """Blobs in an S3-compatible bucket over path-style URLs, signed with AWS Signature Version 4.
+
+    Uploads stream from the file and are signed with the blob's own SHA-256, so
+    the server verifies the bytes it stored.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        *,
+        access_key_id: str,
+        secret_access_key: str,
+        region: str = "us-east-1",
+        prefix: str = "",
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        self.bucket = bucket
+        self.region = region
+        self.prefix = prefix
+        self._access_key_id = access_key_id
+        self._secret_access_key = secret_access_key
+        self._client = httpx.Client(base_url=endpoint_url.rstrip("/"), transport=transport, timeout=httpx.Timeout(30.0, read=300.0))
+
+    def location(self, digest: str) -> str:
+        return f"s3://{self.bucket}/{self.prefix}{digest}"
+
+    def local_path(self, digest: str) -> Path | None:
+        return None
+
+    def exists(self, digest: str) -> bool:
+        response = self._send("HEAD", digest)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def put(self, digest: str, source: Path) -> None:
+        size = source.stat().st_size
+        with open(source, "rb") as handle:
+            response = self._send(
+                "PUT",
+                digest,
+                payload_sha256=digest,
+                content=handle,
+                headers={"Content-Length": str(size), "Content-Type": "application/octet-stream"},
+            )
+        response.raise_for_status()
+        source.unlink(missing_ok=True)
+
+    def delete(self, digest: str) -> None:
+        response = self._send("DELETE", digest)
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    def stream(self, digest: str, byte_range: tuple[int, int] | None = None) -> Iterator[bytes] | None:
+        """Stream the blob, or the inclusive ``byte_range`` of it."""
+        headers = {"Range": f"bytes={byte_range[0]}-{byte_range[1]}"} if byte_range else None
+        response = self._send("GET", digest, headers=headers, stream=True)
+        if response.status_code == 404:
+            response.close()
+            return None
+        if response.is_error:
+            response.read()
+            response.raise_for_status()
+        return _iter_and_close(response)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _send(
+        self,
+        method: str,
+        digest: str,
+        *,
+        payload_sha256: str = EMPTY_PAYLOAD_SHA256,
+        content=None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        path = quote(f"/{self.bucket}/{self.prefix}{digest}", safe="/-_.~")
+        request = self._client.build_request(
+            method, path, content=content, headers={**(headers or {}), **self._sign(method, path, payload_sha256)}
+        )
+        return self._client.send(request, stream=stream)
+
+    def _sign(self, method: str, path: str, payload_sha256: str, now: datetime | None = None) -> dict[str, str]:
+        now = now or datetime.now(UTC)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{now:%Y%m%d}/{self.region}/s3/aws4_request"
+        host = self._client.base_url.netloc.decode()
+        canonical_request = "\n".join(
+            [
+                method,
+                path,
+                "",
+                f"host:{host}\nx-amz-content-sha256:{payload_sha256}\nx-amz-date:{amz_date}\n",
+                "host;x-amz-content-sha256;x-amz-date",
+                payload_sha256,
+            ]
+        )
+        string_to_sign = "\n".join(["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()])
+        key = _hmac(f"AWS4{self._secret_access_key}".encode(), f"{now:%Y%m%d}")
+        for part in (self.region, "s3", "aws4_request"):
+            key = _hmac(key, part)
+        signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        return {
+            "x-amz-date": amz_date,
+            "x-amz-content-sha256": payload_sha256,
+            "Authorization": (
+                f"AWS4-HMAC-SHA256 Credential={self._access_key_id}/{scope}, "
+                f"SignedHeaders=host;x-amz-content-sha256;x-amz-date, Signature={signature}"
+            ),
+        }
+
+
+def _iter_and_close(response: httpx.Response) -> Iterator[bytes]:
+    try:
+        yield from response.iter_bytes(STREAM_CHUNK_BYTES)
+    finally:
+        response.close()
+
+
+ExportStorage = LocalExportStorage | S3ExportStorage
+
+
+@lru_cache(maxsize=4)
+def _s3_storage(endpoint_url: str, bucket: str, access_key_id: str, secret_access_key: str, region: str, prefix: str) -> S3ExportStorage:
+    return S3ExportStorage(
+        endpoint_url, bucket, access_key_id=access_key_id, secret_access_key=secret_access_key, region=region, prefix=prefix
+    )
+
+
+def get_export_storage() -> ExportStorage:
+    if settings.EXPORT_STORAGE_BACKEND == "s3":
+        if not settings.EXPORT_S3_ENDPOINT_URL or not settings.EXPORT_S3_ACCESS_KEY_ID or not settings.EXPORT_S3_SECRET_ACCESS_KEY:
+            raise RuntimeError("EXPORT_STORAGE_BACKEND=s3 needs EXPORT_S3_ENDPOINT_URL, EXPORT_S3_ACCESS_KEY_ID and EXPORT_S3_SECRET_ACCESS_KEY")
+        return _s3_storage(
+            settings.EXPORT_S3_ENDPOINT_URL,
+            settings.EXPORT_S3_BUCKET,
+            settings.EXPORT_S3_ACCESS_KEY_ID,
+            settings.EXPORT_S3_SECRET_ACCESS_KEY,
+            settings.EXPORT_S3_REGION,
+            settings.EXPORT_S3_PREFIX,
+        )
+    return LocalExportStorage(exports_dir())
@@ -0,0 +1,255 @@
+"""Reference-counted export blobs and the sweeper that reclaims them.
+
+Every ``ExportAsset`` holds one reference on its ``ExportBlob``. A job takes
+its reference before uploading, so a blob with references is never deleted
+under it. The sweeper claims an unreferenced blob (``ref_count`` -1) before
+deleting the stored bytes, so a job that wants the same bytes at that moment
+waits for the row to go and then stores them again. Every step is a
+conditional ``UPDATE``/``DELETE``, so several instances can sweep at once.
+"""
+
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+import logging
+from pathlib import Path
+from threading import Event, Lock, Thread
+import time
+from uuid import UUID
+
+from sqlalchemy import case, delete, exists, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.hardening import ExportAsset, ExportBlob
+from app.services.export_storage import ExportStorage, get_export_storage, scratch_dir
+
+logger = logging.getLogger(__name__)
+
+# A referenced blob with no asset this old is left over from a job that died between storing and recording it.
+ORPHAN_GRACE = timedelta(hours=1)
+# Downloads refresh a blob's LRU position at most this often, so serving a file rarely writes.
+ACCESS_TOUCH_INTERVAL = timedelta(minutes=1)
+ATTACH_ATTEMPTS = 20
+
+
+class BlobBusyError(RuntimeError):
+    pass
+
+
+def attach_blob(db: Session, digest: str, size_bytes: int, render_key: str | None = None) -> UUID:
+    """Take a reference on the blob with ``digest``, creating its row if needed; the caller commits."""
+    for attempt in range(ATTACH_ATTEMPTS):
+        blob_id = db.scalar(
+            update(ExportBlob)
+            .where(ExportBlob.digest == digest, ExportBlob.ref_count >= 0)
+            .values(ref_count=ExportBlob.ref_count + 1, last_accessed_at=datetime.now(UTC))
+            .returning(ExportBlob.id)
+            .execution_options(synchronize_session=False)
+        )
+        if blob_id is not None:
+            return blob_id
+        blob = ExportBlob(digest=digest, size_bytes=size_bytes, ref_count=1, render_key=render_key, last_accessed_at=datetime.now(UTC))
+        try:
+            with db.begin_nested():
+                db.add(blob)
+            return blob.id
+        except IntegrityError:
+            # Another job created it, or a sweeper is deleting it; the first resolves on retry, the second once the row is gone.
+            time.sleep(0.05 * (attempt + 1))
+    raise BlobBusyError("Export storage is busy; retry the export")
+
+
+def release_blob(db: Session, blob_id: UUID, count: int = 1) -> None:
+    db.execute(
+        update(ExportBlob)
+        .where(ExportBlob.id == blob_id, ExportBlob.ref_count > 0)
+        .values(ref_count=case((ExportBlob.ref_count > count, ExportBlob.ref_count - count), else_=0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def cached_blob(db: Session, render_key: str) -> ExportBlob | None:
+    return db.scalar(select(ExportBlob).where(ExportBlob.render_key == render_key, ExportBlob.ref_count >= 0).limit(1))
+
+
+def touch_blob(db: Session, blob_id: UUID) -> None:
+    now = datetime.now(UTC)
+    result = db.execute(
+        update(ExportBlob)
+        .where(ExportBlob.id == blob_id, ExportBlob.last_accessed_at < now - ACCESS_TOUCH_INTERVAL)
+        .values(last_accessed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        db.commit()
+
+
+def _expire_assets(db: Session, now: datetime, batch_size: int) -> int:
+    expired = 0
+    while True:
+        ids = db.scalars(select(ExportAsset.id).where(ExportAsset.expires_at < now).order_by(ExportAsset.expires_at).limit(batch_size)).all()
+        if not ids:
+            return expired
+        expired += _delete_assets(db, ExportAsset.id.in_(ids))
+
+
+def _delete_assets(db: Session, condition) -> int:
+    # RETURNING reports only the rows this sweeper deleted, so concurrent sweepers never release a reference twice.
+    rows = db.execute(delete(ExportAsset).where(condition).returning(ExportAsset.blob_id, ExportAsset.storage_path)).all()
+    for blob_id, count in Counter(blob_id for blob_id, _ in rows if blob_id is not None).items():
+        release_blob(db, blob_id, count)
+    db.commit()
+    legacy_paths = {path for blob_id, path in rows if blob_id is None}
+    for path in legacy_paths:
+        if not db.scalar(select(exists().where(ExportAsset.storage_path == path))):
+            Path(path).unlink(missing_ok=True)
+    return len(rows)
+
+
+def _collect_garbage(db: Session, storage: ExportStorage, now: datetime, batch_size: int) -> tuple[int, int]:
+    deleted = freed = 0
+    orphaned = (ExportBlob.ref_count > 0) & (ExportBlob.last_accessed_at < now - ORPHAN_GRACE) & ~exists().where(ExportAsset.blob_id == ExportBlob.id)
+    while True:
+        ids = db.scalars(select(ExportBlob.id).where(or_(ExportBlob.ref_count <= 0, orphaned)).limit(batch_size)).all()
+        if not ids:
+            return deleted, freed
+        # Counts lost to cascaded deletes (a survey and its assets removed together) are reset here.
+        db.execute(update(ExportBlob).where(ExportBlob.id.in_(ids), orphaned).values(ref_count=0).execution_options(synchronize_session=False))
+        db.execute(
+            update(ExportBlob).where(ExportBlob.id.in_(ids), ExportBlob.ref_count == 0).values(ref_count=-1).execution_options(synchronize_session=False)
+        )
+        db.commit()
+        claimed = db.execute(select(ExportBlob.id, ExportBlob.digest, ExportBlob.size_bytes).where(ExportBlob.id.in_(ids), ExportBlob.ref_count == -1)).all()
+        for _, digest, _ in claimed:
+            storage.delete(digest)
+        db.execute(delete(ExportBlob).where(ExportBlob.id.in_([row.id for row in claimed]), ExportBlob.ref_count == -1))
+        db.commit()
+        deleted += len(claimed)
+        freed += sum(row.size_bytes for row in claimed)
+        if not claimed:
+            # Every candidate was taken back by a job in the meantime.
+            return deleted, freed
+
+
+def _stored_bytes(db: Session) -> int:
+    return int(db.scalar(select(func.coalesce(func.sum(ExportBlob.size_bytes), 0)).where(ExportBlob.ref_count >= 0)))
+
+
+def _evict_lru(db: Session, over_bytes: int, batch_size: int) -> int:
+    """Drop the assets of the least recently downloaded blobs until ``over_bytes`` would be freed."""
+    evicted = 0
+    candidates = db.execute(
+        select(ExportBlob.id, ExportBlob.size_bytes).where(ExportBlob.ref_count > 0).order_by(ExportBlob.last_accessed_at).limit(batch_size)
+    ).all()
+    victims = []
+    for blob_id, size_bytes in candidates:
+        if over_bytes <= 0:
+            break
+        victims.append(blob_id)
+        over_bytes -= size_bytes
+    if victims:
+        evicted = _delete_assets(db, ExportAsset.blob_id.in_(victims))
+    return evicted
+
+
+def _sweep_scratch(now: datetime) -> None:
+    # Renders interrupted by a crash leave their partial files behind.
+    cutoff = (now - ORPHAN_GRACE).timestamp()
+    for path in scratch_dir().iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            continue
+
+
+def sweep_exports(db: Session, storage: ExportStorage, *, batch_size: int, max_bytes: int = 0, now: datetime | None = None) -> dict:
+    """Delete expired assets, then unreferenced blobs, then evict least recently used blobs beyond ``max_bytes``."""
+    now = now or datetime.now(UTC)
+    expired = _expire_assets(db, now, batch_size)
+    deleted, freed = _collect_garbage(db, storage, now, batch_size)
+    evicted = 0
+    stored = _stored_bytes(db)
+    while max_bytes > 0 and stored > max_bytes:
+        evicted_now = _evict_lru(db, stored - max_bytes, batch_size)
+        more_deleted, more_freed = _collect_garbage(db, storage, now, batch_size)
+        evicted += evicted_now
+        deleted += more_deleted
+        freed += more_freed
+        if not evicted_now and not more_deleted:
+            break
+        stored = _stored_bytes(db)
+    _sweep_scratch(now)
+    return {
+        "expired_assets": expired,
+        "evicted_assets": evicted,
+        "deleted_blobs": deleted,
+        "freed_bytes": freed,
+        "stored_bytes": stored,
+    }
+
+
+def run_export_sweep() -> dict:
+    db = SessionLocal()
+    try:
+        return sweep_exports(
+            db, get_export_storage(), batch_size=settings.EXPORT_SWEEP_BATCH_SIZE, max_bytes=settings.EXPORT_STORAGE_MAX_BYTES
+        )
+    finally:
+        db.close()
+
+
+class ExportSweeper:
+    def __init__(self) -> None:
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._lock = Lock()
+        self._last_run: dict | None = None
+        self._runs = 0
+        self._failures = 0
+
+    def start(self, interval_seconds: int) -> None:
+        self._stop.clear()
+        self._thread = Thread(target=self._run, args=(interval_seconds,), name="export-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def run_once(self) -> dict:
+        try:
+            result = run_export_sweep()
+        except Exception:
+            with self._lock:
+                self._failures += 1
+            raise
+        with self._lock:
+            self._runs += 1
+            self._last_run = {**result, "finished_at": datetime.now(UTC).isoformat()}
+        return result
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "backend": settings.EXPORT_STORAGE_BACKEND,
+                "max_bytes": settings.EXPORT_STORAGE_MAX_BYTES,
+                "sweeps": self._runs,
+                "failures": self._failures,
+                "last_sweep": self._last_run,
+            }
+
+    def _run(self, interval_seconds: int) -> None:
+        while not self._stop.wait(interval_seconds):
+            try:
+                logger.info("Export sweep finished: %s", self.run_once())
+            except Exception:  # noqa: BLE001
+                logger.exception("Export sweep failed")
+
+
+export_sweeper = ExportSweeper()
+
@@ -0,0 +1,361 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import fcntl
+import json
+import logging
+import os
+from pathlib import Path
+import re
+import shutil
+from threading import Lock
+from time import monotonic, time
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.feedback import SurveyResponse
+from app.services.batching import BatchWriter, QueueFullError
+from app.services.insights import run_insight_analysis
+from app.services.submissions import PendingSubmission, insert_submissions
+
+logger = logging.getLogger(__name__)
+
+UNWRITTEN_RETRY_SECONDS = 30.0
+REPLAY_LOOKUP_CHUNK = 500
+
+__all__ = ["QueueFullError", "SubmissionBuffer", "SubmissionWAL", "WALLockedError", "submission_buffer"]
+
+
+class WALLockedError(RuntimeError):
+    pass
+
+
+def _encode(submission: PendingSubmission) -> str:
+    return json.dumps(
+        {
+            "response_id": str(submission.response_id),
+            "survey_id": str(submission.survey_id),
+            "submitted_at": submission.submitted_at.isoformat(),
+            "answers": [[str(question_id), value] for question_id, value in submission.answers],
+            "respondent_meta": submission.respondent_meta,
+            "workspace_id": str(submission.workspace_id) if submission.workspace_id else None,
+        },
+        separators=(",", ":"),
+    )
+
+
+def _decode(line: str) -> PendingSubmission:
+    record = json.loads(line)
+    return PendingSubmission(
+        response_id=UUID(record["response_id"]),
+        survey_id=UUID(record["survey_id"]),
+        submitted_at=datetime.fromisoformat(record["submitted_at"]),
+        answers=[(UUID(question_id), value) for question_id, value in record["answers"]],
+        respondent_meta=record.get("respondent_meta"),
+        workspace_id=UUID(record["workspace_id"]) if record.get("workspace_id") else None,
+    )
+
+
+class SubmissionWAL:
+    """Append-only JSON-lines log of queued submissions, replayed on startup.
+
+    The file is held under an exclusive ``flock`` for as long as it is open, so
+    two processes never share a log.
+    """
+
+    def __init__(self, path: Path, *, fsync: bool = True) -> None:
+        self.path = path
+        self.fsync = fsync
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            handle = open(self.path, "a", encoding="utf-8")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError as exc:
+                handle.close()
+                raise WALLockedError(f"{self.path} is in use by another process") from exc
+            # reset() swaps the file; a lock taken on the replaced one protects nothing.
+            if os.fstat(handle.fileno()).st_ino == os.stat(self.path).st_ino:
+                self._handle = handle
+                return
+            handle.close()
+
+    def append(self, submission: PendingSubmission) -> None:
+        self._handle.write(_encode(submission) + "\n")
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+
+    def read(self) -> list[PendingSubmission]:
+        if not self.path.exists():
+            return []
+        items = []
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    items.append(_decode(line))
+                except (ValueError, KeyError):
+                    # A torn final line from a crash mid-write is expected; anything else is logged.
+                    logger.warning("Skipping unreadable submission WAL record in %s", self.path)
+        return items
+
+    def preserve(self, items: list[PendingSubmission] | None = None) -> Path:
+        """Copy the current log, or just ``items``, aside (for manual recovery)."""
+        target = self.path.with_name(f"{self.path.name}.failed-{int(time())}")
+        if items is None:
+            shutil.copyfile(self.path, target)
+            logger.error("Submission WAL records could not be replayed; preserved copy at %s", target)
+        else:
+            with open(target, "a", encoding="utf-8") as handle:
+                handle.writelines(_encode(item) + "\n" for item in items)
+            logger.error("Set aside %s submissions that could not be written at %s", len(items), target)
+        return target
+
+    def truncate(self) -> None:
+        self._handle.truncate(0)
+        self._handle.seek(0)
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+
+    def reset(self, keep: list[PendingSubmission]) -> None:
+        """Replace the log with just ``keep``; the swap is atomic, so a crash leaves the old or the new log."""
+        if not keep:
+            self.truncate()
+            return
+        staging = self.path.with_name(f"{self.path.name}.tmp")
+        handle = open(staging, "w", encoding="utf-8")
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        handle.writelines(_encode(item) + "\n" for item in keep)
+        handle.flush()
+        if self.fsync:
+            os.fsync(handle.fileno())
+        os.replace(staging, self.path)
+        self._handle.close()
+        self._handle = handle
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def _wal_path() -> Path:
+    path = Path(settings.PUBLIC_INGEST_WAL_PATH)
+    if not path.is_absolute():
+        path = Path(__file__).resolve().parents[2] / path
+    return path
+
+
+def _wal_slots(base: Path) -> list[Path]:
+    """Every log that workers sharing ``base`` may have written: ``base`` itself, then ``<stem>.<n><suffix>``."""
+    pattern = re.compile(rf"{re.escape(base.stem)}\.(\d+){re.escape(base.suffix)}")
+    slots = {int(match[1]): path for path in base.parent.glob("*") if (match := pattern.fullmatch(path.name))}
+    return [base, *(slots[slot] for slot in sorted(slots))]
+
+
+def _slot_path(base: Path, slot: int) -> Path:
+    return base if slot == 0 else base.with_name(f"{base.stem}.{slot}{base.suffix}")
+
+
+def _claim_wal(base: Path, *, fsync: bool) -> SubmissionWAL:
+    """Open the first log no other process holds, so each worker of a multi-process server gets its own."""
+    slot = 0
+    while True:
+        try:
+            return SubmissionWAL(_slot_path(base, slot), fsync=fsync)
+        except WALLockedError:
+            slot += 1
+
+
+class SubmissionBuffer:
+    """Write-behind queue for public submissions flushed in group commits."""
+
+    def __init__(self) -> None:
+        self._writer: BatchWriter[PendingSubmission] | None = None
+        self._wal: SubmissionWAL | None = None
+        self._lock = Lock()
+        self._insight_executor: ThreadPoolExecutor | None = None
+        # Logged submissions not yet flushed, in log order, and flushed ones still taking up room in the log.
+        self._pending: deque[PendingSubmission] = deque()
+        self._settled = 0
+        # Submissions whose write failed; they stay in the WAL and are retried every UNWRITTEN_RETRY_SECONDS.
+        self._unwritten: list[PendingSubmission] = []
+        self._retry_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._writer is not None
+
+    def start(self, *, background: bool = True) -> None:
+        self._writer = BatchWriter(
+            "submissions",
+            self._flush,
+            max_queue=settings.PUBLIC_INGEST_QUEUE_MAX,
+            max_batch=settings.PUBLIC_INGEST_FLUSH_MAX_ROWS,
+            flush_interval_ms=settings.PUBLIC_INGEST_FLUSH_INTERVAL_MS,
+        )
+        self._insight_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-insights")
+        if settings.PUBLIC_INGEST_DURABILITY == "wal":
+            self._wal = _claim_wal(_wal_path(), fsync=settings.PUBLIC_INGEST_WAL_FSYNC)
+            self.replay()
+            self._replay_abandoned()
+        if background:
+            self._writer.start()
+
+    def stop(self) -> None:
+        if self._writer is not None:
+            self._writer.stop()
+        if self._wal is not None:
+            self._wal.close()
+        if self._insight_executor is not None:
+            self._insight_executor.shutdown(wait=True)
+        self._writer = None
+        self._wal = None
+        self._insight_executor = None
+        self._pending.clear()
+        self._settled = 0
+        self._unwritten = []
+        self._retry_at = 0.0
+
+    def enqueue(self, submission: PendingSubmission) -> None:
+        if self._writer is None:
+            raise RuntimeError("Submission buffer is not running")
+        with self._lock:
+            # Only the writer takes items off the queue, so capacity seen under the lock is still there below.
+            if not self._writer.has_capacity():
+                raise self._writer.reject()
+            if self._wal is not None:
+                self._wal.append(submission)
+                self._pending.append(submission)
+            self._writer.submit(submission)
+
+    def drain(self) -> None:
+        if self._writer is not None:
+            self._writer.drain()
+
+    def replay(self) -> int:
+        """Write any WAL records that never reached the database; returns the number replayed."""
+        if self._wal is None:
+            return 0
+        replayed, unwritten = self._replay_log(self._wal)
+        with self._lock:
+            # Records that still cannot be written stay in the log and are retried while running.
+            self._unwritten = unwritten
+            self._retry_at = monotonic() + UNWRITTEN_RETRY_SECONDS
+            self._wal.reset(unwritten)
+        return replayed
+
+    def _replay_abandoned(self) -> None:
+        # Logs of workers that are gone (fewer workers after a restart, or a crash) are unlocked; replay them here.
+        for path in _wal_slots(_wal_path()):
+            if path == self._wal.path or not path.exists():
+                continue
+            try:
+                wal = SubmissionWAL(path, fsync=self._wal.fsync)
+            except WALLockedError:
+                continue
+            try:
+                _, unwritten = self._replay_log(wal)
+                wal.reset(unwritten)
+            finally:
+                wal.close()
+
+    def _replay_log(self, wal: SubmissionWAL) -> tuple[int, list[PendingSubmission]]:
+        records = wal.read()
+        unwritten = []
+        if records:
+            existing = set()
+            db = SessionLocal()
+            try:
+                for start in range(0, len(records), REPLAY_LOOKUP_CHUNK):
+                    chunk = [item.response_id for item in records[start : start + REPLAY_LOOKUP_CHUNK]]
+                    existing.update(db.scalars(select(SurveyResponse.id).where(SurveyResponse.id.in_(chunk))))
+            finally:
+                db.close()
+            records = [item for item in records if item.response_id not in existing]
+            step = settings.PUBLIC_INGEST_FLUSH_MAX_ROWS
+            for start in range(0, len(records), step):
+                unwritten.extend(self._write(records[start : start + step]))
+            if unwritten:
+                wal.preserve()
+        logger.info("Replayed %s queued submissions from %s", len(records), wal.path)
+        return len(records), unwritten
+
+    def metrics(self) -> dict:
+        if self._writer is None:
+            return {"mode": settings.PUBLIC_INGEST_MODE, "running": False}
+        return {
+            "mode": settings.PUBLIC_INGEST_MODE,
+            "durability": settings.PUBLIC_INGEST_DURABILITY,
+            **self._writer.metrics(),
+            "unwritten": len(self._unwritten),
+        }
+
+    def _flush(self, batch: list[PendingSubmission]) -> None:
+        # Only the writer thread flushes, and replay() runs before it starts, so _unwritten needs no lock here.
+        unwritten = self._write(batch)
+        settled = len(batch) - len(unwritten)
+        if self._unwritten and monotonic() >= self._retry_at:
+            # Earlier failures are retried on a timer, not with every batch, so a row that can never be written costs little.
+            retried = len(self._unwritten)
+            self._unwritten = self._write(self._unwritten)
+            settled += retried - len(self._unwritten)
+            self._retry_at = monotonic() + UNWRITTEN_RETRY_SECONDS
+        self._unwritten.extend(unwritten)
+        overflow = len(self._unwritten) - settings.PUBLIC_INGEST_UNWRITTEN_MAX
+        if overflow > 0:
+            set_aside, self._unwritten = self._unwritten[:overflow], self._unwritten[overflow:]
+            settled += overflow
+            if self._wal is not None:
+                self._wal.preserve(set_aside)
+            else:
+                logger.error("Dropped %s submissions that could not be written", overflow)
+        with self._lock:
+            if self._wal is None:
+                return
+            for _ in batch:
+                self._pending.popleft()
+            self._settled += settled
+            # Compact once settled records take up as much of the log as live ones, so it stays within twice its live size.
+            if self._settled and self._settled >= len(self._unwritten) + len(self._pending):
+                self._wal.reset([*self._unwritten, *self._pending])
+                self._settled = 0
+
+    def _write(self, batch: list[PendingSubmission]) -> list[PendingSubmission]:
+        """Group-commit ``batch``; returns the submissions that could not be written."""
+        unwritten = []
+        try:
+            run_ids = self._commit(batch)
+        except SQLAlchemyError:
+            # One bad row (e.g. a survey deleted while queued) must not sink the whole group.
+            logger.exception("Group commit of %s submissions failed; retrying individually", len(batch))
+            run_ids = []
+            for item in batch:
+                try:
+                    run_ids.extend(self._commit([item]))
+                except SQLAlchemyError:
+                    unwritten.append(item)
+                    logger.exception("Could not write queued submission response_id=%s", item.response_id)
+        if self._insight_executor is not None:
+            for run_id in run_ids:
+                self._insight_executor.submit(run_insight_analysis, run_id)
+        return unwritten
+
+    def _commit(self, batch: list[PendingSubmission]) -> list[UUID]:
+        db = SessionLocal()
+        try:
+            run_ids = insert_submissions(db, batch)
+            db.commit()
+            return run_ids
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+submission_buffer = SubmissionBuffer()
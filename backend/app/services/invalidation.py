@@ -0,0 +1,171 @@
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+import logging
+from select import select as wait_readable
+from threading import Event, Lock, Thread
+
+from sqlalchemy import delete, func, insert, select
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.hardening import CacheInvalidation
+
+logger = logging.getLogger(__name__)
+
+SURVEY_TOPIC = "survey"
+MEMBERSHIP_TOPIC = "membership"
+TOKEN_VERSION_TOPIC = "token_version"
+NOTIFY_CHANNEL = "cache_invalidation"
+
+
+class InvalidationBus:
+    """Fans cache invalidations out to in-process subscribers and, optionally, to other workers.
+
+    Local subscribers always run synchronously inside ``publish``. With
+    ``CACHE_INVALIDATION_BACKEND=database`` the message is also appended to
+    ``cache_invalidations``. Every worker polls that table and replays new rows
+    into its own subscribers. That needs no broker, only the database the
+    workers already share, and works on SQLite for local multi-worker runs.
+    ``postgres`` instead sends ``pg_notify`` on ``NOTIFY_CHANNEL`` and each
+    worker holds one ``LISTEN`` connection, so peers see the change at once.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Callable[[str], None]]] = {}
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._last_id = 0
+        self._metrics = {"published": 0, "received": 0, "poll_errors": 0, "listen_errors": 0}
+
+    @property
+    def distributed(self) -> bool:
+        return self._thread is not None
+
+    def subscribe(self, topic: str, handler: Callable[[str], None]) -> None:
+        with self._lock:
+            self._handlers.setdefault(topic, []).append(handler)
+
+    def publish(self, topic: str, key: object) -> None:
+        """Invalidate ``key`` everywhere; call after the change has been committed."""
+        key = str(key)
+        self._dispatch(topic, key)
+        self._metrics["published"] += 1
+        if not self.distributed:
+            return
+        db = SessionLocal()
+        try:
+            if settings.CACHE_INVALIDATION_BACKEND == "postgres":
+                db.execute(select(func.pg_notify(NOTIFY_CHANNEL, f"{topic}:{key}")))
+            else:
+                db.execute(insert(CacheInvalidation).values(topic=topic, key=key, created_at=datetime.now(UTC)))
+            db.commit()
+        except Exception:  # noqa: BLE001
+            # Peers fall back to their TTLs; the local cache is already clean.
+            db.rollback()
+            logger.exception("Failed to broadcast %s invalidation for %s", topic, key)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        target = self._listen
+        if settings.CACHE_INVALIDATION_BACKEND != "postgres":
+            target = self._run
+            db = SessionLocal()
+            try:
+                self._last_id = db.scalar(select(func.max(CacheInvalidation.id))) or 0
+            finally:
+                db.close()
+        self._stop.clear()
+        self._thread = Thread(target=target, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def poll(self) -> int:
+        """Apply invalidations written by any worker since the last poll; returns how many were applied."""
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(CacheInvalidation.id, CacheInvalidation.topic, CacheInvalidation.key)
+                .where(CacheInvalidation.id > self._last_id)
+                .order_by(CacheInvalidation.id)
+            ).all()
+        finally:
+            db.close()
+        for row_id, topic, key in rows:
+            self._dispatch(topic, key)
+            self._last_id = row_id
+        self._metrics["received"] += len(rows)
+        return len(rows)
+
+    def receive(self, payload: str) -> None:
+        """Apply one ``topic:key`` notification sent by a peer."""
+        topic, _, key = payload.partition(":")
+        self._dispatch(topic, key)
+        self._metrics["received"] += 1
+
+    def prune(self, older_than: timedelta = timedelta(hours=1)) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(delete(CacheInvalidation).where(CacheInvalidation.created_at < datetime.now(UTC) - older_than))
+            db.commit()
+        finally:
+            db.close()
+
+    def metrics(self) -> dict:
+        return {"backend": settings.CACHE_INVALIDATION_BACKEND, "running": self.distributed, **self._metrics}
+
+    def _dispatch(self, topic: str, key: str) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(key)
+            except Exception:  # noqa: BLE001
+                logger.exception("Invalidation handler for %s failed", topic)
+
+    def _run(self) -> None:
+        interval = max(settings.CACHE_INVALIDATION_POLL_INTERVAL_MS, 10) / 1000.0
+        polls = 0
+        while not self._stop.wait(interval):
+            try:
+                self.poll()
+                polls += 1
+                if polls % 3600 == 0:
+                    self.prune()
+            except Exception:  # noqa: BLE001
+                self._metrics["poll_errors"] += 1
+                logger.exception("Cache invalidation poll failed")
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = engine.raw_connection()
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                with driver_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                while not self._stop.is_set():
+                    if not wait_readable([driver_connection], [], [], 1.0)[0]:
+                        continue
+                    driver_connection.poll()
+                    while driver_connection.notifies:
+                        self.receive(driver_connection.notifies.pop(0).payload)
+            except Exception:  # noqa: BLE001
+                # Notifications sent while reconnecting are lost; cache TTLs bound the damage.
+                self._metrics["listen_errors"] += 1
+                logger.exception("Cache invalidation listener failed")
+                self._stop.wait(1.0)
+            finally:
+                if connection is not None:
+                    # Never hand a LISTEN/autocommit connection back to the pool.
+                    connection.invalidate()
+
+
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from uuid import UUID
+
+from app.core.config import settings
+from app.models.workspace import WorkspaceRole
+from app.services.invalidation import MEMBERSHIP_TOPIC, invalidation_bus
+
+MISS = object()
+
+
+def membership_key(workspace_id: UUID, user_id: UUID) -> str:
+    return f"{workspace_id}:{user_id}"
+
+
+class MembershipCache:
+    """Short-lived LRU cache of ``(user_id, workspace_id) -> role`` for authorization checks.
+
+    ``None`` records a confirmed non-member of an existing workspace. Membership
+    writes invalidate entries through the bus; the TTL bounds staleness when a
+    broadcast from another worker is lost.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple[UUID, UUID], tuple[float, WorkspaceRole | None]] = OrderedDict()
+        self._generation = 0
+        self._lock = Lock()
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: UUID, workspace_id: UUID) -> WorkspaceRole | None | object:
+        """Return the cached role, ``None`` for a cached non-member, or ``MISS``."""
+        key = (user_id, workspace_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._metrics["misses"] += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return entry[1]
+
+    def put(self, user_id: UUID, workspace_id: UUID, role: WorkspaceRole | None, generation: int) -> None:
+        if settings.MEMBERSHIP_CACHE_TTL_SECONDS <= 0:
+            return
+        key = (user_id, workspace_id)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (monotonic() + settings.MEMBERSHIP_CACHE_TTL_SECONDS, role)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.MEMBERSHIP_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def invalidate(self, workspace_id: UUID, user_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            self._metrics["invalidations"] += 1
+            self._entries.pop((user_id, workspace_id), None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._metrics = dict.fromkeys(self._metrics, 0)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                "entries": len(self._entries),
+                "capacity": settings.MEMBERSHIP_CACHE_MAX_ENTRIES,
+                **self._metrics,
+                "hit_rate": round(self._metrics["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _invalidate(key: str) -> None:
+    workspace_id, _, user_id = key.partition(":")
+    workspace_roles.invalidate(UUID(workspace_id), UUID(user_id))
+
+
+workspace_roles = MembershipCache()
+invalidation_bus.subscribe(MEMBERSHIP_TOPIC, _invalidate)
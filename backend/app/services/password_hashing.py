@@ -0,0 +1,88 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from threading import Lock
+from typing import TypeVar
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+T = TypeVar("T")
+
+
+class HasherBusyError(RuntimeError):
+    pass
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated process pool so a login burst cannot starve the API of the GIL.
+
+    At most ``PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_MAX`` operations are
+    admitted at once; further calls fail fast with ``HasherBusyError``, which the
+    auth endpoints turn into a 503. ``PASSWORD_HASH_WORKERS=0`` keeps hashing on
+    the default thread pool, bounded the same way.
+    """
+
+    def __init__(self) -> None:
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+        self._in_flight = 0
+        self._metrics = {"completed": 0, "rejected": 0}
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(verify_password, password, password_hash)
+
+    def start(self) -> None:
+        self._pool()
+
+    def stop(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "in_flight": self._in_flight,
+                "capacity": self._capacity(),
+                **self._metrics,
+            }
+
+    async def _run(self, fn: Callable[..., T], *args: str) -> T:
+        with self._lock:
+            if self._in_flight >= self._capacity():
+                self._metrics["rejected"] += 1
+                raise HasherBusyError("Password hashing capacity exhausted")
+            self._in_flight += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+            with self._lock:
+                self._metrics["completed"] += 1
+            return result
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _capacity(self) -> int:
+        return max(settings.PASSWORD_HASH_WORKERS, 1) + settings.PASSWORD_HASH_QUEUE_MAX
+
+    def _pool(self) -> ProcessPoolExecutor | None:
+        if settings.PASSWORD_HASH_WORKERS <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs flush/listener threads can inherit held locks.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,184 @@
+"""A small PDF 1.4 writer for generated reports.
+
+Only what the report templates need: text in the standard Helvetica faces
+(no font embedding, WinAnsi encoding), lines and filled rectangles.
+Coordinates are in points from the top-left corner of the page. Output is
+deterministic for the same drawing calls, which keeps rendered reports
+content-addressable.
+"""
+
+from typing import BinaryIO
+import zlib
+
+A4_PORTRAIT = (595.28, 841.89)
+SLIDE_16_9 = (960.0, 540.0)
+
+Color = tuple[float, float, float]
+BLACK: Color = (0.0, 0.0, 0.0)
+
+# Advance widths (1/1000 em) of ASCII 32..126 in the standard 14 fonts' metrics.
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+_DEFAULT_WIDTH = 556
+
+
+def text_width(value: str, size: float, *, bold: bool = False) -> float:
+    widths = _HELVETICA_BOLD if bold else _HELVETICA
+    total = 0
+    for char in value:
+        code = ord(char)
+        total += widths[code - 32] if 32 <= code <= 126 else _DEFAULT_WIDTH
+    return total * size / 1000
+
+
+def wrap_text(value: str, size: float, max_width: float, *, bold: bool = False) -> list[str]:
+    """Greedy word wrap; words longer than the line are split by character."""
+    lines: list[str] = []
+    for paragraph in value.splitlines() or [""]:
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if text_width(candidate, size, bold=bold) <= max_width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            while text_width(word, size, bold=bold) > max_width:
+                cut = len(word) - 1
+                while cut > 1 and text_width(word[:cut], size, bold=bold) > max_width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+def _literal(value: str) -> bytes:
+    encoded = value.encode("cp1252", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"").replace(b"\n", b" ") + b")"
+
+
+def _info_string(value: str) -> bytes:
+    # Document info strings are PDFDocEncoding, not WinAnsi; UTF-16 covers anything non-ASCII.
+    if value.isascii():
+        return _literal(value)
+    return b"<" + (b"\xfe\xff" + value.encode("utf-16-be")).hex().upper().encode() + b">"
+
+
+def _num(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _rgb(color: Color) -> str:
+    return " ".join(_num(channel) for channel in color)
+
+
+class PdfPage:
+    def __init__(self, width: float, height: float) -> None:
+        self.width = width
+        self.height = height
+        self._ops: list[bytes] = []
+
+    def text(self, x: float, y: float, value: str, *, size: float = 11, bold: bool = False, color: Color = BLACK) -> None:
+        """Draw ``value`` with its baseline at ``y``."""
+        font = "F2" if bold else "F1"
+        self._ops.append(
+            f"BT /{font} {_num(size)} Tf {_rgb(color)} rg {_num(x)} {_num(self.height - y)} Td ".encode() + _literal(value) + b" Tj ET"
+        )
+
+    def rect(self, x: float, y: float, width: float, height: float, *, fill: Color) -> None:
+        self._ops.append(f"{_rgb(fill)} rg {_num(x)} {_num(self.height - y - height)} {_num(width)} {_num(height)} re f".encode())
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, *, width: float = 1, color: Color = BLACK) -> None:
+        self._ops.append(
+            f"{_num(width)} w {_rgb(color)} RG {_num(x1)} {_num(self.height - y1)} m {_num(x2)} {_num(self.height - y2)} l S".encode()
+        )
+
+    def content(self) -> bytes:
+        return b"\n".join(self._ops)
+
+
+class PdfWriter:
+    """Writes a PDF to a binary stream page by page.
+
+    A page is written out as soon as the next one is started (or on
+    ``close``), so however long the document gets, memory holds one page of
+    drawing operations plus an offset per object. The document-level objects
+    and the cross-reference table follow the last page.
+    """
+
+    def __init__(self, stream: BinaryIO, page_size: tuple[float, float] = A4_PORTRAIT, *, title: str | None = None) -> None:
+        self.stream = stream
+        self.page_size = page_size
+        self.title = title
+        self.page_count = 0
+        self._position = 0
+        # 1 catalog, 2 page tree, 3-4 fonts, 5 info; pages and their content streams are numbered from 6 as they are written.
+        self._offsets: list[int] = [0] * 5
+        self._current: PdfPage | None = None
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def add_page(self) -> PdfPage:
+        self._flush_page()
+        self._current = PdfPage(*self.page_size)
+        return self._current
+
+    def write_page(self, page: PdfPage) -> None:
+        self._flush_page()
+        width, height = self.page_size
+        page_id = len(self._offsets) + 1
+        stream = zlib.compress(page.content(), 6)
+        self._object(
+            page_id,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(width)} {_num(height)}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {page_id + 1} 0 R >>".encode(),
+        )
+        self._object(page_id + 1, f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode() + stream + b"\nendstream")
+        self.page_count += 1
+
+    def close(self) -> None:
+        self._flush_page()
+        if not self.page_count:
+            self.write_page(PdfPage(*self.page_size))
+        kids = " ".join(f"{6 + 2 * index} 0 R" for index in range(self.page_count))
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {self.page_count} >>".encode())
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._object(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        self._object(5, b"<< /Producer (InsightFlow)" + (b" /Title " + _info_string(self.title) if self.title else b"") + b" >>")
+        xref = self._position
+        size = len(self._offsets) + 1
+        self._write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        self._write(b"".join(f"{offset:010d} 00000 n \n".encode() for offset in self._offsets))
+        self._write(f"trailer\n<< /Size {size} /Root 1 0 R /Info 5 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+    def _flush_page(self) -> None:
+        page, self._current = self._current, None
+        if page is not None:
+            self.write_page(page)
+
+    def _object(self, number: int, body: bytes) -> None:
+        if number > len(self._offsets):
+            self._offsets.append(0)
+        self._offsets[number - 1] = self._position
+        self._write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def _write(self, data: bytes) -> None:
+        self.stream.write(data)
+        self._position += len(data)
+
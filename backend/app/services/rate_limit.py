@@ -0,0 +1,251 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+import logging
+from math import ceil, floor
+from threading import Lock
+from time import monotonic, time
+from typing import Protocol
+
+from sqlalchemy import create_engine, delete, event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.session import engine as app_engine
+from app.models.hardening import RateLimitCounter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int
+
+
+def _decision(allowed: bool, limit: int, used: float, position: float, window_seconds: int) -> RateLimitDecision:
+    # Retry-After is an upper bound: by the next window boundary the current count has become the decaying previous one.
+    retry_after = max(1, ceil((floor(position) + 1 - position) * window_seconds))
+    return RateLimitDecision(allowed=allowed, limit=limit, remaining=max(0, floor(limit - used)), retry_after=retry_after)
+
+
+class SlidingWindowRateLimiter:
+    """Sliding-window-counter limiter with fixed-size state per key and a hard key cap.
+
+    Each key holds ``[window_index, previous_count, current_count]``. The
+    previous window's count is weighted by how much of it still overlaps the
+    sliding window. A key moves to the end whenever its window rolls over, so
+    the order tracks recent activity and eviction pops from the front. ``allow``
+    takes no lock; each ``OrderedDict`` operation is atomic under the GIL, and
+    concurrent hits on one key can at worst lose a count, which errs towards
+    admitting the request.
+    """
+
+    blocking = False
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, list[int]] = OrderedDict()
+        self.evictions = 0
+
+    def allow(self, key: str, limit: int, window_seconds: int) -> bool:
+        return self.hit(key, limit, window_seconds).allowed
+
+    def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitDecision:
+        position = monotonic() / window_seconds
+        window = int(position)
+        state = self._buckets.get(key)
+        if state is None or state[0] != window:
+            previous = state[2] if state is not None and state[0] == window - 1 else 0
+            state = [window, previous, 0]
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                try:
+                    self._buckets.popitem(last=False)
+                except KeyError:
+                    break
+                self.evictions += 1
+        used = state[1] * (1.0 - (position - window)) + state[2]
+        if used >= limit:
+            return _decision(False, limit, used, position, window_seconds)
+        state[2] += 1
+        return _decision(True, limit, used + 1, position, window_seconds)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def metrics(self) -> dict:
+        return {"backend": "memory", "keys": len(self._buckets), "evictions": self.evictions}
+
+    def reset(self) -> None:
+        self._buckets.clear()
+        self.evictions = 0
+
+
+class RateLimitStore(Protocol):
+    def reserve(self, key: str, window: int, amount: int) -> tuple[int, int]:
+        """Atomically add ``amount`` to ``key``'s count for ``window``; return ``(new_count, previous_window_count)``."""
+
+    def prune(self, before_window: int) -> None: ...
+
+
+class DatabaseRateLimitStore:
+    """Counters in ``rate_limit_counters``, updated with one upsert per reservation.
+
+    Works on PostgreSQL (``ON CONFLICT ... DO UPDATE ... RETURNING``) and on a
+    SQLite file, which is the stand-in for several workers on one host.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+        self._insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+
+    def reserve(self, key: str, window: int, amount: int) -> tuple[int, int]:
+        table = RateLimitCounter.__table__
+        upsert = self._insert(table).values(key=key, window_index=window, count=amount)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[table.c.key, table.c.window_index],
+            set_={"count": table.c.count + upsert.excluded.count},
+        ).returning(table.c.count)
+        with self._engine.begin() as connection:
+            count = connection.execute(upsert).scalar_one()
+            previous = connection.scalar(
+                select(table.c.count).where(table.c.key == key, table.c.window_index == window - 1)
+            )
+        return count, previous or 0
+
+    def prune(self, before_window: int) -> None:
+        with self._engine.begin() as connection:
+            connection.execute(delete(RateLimitCounter).where(RateLimitCounter.window_index < before_window))
+
+
+class SharedRateLimiter:
+    """Sliding-window counter whose counts live in a ``RateLimitStore`` shared by all workers.
+
+    A worker reserves up to ``batch`` permits per round trip and admits against
+    them locally, so a busy key costs one store call per ``batch`` requests.
+    Because counts only grow within a window, a key that is already at its
+    limit by the last known count is refused without a round trip. Reserved but
+    unused permits count against the key until the window rolls. Windows use
+    wall-clock time so every process agrees on them. If the store fails, the
+    limiter fails open.
+    """
+
+    # Reservations are database round trips, so callers on the event loop hand ``hit`` to a thread.
+    blocking = True
+
+    def __init__(self, store: RateLimitStore, *, batch: int, max_keys: int) -> None:
+        self.store = store
+        self.batch = max(1, batch)
+        self.max_keys = max_keys
+        # key -> [window, previous_count, next_permit, last_reserved_permit]
+        self._local: OrderedDict[str, list[int]] = OrderedDict()
+        self._lock = Lock()
+        self._pruned_window = 0
+        self._metrics = {"round_trips": 0, "local_admissions": 0, "store_errors": 0}
+
+    def allow(self, key: str, limit: int, window_seconds: int) -> bool:
+        return self.hit(key, limit, window_seconds).allowed
+
+    def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitDecision:
+        position = time() / window_seconds
+        window = int(position)
+        weight = 1.0 - (position - window)
+        store_key = key if len(key) <= 255 else blake2b(key.encode(), digest_size=32).hexdigest()
+        with self._lock:
+            state = self._state(store_key, window)
+            decision = self._admit_local(state, limit, weight, position, window_seconds)
+            if decision is not None:
+                return decision
+            amount = max(1, min(self.batch, floor(limit - state[1] * weight - state[3])))
+
+        try:
+            count, previous = self.store.reserve(store_key, window, amount)
+        except Exception:  # noqa: BLE001
+            self._metrics["store_errors"] += 1
+            logger.exception("Rate limit store unavailable; admitting request")
+            return RateLimitDecision(allowed=True, limit=limit, remaining=0, retry_after=1)
+        self._metrics["round_trips"] += 1
+        if window != self._pruned_window:
+            # Once per window per worker: earlier windows no longer feed any estimate.
+            self._pruned_window = window
+            self._prune(window - 1)
+
+        with self._lock:
+            state = self._state(store_key, window)
+            if count > state[3]:
+                state[1], state[2], state[3] = previous, count - amount + 1, count
+            return self._admit_local(state, limit, weight, position, window_seconds) or _decision(
+                False, limit, state[1] * weight + state[3], position, window_seconds
+            )
+
+    def metrics(self) -> dict:
+        return {"backend": settings.PUBLIC_RATE_LIMIT_BACKEND, "keys": len(self._local), "batch": self.batch, **self._metrics}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def _state(self, key: str, window: int) -> list[int]:
+        state = self._local.get(key)
+        if state is None or state[0] != window:
+            state = [window, 0, 1, 0]
+            self._local[key] = state
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_keys:
+                self._local.popitem(last=False)
+        return state
+
+    def _admit_local(
+        self, state: list[int], limit: int, weight: float, position: float, window_seconds: int
+    ) -> RateLimitDecision | None:
+        """Admit or refuse without the store when local knowledge suffices; ``None`` means reserve more permits."""
+        if state[2] <= state[3]:
+            used = state[1] * weight + state[2]
+            if used > limit:
+                return _decision(False, limit, used - 1, position, window_seconds)
+            state[2] += 1
+            self._metrics["local_admissions"] += 1
+            return _decision(True, limit, used, position, window_seconds)
+        known = state[1] * weight + state[3]
+        if state[3] and known >= limit:
+            return _decision(False, limit, known, position, window_seconds)
+        return None
+
+    def _prune(self, before_window: int) -> None:
+        try:
+            self.store.prune(before_window)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to prune rate limit counters")
+
+
+def _sqlite_engine(path: str) -> Engine:
+    engine = create_engine(f"sqlite+pysqlite:///{path}", connect_args={"timeout": 5, "check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, _record) -> None:
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    RateLimitCounter.__table__.create(bind=engine, checkfirst=True)
+    return engine
+
+
+def build_rate_limiter() -> SlidingWindowRateLimiter | SharedRateLimiter:
+    if settings.PUBLIC_RATE_LIMIT_BACKEND == "memory":
+        return SlidingWindowRateLimiter(max_keys=settings.PUBLIC_RATE_LIMIT_MAX_KEYS)
+    if settings.PUBLIC_RATE_LIMIT_BACKEND == "sqlite":
+        engine = _sqlite_engine(settings.PUBLIC_RATE_LIMIT_SQLITE_PATH)
+    else:
+        engine = app_engine
+    return SharedRateLimiter(
+        DatabaseRateLimitStore(engine),
+        batch=settings.PUBLIC_RATE_LIMIT_SYNC_BATCH,
+        max_keys=settings.PUBLIC_RATE_LIMIT_MAX_KEYS,
+    )
+
+
+public_rate_limiter = build_rate_limiter()
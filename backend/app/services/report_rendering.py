@@ -0,0 +1,420 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from hashlib import sha256
+import json
+from typing import BinaryIO
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.replicas import replicas
+from app.models.feedback import InsightRecommendation, InsightSummary, InsightTheme, Persona, ResponseAnswer, SurveyResponse
+from app.models.survey import QuestionType, Survey, SurveyQuestion
+from app.services.pdf import A4_PORTRAIT, SLIDE_16_9, BLACK, Color, PdfPage, PdfWriter, text_width, wrap_text
+
+# Bump when the layout changes so cached renders are not reused across versions.
+RENDERER_VERSION = 2
+# Rows fetched per round trip while streaming the response appendix.
+APPENDIX_BATCH_ROWS = 1000
+
+SENTIMENT_COLORS: dict[str, Color] = {
+    "positive": (0.2, 0.63, 0.42),
+    "neutral": (0.55, 0.6, 0.65),
+    "negative": (0.84, 0.33, 0.31),
+    "mixed": (0.93, 0.66, 0.22),
+}
+ACCENT: Color = (0.16, 0.38, 0.71)
+MUTED: Color = (0.42, 0.45, 0.5)
+RULE: Color = (0.85, 0.87, 0.9)
+
+
+@dataclass(frozen=True)
+class ReportTemplate:
+    themes: int | None
+    recommendations: int | None
+    personas: int | None
+    quotes: bool = False
+    persona_details: bool = False
+
+
+REPORT_TEMPLATES = {
+    "executive_summary": ReportTemplate(themes=5, recommendations=3, personas=3),
+    "detailed_analysis": ReportTemplate(themes=None, recommendations=None, personas=None, quotes=True, persona_details=True),
+    "stakeholder_brief": ReportTemplate(themes=3, recommendations=5, personas=2),
+}
+
+
+# Plain rows rather than ORM instances: content is pickled to the render worker processes.
+@dataclass(frozen=True)
+class ThemeRow:
+    label: str
+    count: int
+    sentiment: str
+    sample_quote: str | None
+
+
+@dataclass(frozen=True)
+class RecommendationRow:
+    title: str
+    detail: str
+    priority: str
+    expected_impact: str | None
+
+
+@dataclass(frozen=True)
+class PersonaRow:
+    id: UUID
+    name: str
+    summary: str
+    confidence: str
+    key_traits: list
+    frustrations: list
+    goals: list
+
+
+@dataclass(frozen=True)
+class QuestionRow:
+    id: UUID
+    text: str
+
+
+@dataclass
+class ReportContent:
+    survey_id: UUID
+    survey_title: str
+    summary_id: UUID | None = None
+    generated_at: datetime | None = None
+    overview: str = ""
+    sentiment: dict[str, float] = field(default_factory=dict)
+    themes: list[ThemeRow] = field(default_factory=list)
+    recommendations: list[RecommendationRow] = field(default_factory=list)
+    personas: list[PersonaRow] = field(default_factory=list)
+    # The responses appendix: open-text questions, and the answers to them submitted up to ``answers_until``.
+    open_questions: list[QuestionRow] = field(default_factory=list)
+    answer_count: int = 0
+    answers_until: datetime | None = None
+
+
+def load_report_content(db: Session, survey: Survey, summary: InsightSummary | None, sections: list[str]) -> ReportContent:
+    content = ReportContent(survey_id=survey.id, survey_title=survey.title)
+    if "responses" in sections:
+        _load_appendix(db, content)
+    if summary is None:
+        return content
+    content.summary_id = summary.id
+    content.generated_at = summary.generated_at
+    content.overview = summary.overview
+    content.sentiment = _sentiment_shares(summary.sentiment_distribution)
+    if "themes" in sections:
+        content.themes = [
+            ThemeRow(theme.label, theme.count, theme.sentiment, theme.sample_quote)
+            for theme in db.scalars(
+                select(InsightTheme).where(InsightTheme.summary_id == summary.id).order_by(InsightTheme.count.desc(), InsightTheme.label)
+            )
+        ]
+    if "recommendations" in sections:
+        content.recommendations = [
+            RecommendationRow(rec.title, rec.detail, rec.priority, rec.expected_impact)
+            for rec in db.scalars(
+                select(InsightRecommendation).where(InsightRecommendation.summary_id == summary.id).order_by(InsightRecommendation.id)
+            )
+        ]
+    if "personas" in sections:
+        content.personas = [
+            PersonaRow(persona.id, persona.name, persona.summary, persona.confidence, persona.key_traits, persona.frustrations, persona.goals)
+            for persona in db.scalars(select(Persona).where(Persona.run_id == summary.run_id).order_by(Persona.created_at, Persona.id))
+        ]
+    return content
+
+
+def _load_appendix(db: Session, content: ReportContent) -> None:
+    content.open_questions = [
+        QuestionRow(question.id, question.text)
+        for question in db.scalars(
+            select(SurveyQuestion)
+            .where(SurveyQuestion.survey_id == content.survey_id, SurveyQuestion.type == QuestionType.text)
+            .order_by(SurveyQuestion.order_index, SurveyQuestion.id)
+        )
+    ]
+    if not content.open_questions:
+        return
+    content.answer_count, content.answers_until = db.execute(
+        select(func.count(ResponseAnswer.id), func.max(SurveyResponse.submitted_at))
+        .join(SurveyResponse, SurveyResponse.id == ResponseAnswer.response_id)
+        .where(ResponseAnswer.question_id.in_([question.id for question in content.open_questions]))
+    ).one()
+
+
+def stream_answers(db: Session, question_id: UUID, until: datetime) -> Iterator[tuple[datetime, str]]:
+    """Answers to one question, oldest first, fetched in batches through a server-side cursor."""
+    rows = db.execute(
+        select(SurveyResponse.submitted_at, ResponseAnswer.value)
+        .join(SurveyResponse, SurveyResponse.id == ResponseAnswer.response_id)
+        .where(ResponseAnswer.question_id == question_id, SurveyResponse.submitted_at <= until)
+        .order_by(SurveyResponse.submitted_at, SurveyResponse.id)
+        .execution_options(yield_per=APPENDIX_BATCH_ROWS)
+    )
+    for submitted_at, value in rows:
+        yield submitted_at, value
+
+
+def render_cache_key(content: ReportContent, template: str, sections: list[str], report_format: str, compression: str | None = None) -> str:
+    """Address of a rendered report: everything the renderer reads, never the job or its timestamps."""
+    material = {
+        "v": RENDERER_VERSION,
+        "survey": str(content.survey_id),
+        "title": content.survey_title,
+        "summary": str(content.summary_id) if content.summary_id else None,
+        # Personas can be regenerated for the same run, so their ids are part of the address.
+        "personas": sorted(str(persona.id) for persona in content.personas),
+        "template": template,
+        "sections": sorted(set(sections)),
+        "format": report_format,
+        "compression": compression,
+    }
+    if "responses" in sections:
+        # Answers are append-only, so their count and newest submission identify the appendix; question text heads it.
+        material["questions"] = [[str(question.id), question.text] for question in content.open_questions]
+        material["answers"] = [content.answer_count, content.answers_until.isoformat() if content.answers_until else None]
+    return sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+def render_report(
+    content: ReportContent, template: str, sections: list[str], report_format: str, out: BinaryIO, sessions: Callable[[], Session] | None = None
+) -> None:
+    """Write the report to ``out`` as it is laid out, one page at a time.
+
+    ``sessions`` opens the database session the responses appendix is streamed
+    from; it is required when that section is requested.
+    """
+    if template not in REPORT_TEMPLATES:
+        raise ValueError(f"Unknown report template: {template}")
+    if report_format not in RENDERERS:
+        raise ValueError(f"Unknown report format: {report_format}")
+    if "responses" in sections and content.open_questions and sessions is None:
+        raise ValueError("The responses appendix needs a database session")
+    page_size, renderer = RENDERERS[report_format]
+    writer = PdfWriter(out, page_size, title=content.survey_title)
+    renderer(writer, content, REPORT_TEMPLATES[template], set(sections))
+    if "responses" in sections:
+        _appendix(_Flow(writer), content, sessions)
+    writer.close()
+
+
+def _sentiment_shares(distribution: dict) -> dict[str, float]:
+    values: dict[str, float] = {}
+    for label, value in (distribution or {}).items():
+        try:
+            values[str(label)] = max(0.0, float(value))
+        except (TypeError, ValueError):
+            continue
+    total = sum(values.values())
+    return {label: value / total for label, value in values.items()} if total else {}
+
+
+def _limit(items: list, limit: int | None) -> list:
+    return items if limit is None else items[:limit]
+
+
+def _fit(value: str, size: float, max_width: float, *, bold: bool = False) -> str:
+    if text_width(value, size, bold=bold) <= max_width:
+        return value
+    while value and text_width(value + "...", size, bold=bold) > max_width:
+        value = value[:-1]
+    return value + "..."
+
+
+def _bar_chart(
+    page: PdfPage, x: float, y: float, width: float, rows: list[tuple[str, float, str, Color]], *, size: float = 10, peak: float | None = None
+) -> float:
+    """Horizontal bars scaled to ``peak`` (default: the largest value); returns the y below the chart."""
+    label_width = width * 0.35
+    value_width = 48
+    bar_space = width - label_width - value_width - 8
+    peak = peak or max((value for _, value, _, _ in rows), default=0) or 1
+    row_height = size * 2
+    for label, value, caption, color in rows:
+        page.text(x, y + size, _fit(label, size, label_width - 6), size=size)
+        page.rect(x + label_width, y + size * 0.2, max(1.0, bar_space * value / peak), size, fill=color)
+        page.text(x + width - value_width, y + size, caption, size=size, color=MUTED)
+        y += row_height
+    return y
+
+
+def _sentiment_rows(content: ReportContent) -> list[tuple[str, float, str, Color]]:
+    return [
+        (label.capitalize(), share, f"{share * 100:.0f}%", SENTIMENT_COLORS.get(label, ACCENT))
+        for label, share in sorted(content.sentiment.items(), key=lambda item: -item[1])
+    ]
+
+
+def _theme_rows(themes: list[ThemeRow]) -> list[tuple[str, float, str, Color]]:
+    return [(theme.label, float(theme.count), str(theme.count), SENTIMENT_COLORS.get(theme.sentiment, ACCENT)) for theme in themes]
+
+
+def _subtitle(content: ReportContent) -> str:
+    if content.generated_at is None:
+        return "No insights available yet."
+    return f"Insights generated {content.generated_at:%d %b %Y %H:%M} UTC"
+
+
+class _Flow:
+    """Top-to-bottom layout, breaking to a new page when a block does not fit."""
+
+    margin = 56.0
+
+    def __init__(self, document: PdfWriter) -> None:
+        self.document = document
+        self.page = document.add_page()
+        self.y = self.margin
+        self.width = self.page.width - 2 * self.margin
+
+    def ensure(self, height: float) -> None:
+        if self.y + height > self.page.height - self.margin:
+            self.page = self.document.add_page()
+            self.y = self.margin
+
+    def heading(self, value: str) -> None:
+        self.ensure(60)
+        self.y += 18
+        self.page.text(self.margin, self.y, value, size=15, bold=True, color=ACCENT)
+        self.y += 8
+        self.page.line(self.margin, self.y, self.margin + self.width, self.y, width=0.75, color=RULE)
+        self.y += 10
+
+    def paragraph(self, value: str, *, size: float = 10.5, bold: bool = False, color: Color = BLACK, indent: float = 0) -> None:
+        leading = size * 1.4
+        for line in wrap_text(value, size, self.width - indent, bold=bold):
+            self.ensure(leading)
+            self.y += leading
+            self.page.text(self.margin + indent, self.y, line, size=size, bold=bold, color=color)
+        self.y += size * 0.5
+
+    def chart(self, rows: list[tuple[str, float, str, Color]]) -> None:
+        peak = max((value for _, value, _, _ in rows), default=0)
+        for start in range(0, len(rows), 10):
+            chunk = rows[start : start + 10]
+            self.ensure(len(chunk) * 20 + 8)
+            self.y = _bar_chart(self.page, self.margin, self.y + 4, self.width, chunk, peak=peak) + 4
+
+
+def render_document(document: PdfWriter, content: ReportContent, template: ReportTemplate, sections: set[str]) -> None:
+    flow = _Flow(document)
+    flow.paragraph(content.survey_title, size=22, bold=True)
+    flow.paragraph(_subtitle(content), size=10, color=MUTED)
+    if content.summary_id is None:
+        return
+
+    if "overview" in sections:
+        flow.heading("Overview")
+        flow.paragraph(content.overview)
+        if content.sentiment:
+            flow.paragraph("Sentiment", size=11, bold=True)
+            flow.chart(_sentiment_rows(content))
+    if "themes" in sections and content.themes:
+        themes = _limit(content.themes, template.themes)
+        flow.heading("Themes")
+        flow.chart(_theme_rows(themes))
+        if template.quotes:
+            for theme in themes:
+                if theme.sample_quote:
+                    flow.paragraph(theme.label, size=10.5, bold=True)
+                    flow.paragraph(f"\"{theme.sample_quote}\"", size=10, color=MUTED, indent=12)
+    if "recommendations" in sections and content.recommendations:
+        flow.heading("Recommendations")
+        for index, rec in enumerate(_limit(content.recommendations, template.recommendations), start=1):
+            flow.paragraph(f"{index}. {rec.title}", size=11, bold=True)
+            flow.paragraph(f"Priority: {rec.priority}" + (f"  |  Expected impact: {rec.expected_impact}" if rec.expected_impact else ""), size=9.5, color=MUTED, indent=14)
+            flow.paragraph(rec.detail, indent=14)
+    if "personas" in sections and content.personas:
+        flow.heading("Personas")
+        for persona in _limit(content.personas, template.personas):
+            flow.paragraph(f"{persona.name} ({persona.confidence} confidence)", size=11, bold=True)
+            flow.paragraph(persona.summary, indent=14)
+            if template.persona_details:
+                for label, values in (("Traits", persona.key_traits), ("Frustrations", persona.frustrations), ("Goals", persona.goals)):
+                    if values:
+                        flow.paragraph(f"{label}: " + "; ".join(str(value) for value in values), size=10, color=MUTED, indent=14)
+
+
+def _appendix(flow: _Flow, content: ReportContent, sessions: Callable[[], Session] | None) -> None:
+    flow.heading("Appendix: responses")
+    if not content.answer_count:
+        flow.paragraph("No open-text answers yet.", color=MUTED)
+        return
+    primary = sessions()
+    try:
+        with replicas.read_session(primary) as db:
+            for number, question in enumerate(content.open_questions, start=1):
+                flow.paragraph(f"Q{number}. {question.text}", size=11, bold=True)
+                for submitted_at, value in stream_answers(db, question.id, content.answers_until):
+                    flow.paragraph(f"{submitted_at:%Y-%m-%d}  {value}", size=9.5)
+    finally:
+        primary.close()
+
+
+def _slide(document: PdfWriter, title: str) -> PdfPage:
+    page = document.add_page()
+    page.rect(0, 0, page.width, 6, fill=ACCENT)
+    page.text(48, 64, _fit(title, 26, page.width - 96, bold=True), size=26, bold=True)
+    return page
+
+
+def _slide_text(page: PdfPage, x: float, y: float, width: float, value: str, *, size: float, max_lines: int, bold: bool = False, color: Color = BLACK) -> float:
+    lines = wrap_text(value, size, width, bold=bold)
+    if len(lines) > max_lines:
+        lines = lines[: max_lines - 1] + [_fit(lines[max_lines - 1] + " ...", size, width, bold=bold)]
+    for line in lines:
+        y += size * 1.35
+        page.text(x, y, line, size=size, bold=bold, color=color)
+    return y
+
+
+def render_slides(document: PdfWriter, content: ReportContent, template: ReportTemplate, sections: set[str]) -> None:
+    cover = document.add_page()
+    cover.rect(0, 0, cover.width, cover.height, fill=ACCENT)
+    _slide_text(cover, 64, 190, cover.width - 128, content.survey_title, size=34, max_lines=3, bold=True, color=(1.0, 1.0, 1.0))
+    cover.text(64, 420, _subtitle(content), size=14, color=(0.86, 0.9, 0.97))
+    if content.summary_id is None:
+        return
+
+    if "overview" in sections:
+        page = _slide(document, "Overview")
+        has_chart = bool(content.sentiment)
+        text_width_pt = page.width * (0.52 if has_chart else 1) - 96
+        _slide_text(page, 48, 100, text_width_pt, content.overview, size=15, max_lines=16)
+        if has_chart:
+            page.text(page.width * 0.56, 116, "Sentiment", size=14, bold=True, color=MUTED)
+            _bar_chart(page, page.width * 0.56, 132, page.width * 0.44 - 48, _sentiment_rows(content), size=13)
+    if "themes" in sections and content.themes:
+        rows = _theme_rows(_limit(content.themes, template.themes))
+        peak = max(value for _, value, _, _ in rows)
+        for start in range(0, len(rows), 8):
+            page = _slide(document, "Themes" if start == 0 else "Themes (continued)")
+            _bar_chart(page, 48, 104, page.width - 96, rows[start : start + 8], size=14, peak=peak)
+    if "recommendations" in sections and content.recommendations:
+        recommendations = _limit(content.recommendations, template.recommendations)
+        for start in range(0, len(recommendations), 3):
+            page = _slide(document, "Recommendations")
+            y = 96.0
+            for index, rec in enumerate(recommendations[start : start + 3], start=start + 1):
+                y = _slide_text(page, 48, y, page.width - 96, f"{index}. {rec.title}", size=17, max_lines=2, bold=True)
+                page.text(72, y + 20, f"Priority: {rec.priority}", size=12, color=MUTED)
+                y = _slide_text(page, 72, y + 24, page.width - 144, rec.detail, size=13, max_lines=3) + 22
+    if "personas" in sections and content.personas:
+        for persona in _limit(content.personas, template.personas):
+            page = _slide(document, f"Persona: {persona.name}")
+            page.text(48, 100, f"{persona.confidence.capitalize()} confidence", size=13, color=MUTED)
+            y = _slide_text(page, 48, 112, page.width - 96, persona.summary, size=15, max_lines=5)
+            if template.persona_details:
+                for label, values in (("Traits", persona.key_traits), ("Frustrations", persona.frustrations), ("Goals", persona.goals)):
+                    if values:
+                        y = _slide_text(page, 48, y + 10, page.width - 96, f"{label}: " + "; ".join(str(value) for value in values), size=13, max_lines=3)
+
+
+RENDERERS: dict[str, tuple[tuple[float, float], Callable[[PdfWriter, ReportContent, ReportTemplate, set[str]], None]]] = {
+    "pdf": (A4_PORTRAIT, render_document),
+    "slides": (SLIDE_16_9, render_slides),
+}
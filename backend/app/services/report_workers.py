@@ -0,0 +1,295 @@
+import asyncio
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import gzip
+import hashlib
+import multiprocessing
+import os
+from pathlib import Path
+import signal
+from threading import Lock, Thread
+from time import monotonic, perf_counter
+from typing import BinaryIO
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.report_rendering import ReportContent, render_report
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# How long the parent waits past the worker's own deadline before giving up on it.
+TIMEOUT_GRACE_SECONDS = 5.0
+# Rendered pages are buffered and written to disk in chunks of this size.
+WRITE_CHUNK_BYTES = 256 * 1024
+
+
+class RenderQueueFullError(RuntimeError):
+    pass
+
+
+class RenderLimitError(RuntimeError):
+    pass
+
+
+class _HashingWriter:
+    """Passes writes through to ``raw`` while hashing and counting them."""
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def flush(self) -> None:
+        self.raw.flush()
+
+
+def render_to_file(
+    content: ReportContent, template: str, sections: list[str], report_format: str, path: Path, compression: str | None, sessions: Callable[[], Session]
+) -> tuple[str, int]:
+    """Stream the report into ``path`` and return the SHA-256 and size of the bytes written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(path, "wb", buffering=WRITE_CHUNK_BYTES) as raw:
+            written = _HashingWriter(raw)
+            if compression == "gzip":
+                # No name or timestamp in the header, so the same report compresses to the same bytes.
+                with gzip.GzipFile(filename="", mode="wb", fileobj=written, mtime=0) as out:
+                    render_report(content, template, sections, report_format, out, sessions)
+            else:
+                render_report(content, template, sections, report_format, written, sessions)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return written.sha256.hexdigest(), written.size
+
+
+def _address_space_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def _job_limits(timeout_seconds: float, memory_mb: int) -> Iterator[None]:
+    """Wall-clock and memory caps for one render in a worker process.
+
+    The memory cap is extra address space on top of what the worker already
+    maps, so it bounds what this job allocates regardless of earlier jobs.
+    It needs ``RLIMIT_AS`` and ``/proc`` (Linux); elsewhere only the time cap applies.
+    """
+
+    def expire(_signum, _frame) -> None:
+        raise RenderLimitError(f"Report rendering exceeded {timeout_seconds:g}s")
+
+    previous_handler = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    previous_limit = None
+    current = _address_space_bytes() if resource is not None and memory_mb > 0 else None
+    if current is not None:
+        previous_limit = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (current + memory_mb * 1024 * 1024, previous_limit[1]))
+    out_of_memory = False
+    try:
+        yield
+    except MemoryError:
+        out_of_memory = True
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+        if previous_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, previous_limit)
+    if out_of_memory:
+        raise RenderLimitError(f"Report rendering exceeded {memory_mb} MB")
+
+
+def _render_job(
+    content: ReportContent, template: str, sections: list[str], report_format: str, path: str, compression: str | None, timeout_seconds: float, memory_mb: int
+) -> tuple[str, int]:
+    # Workers stream the responses appendix over their own connections.
+    with _job_limits(timeout_seconds, memory_mb):
+        return render_to_file(content, template, sections, report_format, Path(path), compression, SessionLocal)
+
+
+class ReportRenderer:
+    """Renders reports in a dedicated process pool so layout work never competes with request handling for the GIL.
+
+    Jobs are admitted up to ``REPORT_RENDER_WORKERS + REPORT_RENDER_QUEUE_MAX``
+    at once; ``admit`` raises ``RenderQueueFullError`` beyond that, which the
+    reports endpoint turns into a 503. Each render runs under
+    ``REPORT_RENDER_TIMEOUT_SECONDS`` and ``REPORT_RENDER_MEMORY_MB``, and a
+    worker that stops answering or dies is replaced. Job state is only ever
+    written by the parent, and waiting on a worker holds no thread.
+    ``REPORT_RENDER_WORKERS=0`` renders on the thread pool, without the caps,
+    streaming the appendix from ``sessions``; workers open their own.
+    """
+
+    def __init__(self) -> None:
+        self._executor: ProcessPoolExecutor | None = None
+        # Jobs submitted to each pool with the monotonic time their caps run out, so a retired pool can let healthy jobs finish.
+        self._jobs: dict[ProcessPoolExecutor, dict[Future, float]] = {}
+        self._lock = Lock()
+        self._in_flight = 0
+        self._metrics = {"completed": 0, "failed": 0, "rejected": 0, "limit_exceeded": 0, "workers_replaced": 0}
+        self._render_ms_sum = 0.0
+        self._render_ms_max = 0.0
+
+    def admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= self._capacity():
+                self._metrics["rejected"] += 1
+                raise RenderQueueFullError("Report rendering capacity exhausted")
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    async def render(
+        self,
+        content: ReportContent,
+        template: str,
+        sections: list[str],
+        report_format: str,
+        path: Path,
+        *,
+        compression: str | None = None,
+        sessions: Callable[[], Session] = SessionLocal,
+    ) -> tuple[str, int]:
+        """Render into ``path``; returns the SHA-256 and size of the file."""
+        started = perf_counter()
+        try:
+            pool = self._pool()
+            if pool is None:
+                rendered = await run_in_threadpool(render_to_file, content, template, sections, report_format, path, compression, sessions)
+            else:
+                rendered = await self._render_in_pool(pool, content, template, sections, report_format, path, compression)
+        except Exception:
+            self._bump("failed")
+            raise
+        elapsed_ms = (perf_counter() - started) * 1000
+        with self._lock:
+            self._metrics["completed"] += 1
+            self._render_ms_sum += elapsed_ms
+            self._render_ms_max = max(self._render_ms_max, elapsed_ms)
+        return rendered
+
+    def start(self) -> None:
+        self._pool()
+
+    def stop(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._jobs.pop(executor, None)
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            completed = self._metrics["completed"]
+            return {
+                "workers": settings.REPORT_RENDER_WORKERS,
+                "in_flight": self._in_flight,
+                "capacity": self._capacity(),
+                **self._metrics,
+                "render_ms": {
+                    "avg": round(self._render_ms_sum / completed, 3) if completed else 0.0,
+                    "max": round(self._render_ms_max, 3),
+                },
+            }
+
+    async def _render_in_pool(
+        self,
+        pool: ProcessPoolExecutor,
+        content: ReportContent,
+        template: str,
+        sections: list[str],
+        report_format: str,
+        path: Path,
+        compression: str | None,
+    ) -> tuple[str, int]:
+        timeout = settings.REPORT_RENDER_TIMEOUT_SECONDS
+        deadline = timeout + TIMEOUT_GRACE_SECONDS
+        future = pool.submit(
+            _render_job, content, template, sections, report_format, str(path), compression, timeout, settings.REPORT_RENDER_MEMORY_MB
+        )
+        with self._lock:
+            jobs = {job: until for job, until in self._jobs.get(pool, {}).items() if not job.done()}
+            jobs[future] = monotonic() + deadline
+            self._jobs[pool] = jobs
+        try:
+            # Queue time counts too: a job that waits behind others for longer than its own cap plus grace gives up.
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), deadline)
+        except RenderLimitError:
+            self._bump("limit_exceeded")
+            raise
+        except asyncio.TimeoutError as exc:
+            self._bump("limit_exceeded")
+            if not future.cancel():
+                # Already running past its own deadline: the worker cannot be trusted with the next job.
+                self._retire(pool)
+            raise RenderLimitError(f"Report rendering exceeded {timeout:g}s") from exc
+        except BrokenProcessPool as exc:
+            # Typically the kernel's OOM killer or a hard crash inside the worker.
+            self._retire(pool)
+            raise RenderLimitError("Report renderer process exited unexpectedly") from exc
+
+    def _retire(self, pool: ProcessPoolExecutor) -> None:
+        """Send new jobs to a fresh pool, let ``pool`` finish the jobs it is running, then stop its processes.
+
+        A ProcessPoolExecutor marks itself broken as soon as any one of its
+        processes dies, failing every other job, so the stuck worker cannot be
+        killed on its own. Each remaining job gets until its own caps run out.
+        """
+        with self._lock:
+            if self._executor is not pool:
+                return
+            self._executor = None
+            self._metrics["workers_replaced"] += 1
+            jobs = self._jobs.pop(pool, {})
+        Thread(target=self._drain_and_stop, args=(pool, jobs), name="report-renderer-retire", daemon=True).start()
+
+    @staticmethod
+    def _drain_and_stop(pool: ProcessPoolExecutor, jobs: dict[Future, float]) -> None:
+        if jobs:
+            wait(jobs, timeout=max(max(jobs.values()) - monotonic(), 0))
+        # ProcessPoolExecutor cannot cancel a running call, so stop the processes themselves.
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _bump(self, key: str) -> None:
+        with self._lock:
+            self._metrics[key] += 1
+
+    def _capacity(self) -> int:
+        return max(settings.REPORT_RENDER_WORKERS, 1) + settings.REPORT_RENDER_QUEUE_MAX
+
+    def _pool(self) -> ProcessPoolExecutor | None:
+        if settings.REPORT_RENDER_WORKERS <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn, as for password hashing: the web process runs threads whose locks a fork would inherit.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.REPORT_RENDER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+report_renderer = ReportRenderer()
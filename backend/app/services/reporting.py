@@ -1,88 +1,181 @@
+import asyncio
 from datetime import UTC, datetime, timedelta
-from pathlib import Path
 import secrets
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.db.replicas import replicas
 from app.db.session import SessionLocal
 from app.models.feedback import InsightSummary
-from app.models.hardening import ExportAsset, ReportJob, ReportStatus
+from app.models.hardening import ExportAsset, ExportBlob, ReportJob, ReportStatus
 from app.models.survey import Survey
+from app.services.export_storage import get_export_storage, scratch_dir
+from app.services.exports import attach_blob, cached_blob, release_blob
+from app.services.report_rendering import ReportContent, load_report_content, render_cache_key
+from app.services.report_workers import report_renderer
 
+render_cache_stats = {"hits": 0, "misses": 0}
+SUFFIXES = {None: ".pdf", "gzip": ".pdf.gz"}
+MIME_TYPES = {None: "application/pdf", "gzip": "application/gzip"}
+_render_locks: dict[str, asyncio.Lock] = {}
 
-def _exports_dir() -> Path:
-    path = Path(settings.REPORT_EXPORT_DIR)
-    if not path.is_absolute():
-        path = Path(__file__).resolve().parents[2] / path
-    path.mkdir(parents=True, exist_ok=True)
-    return path
 
+def _load_content(db: Session, survey_id: UUID, sections: list[str]) -> ReportContent | None:
+    survey = db.get(Survey, survey_id)
+    if not survey:
+        return None
+    latest = db.scalar(
+        select(InsightSummary).where(InsightSummary.survey_id == survey_id).order_by(InsightSummary.generated_at.desc()).limit(1)
+    )
+    return load_report_content(db, survey, latest, sections)
 
-def generate_report_job(report_id: UUID) -> None:
+
+def _attach_cached(render_key: str) -> UUID | None:
+    """Take a reference on the blob an identical export already stored, if it is still there."""
+    db = SessionLocal()
+    try:
+        blob = cached_blob(db, render_key)
+        if blob is None or not get_export_storage().exists(blob.digest):
+            return None
+        blob_id = attach_blob(db, blob.digest, blob.size_bytes)
+        db.commit()
+        return blob_id
+    finally:
+        db.close()
+
+
+def _store_render(digest: str, size_bytes: int, render_key: str, source) -> UUID:
+    # The reference is taken before the upload, so the sweeper cannot delete the blob while it is being stored.
+    db = SessionLocal()
+    try:
+        blob_id = attach_blob(db, digest, size_bytes, render_key)
+        db.commit()
+        try:
+            get_export_storage().put(digest, source)
+        except Exception:
+            release_blob(db, blob_id)
+            db.commit()
+            raise
+        return blob_id
+    finally:
+        db.close()
+
+
+async def _render_cached(content: ReportContent, template: str, sections: list[str], report_format: str, compression: str | None) -> UUID:
+    """Reference the stored blob for this export, rendering and storing it first if no identical export has."""
+    key = render_cache_key(content, template, sections, report_format, compression)
+    blob_id = await run_in_threadpool(_attach_cached, key)
+    if blob_id is not None:
+        render_cache_stats["hits"] += 1
+        return blob_id
+    # Identical exports requested together render once; the others wait and then reference that blob.
+    lock = _render_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            blob_id = await run_in_threadpool(_attach_cached, key)
+            if blob_id is not None:
+                render_cache_stats["hits"] += 1
+                return blob_id
+            render_cache_stats["misses"] += 1
+            path = scratch_dir() / f"{uuid4().hex}{SUFFIXES[compression]}"
+            try:
+                digest, size_bytes = await report_renderer.render(
+                    content, template, sections, report_format, path, compression=compression, sessions=SessionLocal
+                )
+                return await run_in_threadpool(_store_render, digest, size_bytes, key, path)
+            finally:
+                path.unlink(missing_ok=True)
+    finally:
+        if not lock.locked() and _render_locks.get(key) is lock:
+            del _render_locks[key]
+
+
+def _start_job(report_id: UUID) -> tuple[ReportJob, ReportContent | None] | None:
     db = SessionLocal()
     try:
         report = db.get(ReportJob, report_id)
         if not report:
-            return
-
+            return None
         report.status = ReportStatus.running
         db.add(report)
         db.commit()
+        db.refresh(report)
+        sections = list(report.include_sections or [])
+        with replicas.read_session(db) as read_db:
+            content = _load_content(read_db, report.survey_id, sections)
+        if content is None:
+            # A survey created moments ago may not have reached the replica yet.
+            content = _load_content(db, report.survey_id, sections)
+        db.expunge(report)
+        return report, content
+    finally:
+        db.close()
 
-        survey = db.get(Survey, report.survey_id)
-        latest = db.scalar(
-            select(InsightSummary).where(InsightSummary.survey_id == report.survey_id).order_by(InsightSummary.generated_at.desc())
-        )
-        if not survey:
-            raise RuntimeError("Survey not found")
 
-        sections = report.include_sections or []
-        content_lines = [
-            f"Report for survey: {survey.title}",
-            f"Generated at: {datetime.now(UTC).isoformat()}",
-            f"Format: {report.format}",
-            "",
-        ]
-        if latest:
-            if "overview" in sections:
-                content_lines.extend(["Overview:", latest.overview, ""])
-            if "themes" in sections:
-                content_lines.extend(["Themes included."])
-            if "recommendations" in sections:
-                content_lines.extend(["Recommendations included."])
-        else:
-            content_lines.extend(["No insights available yet."])
-
-        file_ext = "pdf" if report.format == "pdf" else "txt"
-        file_name = f"report_{report.id}.{file_ext}"
-        path = _exports_dir() / file_name
-        path.write_text("\n".join(content_lines), encoding="utf-8")
-
-        asset = ExportAsset(
-            survey_id=report.survey_id,
-            report_job_id=report.id,
-            file_name=file_name,
-            mime_type="application/pdf" if file_ext == "pdf" else "text/plain",
-            storage_path=str(path),
-            download_token=secrets.token_urlsafe(24),
-            expires_at=datetime.now(UTC) + timedelta(minutes=settings.REPORT_DOWNLOAD_TOKEN_EXPIRE_MINUTES),
+def _complete_job(report: ReportJob, blob_id: UUID) -> None:
+    db = SessionLocal()
+    try:
+        blob = db.get(ExportBlob, blob_id)
+        db.add(
+            ExportAsset(
+                survey_id=report.survey_id,
+                report_job_id=report.id,
+                file_name=f"report_{report.id}{SUFFIXES[report.compression]}",
+                mime_type=MIME_TYPES[report.compression],
+                storage_path=get_export_storage().location(blob.digest),
+                blob_id=blob_id,
+                download_token=secrets.token_urlsafe(24),
+                expires_at=datetime.now(UTC) + timedelta(minutes=settings.REPORT_DOWNLOAD_TOKEN_EXPIRE_MINUTES),
+            )
         )
-        db.add(asset)
-
-        report.status = ReportStatus.completed
-        report.completed_at = datetime.now(UTC)
-        db.add(report)
+        job = db.get(ReportJob, report.id)
+        job.status = ReportStatus.completed
+        job.completed_at = datetime.now(UTC)
+        db.add(job)
         db.commit()
-    except Exception as exc:  # noqa: BLE001
+    finally:
+        db.close()
+
+
+def _fail_job(report_id: UUID, error: str, blob_id: UUID | None = None) -> None:
+    db = SessionLocal()
+    try:
+        if blob_id is not None:
+            # The asset that would have held this reference was never recorded.
+            release_blob(db, blob_id)
         report = db.get(ReportJob, report_id)
         if report:
             report.status = ReportStatus.failed
-            report.error = str(exc)
+            report.error = error
             report.completed_at = datetime.now(UTC)
             db.add(report)
-            db.commit()
+        db.commit()
     finally:
         db.close()
 
+
+async def generate_report_job(report_id: UUID) -> None:
+    """Run an admitted report job; the caller must have called ``report_renderer.admit()``.
+
+    Database work runs on the thread pool in short sessions, and rendering is
+    awaited, so a queued or rendering job holds neither a thread nor a pooled
+    connection.
+    """
+    blob_id = None
+    try:
+        started = await run_in_threadpool(_start_job, report_id)
+        if started is None:
+            return
+        report, content = started
+        if content is None:
+            raise RuntimeError("Survey not found")
+        blob_id = await _render_cached(content, report.template, list(report.include_sections or []), report.format, report.compression)
+        await run_in_threadpool(_complete_job, report, blob_id)
+    except Exception as exc:  # noqa: BLE001
+        await run_in_threadpool(_fail_job, report_id, str(exc), blob_id)
+    finally:
+        report_renderer.release()
@@ -0,0 +1,234 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from threading import Lock
+from time import monotonic
+import uuid
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.feedback import InsightRun, InsightRunStatus, ResponseAnswer, SurveyResponse
+from app.models.project import Project
+from app.models.survey import QuestionOption, QuestionType, Survey, SurveyQuestion
+from app.services.events import log_usage_event
+from app.services.invalidation import SURVEY_TOPIC, invalidation_bus
+
+
+class SubmissionValidationError(ValueError):
+    pass
+
+
+YES_NO_VALUES = frozenset({"Yes", "No"})
+NUMERIC_BOUNDS = {QuestionType.rating: (1, 5), QuestionType.nps: (0, 10)}
+MULTI_CHOICE_SEPARATOR = ", "
+
+
+@dataclass(frozen=True, slots=True)
+class SubmissionPlan:
+    """Compiled validator for one published survey, built once and cached by ``survey_id``.
+
+    Choice questions without configured options accept any value, since there is
+    nothing to check them against.
+    """
+
+    survey_id: UUID
+    workspace_id: UUID | None
+    question_ids: frozenset[UUID]
+    required_ids: frozenset[UUID]
+    choices: dict[UUID, frozenset[str]] = field(default_factory=dict)
+    multi_choices: dict[UUID, frozenset[str]] = field(default_factory=dict)
+    numeric_bounds: dict[UUID, tuple[int, int]] = field(default_factory=dict)
+
+    def validate(self, answers: list[tuple[UUID, str]]) -> None:
+        submitted_ids = set()
+        for question_id, value in answers:
+            if question_id not in self.question_ids:
+                raise SubmissionValidationError("Invalid question_id")
+            submitted_ids.add(question_id)
+            if question_id in self.choices:
+                if value not in self.choices[question_id]:
+                    raise SubmissionValidationError(f"Invalid choice for question {question_id}")
+            elif question_id in self.multi_choices:
+                allowed = self.multi_choices[question_id]
+                if value not in allowed and not all(part in allowed for part in value.split(MULTI_CHOICE_SEPARATOR)):
+                    raise SubmissionValidationError(f"Invalid choice for question {question_id}")
+            elif question_id in self.numeric_bounds:
+                low, high = self.numeric_bounds[question_id]
+                try:
+                    number = int(value)
+                except ValueError:
+                    number = None
+                if number is None or not low <= number <= high:
+                    raise SubmissionValidationError(f"Answer for question {question_id} must be between {low} and {high}")
+        if not self.required_ids <= submitted_ids:
+            raise SubmissionValidationError("Missing required answers")
+
+
+@dataclass(frozen=True)
+class PendingSubmission:
+    response_id: UUID
+    survey_id: UUID
+    submitted_at: datetime
+    answers: list[tuple[UUID, str]]
+    respondent_meta: dict | None = None
+    workspace_id: UUID | None = None
+
+
+class SubmissionPlanCache:
+    """LRU + TTL cache of compiled submission plans keyed by ``survey_id``.
+
+    Callers take ``generation()`` before building a plan and pass it to ``put``,
+    so a plan compiled from questions edited meanwhile is never cached.
+    """
+
+    def __init__(self) -> None:
+        self._plans: OrderedDict[UUID, tuple[float, SubmissionPlan]] = OrderedDict()
+        self._generation = 0
+        self._lock = Lock()
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, survey_id: UUID) -> SubmissionPlan | None:
+        with self._lock:
+            entry = self._plans.get(survey_id)
+            if entry is None or entry[0] <= monotonic():
+                if entry is not None:
+                    del self._plans[survey_id]
+                return None
+            self._plans.move_to_end(survey_id)
+            return entry[1]
+
+    def put(self, plan: SubmissionPlan, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._plans[plan.survey_id] = (monotonic() + settings.SUBMISSION_PLAN_CACHE_TTL_SECONDS, plan)
+            self._plans.move_to_end(plan.survey_id)
+            while len(self._plans) > settings.SUBMISSION_PLAN_CACHE_MAX_ENTRIES:
+                self._plans.popitem(last=False)
+
+    def invalidate(self, survey_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            self._plans.pop(survey_id, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self._generation += 1
+
+
+submission_plans = SubmissionPlanCache()
+invalidation_bus.subscribe(SURVEY_TOPIC, lambda key: submission_plans.invalidate(UUID(key)))
+
+
+def build_submission_plan(db: Session, survey_id: UUID) -> SubmissionPlan:
+    questions = db.execute(
+        select(SurveyQuestion.id, SurveyQuestion.type, SurveyQuestion.required).where(SurveyQuestion.survey_id == survey_id)
+    ).all()
+    option_values: dict[UUID, set[str]] = {}
+    for question_id, value in db.execute(
+        select(QuestionOption.question_id, QuestionOption.value)
+        .join(SurveyQuestion, SurveyQuestion.id == QuestionOption.question_id)
+        .where(SurveyQuestion.survey_id == survey_id)
+    ):
+        option_values.setdefault(question_id, set()).add(value)
+    workspace_id = db.scalar(select(Project.workspace_id).join(Survey, Survey.project_id == Project.id).where(Survey.id == survey_id))
+
+    choices: dict[UUID, frozenset[str]] = {}
+    multi_choices: dict[UUID, frozenset[str]] = {}
+    numeric_bounds: dict[UUID, tuple[int, int]] = {}
+    for question in questions:
+        if question.type == QuestionType.yes_no:
+            choices[question.id] = YES_NO_VALUES
+        elif question.type == QuestionType.single_choice and question.id in option_values:
+            choices[question.id] = frozenset(option_values[question.id])
+        elif question.type == QuestionType.multi_choice and question.id in option_values:
+            multi_choices[question.id] = frozenset(option_values[question.id])
+        elif question.type in NUMERIC_BOUNDS:
+            numeric_bounds[question.id] = NUMERIC_BOUNDS[question.type]
+    return SubmissionPlan(
+        survey_id=survey_id,
+        workspace_id=workspace_id,
+        question_ids=frozenset(question.id for question in questions),
+        required_ids=frozenset(question.id for question in questions if question.required),
+        choices=choices,
+        multi_choices=multi_choices,
+        numeric_bounds=numeric_bounds,
+    )
+
+
+def get_submission_plan(db: Session, survey_id: UUID) -> SubmissionPlan:
+    plan = submission_plans.get(survey_id)
+    if plan is None:
+        generation = submission_plans.generation()
+        plan = build_submission_plan(db, survey_id)
+        submission_plans.put(plan, generation)
+    return plan
+
+
+def new_pending_submission(
+    survey_id: UUID,
+    answers: list[tuple[UUID, str]],
+    respondent_meta: dict | None,
+    workspace_id: UUID | None = None,
+) -> PendingSubmission:
+    return PendingSubmission(
+        response_id=uuid.uuid4(),
+        survey_id=survey_id,
+        submitted_at=datetime.now(UTC),
+        answers=answers,
+        respondent_meta=respondent_meta,
+        workspace_id=workspace_id,
+    )
+
+
+def insert_submissions(db: Session, submissions: list[PendingSubmission]) -> list[UUID]:
+    """Write responses, answers, one queued insight run per survey and usage events without committing.
+
+    Ids are generated client-side, so the caller never has to flush or refresh;
+    answers for every submission go out as a single multi-row INSERT ... RETURNING.
+    Returns the ids of the queued insight runs.
+    """
+    if not submissions:
+        return []
+
+    db.execute(
+        insert(SurveyResponse),
+        [
+            {
+                "id": item.response_id,
+                "survey_id": item.survey_id,
+                "submitted_at": item.submitted_at,
+                "respondent_meta": item.respondent_meta,
+            }
+            for item in submissions
+        ],
+    )
+    answer_rows = [
+        {"id": uuid.uuid4(), "response_id": item.response_id, "question_id": question_id, "value": value}
+        for item in submissions
+        for question_id, value in item.answers
+    ]
+    if answer_rows:
+        db.execute(insert(ResponseAnswer).returning(ResponseAnswer.id), answer_rows).all()
+
+    run_ids: dict[UUID, UUID] = {}
+    for item in submissions:
+        run_ids.setdefault(item.survey_id, uuid.uuid4())
+    db.execute(
+        insert(InsightRun),
+        [{"id": run_id, "survey_id": survey_id, "status": InsightRunStatus.queued} for survey_id, run_id in run_ids.items()],
+    )
+    for item in submissions:
+        log_usage_event(
+            db,
+            event_name="response.submitted",
+            workspace_id=item.workspace_id,
+            payload={"survey_id": str(item.survey_id)},
+        )
+    return list(run_ids.values())
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from uuid import UUID
+
+from app.core.config import settings
+from app.services.invalidation import SURVEY_TOPIC, invalidation_bus
+
+
+class PublicSurveyCache:
+    """LRU + TTL cache of encoded public survey payloads keyed by slug.
+
+    Callers take ``generation()`` before reading the database and pass it to
+    ``put``. A fill that raced with an invalidation is then discarded instead of
+    caching the pre-edit definition.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[float, UUID, bytes]] = OrderedDict()
+        self._slugs_by_survey: dict[UUID, str] = {}
+        self._generation = 0
+        self._lock = Lock()
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, slug: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None or entry[0] <= monotonic():
+                if entry is not None:
+                    self._drop(slug)
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(slug)
+            self._metrics["hits"] += 1
+            return entry[2]
+
+    def put(self, slug: str, survey_id: UUID, body: bytes, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[slug] = (monotonic() + settings.PUBLIC_SURVEY_CACHE_TTL_SECONDS, survey_id, body)
+            self._entries.move_to_end(slug)
+            self._slugs_by_survey[survey_id] = slug
+            while len(self._entries) > settings.PUBLIC_SURVEY_CACHE_MAX_ENTRIES:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._metrics["evictions"] += 1
+
+    def invalidate_survey(self, survey_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            self._metrics["invalidations"] += 1
+            slug = self._slugs_by_survey.get(survey_id)
+            if slug is not None:
+                self._drop(slug)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._slugs_by_survey.clear()
+            self._generation += 1
+            self._metrics = dict.fromkeys(self._metrics, 0)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "capacity": settings.PUBLIC_SURVEY_CACHE_MAX_ENTRIES, **self._metrics}
+
+    def _drop(self, slug: str) -> None:
+        entry = self._entries.pop(slug, None)
+        if entry is not None and self._slugs_by_survey.get(entry[1]) == slug:
+            del self._slugs_by_survey[entry[1]]
+
+
+public_surveys = PublicSurveyCache()
+invalidation_bus.subscribe(SURVEY_TOPIC, lambda key: public_surveys.invalidate_survey(UUID(key)))
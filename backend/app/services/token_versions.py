@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from uuid import UUID
+
+from app.core.config import settings
+from app.services.invalidation import TOKEN_VERSION_TOPIC, invalidation_bus
+
+
+class TokenVersionCache:
+    """Short-lived cache of ``users.token_version`` used to revoke stateless access tokens.
+
+    Bumping a user's version publishes on ``TOKEN_VERSION_TOPIC``; peers that miss
+    the broadcast keep accepting old tokens for at most the TTL.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[UUID, tuple[float, int]] = OrderedDict()
+        self._generation = 0
+        self._lock = Lock()
+        self._metrics = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: UUID) -> int | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= monotonic():
+                self._entries.pop(user_id, None)
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self._metrics["hits"] += 1
+            return entry[1]
+
+    def put(self, user_id: UUID, version: int, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user_id] = (monotonic() + settings.TOKEN_VERSION_CACHE_TTL_SECONDS, version)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > settings.TOKEN_VERSION_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            self._metrics["invalidations"] += 1
+            self._entries.pop(user_id, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._metrics = dict.fromkeys(self._metrics, 0)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), **self._metrics}
+
+
+token_versions = TokenVersionCache()
+invalidation_bus.subscribe(TOKEN_VERSION_TOPIC, lambda key: token_versions.invalidate(UUID(key)))
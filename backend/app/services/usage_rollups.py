@@ -0,0 +1,297 @@
+import base64
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, date, datetime, time, timedelta
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import tempfile
+from threading import Event, Thread
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.hardening import UsageEvent, UsageEventRollup
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for pg_try_advisory_lock; only usage maintenance takes it.
+MAINTENANCE_LOCK_KEY = 0x75736167
+
+
+class HyperLogLog:
+    """Fixed-size distinct-count sketch; registers merge with max() so daily rollups combine."""
+
+    PRECISION = 10
+    REGISTER_COUNT = 1 << PRECISION
+
+    __slots__ = ("registers",)
+
+    def __init__(self, registers: bytes | None = None) -> None:
+        self.registers = bytearray(registers or bytes(self.REGISTER_COUNT))
+
+    def add(self, value: bytes) -> None:
+        hashed = int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+        index = hashed >> (64 - self.PRECISION)
+        remainder = hashed & ((1 << (64 - self.PRECISION)) - 1)
+        rank = (64 - self.PRECISION) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = self.REGISTER_COUNT
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def to_text(self) -> str:
+        return base64.b64encode(bytes(self.registers)).decode("ascii")
+
+    @classmethod
+    def from_text(cls, value: str) -> "HyperLogLog":
+        return cls(base64.b64decode(value))
+
+
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min, tzinfo=UTC)
+    return start, start + timedelta(days=1)
+
+
+def _as_date(value: datetime | date) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def rollup_usage_day(db: Session, day: date) -> int:
+    """Recompute the rollup rows for one UTC day from raw events; returns the number of rows written."""
+    start, end = _day_bounds(day)
+    in_day = (UsageEvent.created_at >= start, UsageEvent.created_at < end)
+    counts = db.execute(
+        select(UsageEvent.workspace_id, UsageEvent.event_name, func.count())
+        .where(*in_day)
+        .group_by(UsageEvent.workspace_id, UsageEvent.event_name)
+    ).all()
+    sketches: dict[tuple[UUID | None, str], HyperLogLog] = {}
+    user_rows = db.execute(
+        select(UsageEvent.workspace_id, UsageEvent.event_name, UsageEvent.user_id)
+        .where(*in_day, UsageEvent.user_id.is_not(None))
+        .distinct()
+    ).all()
+    for workspace_id, event_name, user_id in user_rows:
+        sketches.setdefault((workspace_id, event_name), HyperLogLog()).add(user_id.bytes)
+
+    db.execute(delete(UsageEventRollup).where(UsageEventRollup.day == day))
+    rolled_up_at = datetime.now(UTC)
+    for workspace_id, event_name, event_count in counts:
+        sketch = sketches.get((workspace_id, event_name), HyperLogLog())
+        db.add(
+            UsageEventRollup(
+                day=day,
+                workspace_id=workspace_id,
+                event_name=event_name,
+                event_count=event_count,
+                distinct_users=sketch.estimate(),
+                user_sketch=sketch.to_text(),
+                rolled_up_at=rolled_up_at,
+            )
+        )
+    return len(counts)
+
+
+def rollup_usage_events(db: Session, through: date | None = None) -> list[date]:
+    """Roll up every day from the last rolled-up day (re-done, it may have been partial) through ``through``."""
+    through = through or datetime.now(UTC).date()
+    last_rolled = db.scalar(select(func.max(UsageEventRollup.day)))
+    if last_rolled is not None:
+        start = _as_date(last_rolled)
+    else:
+        earliest = db.scalar(select(func.min(UsageEvent.created_at)))
+        if earliest is None:
+            return []
+        start = _as_date(earliest)
+
+    days = []
+    day = start
+    while day <= through:
+        rollup_usage_day(db, day)
+        db.commit()
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _archive_rows(archive_dir: Path, rows: list[UsageEvent]) -> None:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    by_day: dict[date, list[str]] = {}
+    for row in rows:
+        record = {
+            "id": str(row.id),
+            "workspace_id": str(row.workspace_id) if row.workspace_id else None,
+            "user_id": str(row.user_id) if row.user_id else None,
+            "event_name": row.event_name,
+            "payload": row.payload,
+            "created_at": row.created_at.isoformat(),
+        }
+        by_day.setdefault(_as_date(row.created_at), []).append(json.dumps(record, separators=(",", ":")))
+    for day, lines in by_day.items():
+        # Appending gzip members keeps each daily archive a single valid .gz stream.
+        with gzip.open(archive_dir / f"usage_events_{day.isoformat()}.jsonl.gz", "at", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+
+
+def compact_usage_events(
+    db: Session,
+    *,
+    retention_days: int,
+    batch_size: int = 5000,
+    archive_dir: Path | None = None,
+    now: datetime | None = None,
+) -> int:
+    """Delete (optionally archive) raw events older than ``retention_days`` whole UTC days, in batches.
+
+    Each batch is picked by the ``created_at`` index and committed on its own so
+    locks stay short. Callers must roll those days up first.
+    """
+    if retention_days < 1:
+        raise ValueError("retention_days must be at least 1")
+    today = (now or datetime.now(UTC)).date()
+    cutoff, _ = _day_bounds(today - timedelta(days=retention_days))
+    columns = (UsageEvent.id, UsageEvent.workspace_id, UsageEvent.user_id, UsageEvent.event_name, UsageEvent.payload, UsageEvent.created_at)
+    deleted = 0
+    while True:
+        batch = (
+            select(UsageEvent.id)
+            .where(UsageEvent.created_at < cutoff)
+            .order_by(UsageEvent.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        # Pick and delete in one statement, and archive only the rows this statement actually removed.
+        rows = db.execute(
+            delete(UsageEvent)
+            .where(UsageEvent.id.in_(batch))
+            .returning(*(columns if archive_dir is not None else columns[:1]))
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not rows:
+            db.rollback()
+            return deleted
+        if archive_dir is not None:
+            _archive_rows(archive_dir, rows)
+        db.commit()
+        deleted += len(rows)
+
+
+def _archive_dir() -> Path | None:
+    if not settings.USAGE_EVENT_ARCHIVE_DIR:
+        return None
+    path = Path(settings.USAGE_EVENT_ARCHIVE_DIR)
+    if not path.is_absolute():
+        path = Path(__file__).resolve().parents[2] / path
+    return path
+
+
+def _lock_path(engine) -> Path:
+    database = engine.url.database
+    if database and database != ":memory:":
+        return Path(f"{database}.usage-maintenance.lock")
+    # An in-memory database is private to this process.
+    return Path(tempfile.gettempdir()) / f"insightflow-usage-maintenance-{os.getpid()}.lock"
+
+
+@contextmanager
+def maintenance_lock(db: Session) -> Iterator[bool]:
+    """Hold the single-runner lock for usage maintenance if it is free; yields whether it was taken.
+
+    Every worker runs the scheduler, so overlapping runs would re-insert the same
+    rollup day and archive the same events twice. PostgreSQL uses a session
+    advisory lock on a dedicated connection, SQLite a ``flock`` beside the file.
+    """
+    engine = db.get_bind()
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            acquired = connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+            connection.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+                    connection.commit()
+        return
+    if engine.dialect.name != "sqlite":
+        yield True
+        return
+    with open(_lock_path(engine), "a") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def run_usage_maintenance() -> dict:
+    db = SessionLocal()
+    try:
+        with maintenance_lock(db) as acquired:
+            if not acquired:
+                return {"skipped": True}
+            return _run_usage_maintenance(db)
+    finally:
+        db.close()
+
+
+def _run_usage_maintenance(db: Session) -> dict:
+    days = rollup_usage_events(db)
+    deleted = compact_usage_events(
+        db,
+        retention_days=settings.USAGE_EVENT_RETENTION_DAYS,
+        batch_size=settings.USAGE_EVENT_COMPACTION_BATCH_SIZE,
+        archive_dir=_archive_dir(),
+    )
+    return {"rolled_up_days": len(days), "deleted_events": deleted}
+
+
+class UsageMaintenanceScheduler:
+    def __init__(self) -> None:
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+    def start(self, interval_seconds: int) -> None:
+        self._stop.clear()
+        self._thread = Thread(target=self._run, args=(interval_seconds,), name="usage-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def _run(self, interval_seconds: int) -> None:
+        while not self._stop.wait(interval_seconds):
+            try:
+                logger.info("Usage maintenance finished: %s", run_usage_maintenance())
+            except Exception:  # noqa: BLE001
+                logger.exception("Usage maintenance failed")
+
+
+usage_maintenance = UsageMaintenanceScheduler()
+
@@ -0,0 +1,181 @@
+"""Compare the async read endpoints with sync twins at high concurrency.
+
+Usage:
+    python benchmarks/bench_async_reads.py [--database-url URL] [--requests N] [--concurrency C] [--pool-size P]
+
+Seeds a survey with responses and an insight summary, then sends ``--requests``
+GETs, ``--concurrency`` at a time, to ``/insights/latest`` and ``/responses``.
+Each async endpoint is compared with a sync copy registered under ``/bench/sync``.
+The copy runs the same queries on a sync ``Session`` and so goes through the
+anyio thread limiter. ``--database-url`` takes the sync URL; the async engine
+uses the matching asyncio driver.
+"""
+
+import argparse
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from datetime import UTC, datetime, timedelta
+from statistics import quantiles
+from time import perf_counter
+from uuid import UUID, uuid4
+
+import anyio.to_thread
+from fastapi import Depends
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from common import build_session_factory, resolve_database_url, seed_published_survey
+
+from app.api.v1.deps import SurveyAccess, survey_with_role
+from app.api.v1.endpoints.feedback import _build_insight_bundle, _response_item
+from app.api.v1.loaders import RequestLoaders
+from app.api.v1.pagination import paginate
+from app.api.v1.responses import FastJSONResponse
+from app.core.config import settings
+from app.core.security import access_token_claims, create_access_token
+from app.db.base import Base
+from app.db.session import async_database_url, build_async_engine, build_engine, get_async_db, get_db
+from app.main import app
+from app.models.feedback import InsightRun, InsightRunStatus, InsightSummary, InsightTheme, ResponseAnswer, SurveyResponse
+from app.models.survey import Survey
+from app.models.user import User
+from app.models.workspace import WorkspaceRole
+from app.schemas.feedback import InsightBundle, SurveyResponseList
+
+
+def sync_latest_insights(
+    survey_id: UUID,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.viewer)),
+    db: Session = Depends(get_db),
+) -> InsightBundle:
+    summary = db.scalar(
+        select(InsightSummary).where(InsightSummary.survey_id == survey_id).order_by(InsightSummary.generated_at.desc()).limit(1)
+    )
+    return _build_insight_bundle(db, summary)
+
+
+def sync_list_responses(
+    survey_id: UUID,
+    access: SurveyAccess = Depends(survey_with_role(WorkspaceRole.viewer)),
+    db: Session = Depends(get_db),
+) -> FastJSONResponse:
+    loaders = RequestLoaders(db)
+    rows, next_cursor = paginate(
+        db,
+        select(SurveyResponse).where(SurveyResponse.survey_id == survey_id),
+        sort_column=SurveyResponse.submitted_at,
+        id_column=SurveyResponse.id,
+        scope=f"responses:{survey_id}",
+        cursor=None,
+        limit=50,
+    )
+    loaders.answers.load_many(row.id for row in rows)
+    items = [_response_item(loaders, row) for row in rows]
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor, "count": len(items)})
+
+
+def seed(session_factory, responses: int) -> tuple[UUID, str]:
+    survey_id, _, question_ids = seed_published_survey(session_factory, question_count=5)
+    db = session_factory()
+    try:
+        user = db.get(User, db.scalar(select(Survey.created_by).where(Survey.id == survey_id)))
+        now = datetime.now(UTC)
+        for index in range(responses):
+            response = SurveyResponse(id=uuid4(), survey_id=survey_id, submitted_at=now - timedelta(seconds=index))
+            db.add(response)
+            db.add_all(ResponseAnswer(response_id=response.id, question_id=qid, value="Fine") for qid in question_ids)
+        run = InsightRun(id=uuid4(), survey_id=survey_id, status=InsightRunStatus.completed)
+        summary = InsightSummary(id=uuid4(), run_id=run.id, survey_id=survey_id, overview="Bench", sentiment_distribution={}, generated_at=now)
+        db.add_all([run, summary])
+        db.add_all(InsightTheme(summary_id=summary.id, label=f"Theme {i}", count=i, sentiment="neutral") for i in range(5))
+        db.commit()
+        token = create_access_token(str(user.id), timedelta(hours=1), access_token_claims(user))
+        return survey_id, token
+    finally:
+        db.close()
+
+
+async def measure(client: httpx.AsyncClient, url: str, headers: dict, requests: int, concurrency: int) -> str:
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append((perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - started
+    cuts = quantiles(latencies, n=100)
+    return f"{requests / elapsed:8.1f} req/s  p50={cuts[49]:7.1f}ms  p99={cuts[98]:7.1f}ms  statuses={statuses}"
+
+
+async def run(args: argparse.Namespace, survey_id: UUID, token: str, async_engine: AsyncEngine) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=None) as client:
+        print(
+            f"requests={args.requests} concurrency={args.concurrency} pool_size={settings.DB_POOL_SIZE} "
+            f"max_overflow={settings.DB_MAX_OVERFLOW} thread_limiter={anyio.to_thread.current_default_thread_limiter().total_tokens}"
+        )
+        for name, path in (("insights/latest", f"/surveys/{survey_id}/insights/latest"), ("responses", f"/surveys/{survey_id}/responses")):
+            for mode, prefix in (("sync ", "/bench/sync"), ("async", "/api/v1")):
+                print(f"{name:16} {mode}  {await measure(client, prefix + path, headers, args.requests, args.concurrency)}")
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--responses", type=int, default=200)
+    # Sized to the default thread limiter: a smaller sync pool starves (threads wait on connections held by
+    # sessions that need a thread to close) until DB_POOL_TIMEOUT_SECONDS breaks the cycle.
+    parser.add_argument("--pool-size", type=int, default=40)
+    args = parser.parse_args()
+
+    settings.DB_POOL_SIZE = args.pool_size
+    settings.DB_MAX_OVERFLOW = 0
+    url = resolve_database_url(args.database_url)
+    engine = build_engine(url, name="bench_sync")
+    Base.metadata.create_all(bind=engine)
+    session_factory = build_session_factory(engine)
+    async_engine = build_async_engine(async_database_url(url), name="bench_async")
+    async_session_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    survey_id, token = seed(session_factory, args.responses)
+
+    def override_get_db() -> Generator[Session, None, None]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_factory() as db:
+            yield db
+
+    app.add_api_route("/bench/sync/surveys/{survey_id}/insights/latest", sync_latest_insights, response_model=InsightBundle)
+    app.add_api_route("/bench/sync/surveys/{survey_id}/responses", sync_list_responses, response_model=SurveyResponseList)
+    # Ahead of the catch-all frontend mount.
+    app.router.routes[:0] = [app.router.routes.pop(), app.router.routes.pop()]
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        asyncio.run(run(args, survey_id, token, async_engine))
+    finally:
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
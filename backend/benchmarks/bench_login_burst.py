@@ -0,0 +1,119 @@
+"""Measure login throughput and the latency of an unrelated endpoint during a login storm.
+
+Usage:
+    python benchmarks/bench_login_burst.py [--database-url URL] [--logins N] [--concurrency C] [--hash-workers W]
+
+Logins are sent ``--concurrency`` at a time while a probe loop requests
+``GET /api/v1/workspaces`` back to back; the probe's p50/p99 show how much the
+storm slows everyone else. ``--hash-workers 0`` runs bcrypt on the request
+thread pool, which is the baseline to compare the process pool against.
+"""
+
+import argparse
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from statistics import quantiles
+from time import perf_counter
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from common import build_engine, build_session_factory, resolve_database_url
+
+from app.api.v1.endpoints import auth as auth_endpoints
+from app.core.config import settings
+from app.db.session import async_database_url, build_async_engine, get_async_db, get_db
+from app.main import app
+from app.services.password_hashing import password_hasher
+
+PASSWORD = "BenchPassword123!"
+
+
+async def run(args: argparse.Namespace) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        registered = await client.post(
+            "/api/v1/auth/register",
+            json={"email": "bench-login@example.com", "password": PASSWORD, "full_name": "Bench User"},
+        )
+        registered.raise_for_status()
+        headers = {"Authorization": f"Bearer {registered.json()['tokens']['access_token']}"}
+
+        statuses: dict[int, int] = {}
+        probe_latencies: list[float] = []
+        remaining = args.logins
+        done = asyncio.Event()
+
+        async def login_worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.post(
+                    "/api/v1/auth/login", json={"email": "bench-login@example.com", "password": PASSWORD}
+                )
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def probe() -> None:
+            while not done.is_set():
+                started = perf_counter()
+                response = await client.get("/api/v1/workspaces", headers=headers)
+                response.raise_for_status()
+                probe_latencies.append((perf_counter() - started) * 1000)
+
+        probe_task = asyncio.create_task(probe())
+        started = perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(args.concurrency)))
+        elapsed = perf_counter() - started
+        done.set()
+        await probe_task
+
+    cuts = quantiles(probe_latencies, n=100) if len(probe_latencies) > 1 else probe_latencies * 99
+    print(
+        f"hash_workers={settings.PASSWORD_HASH_WORKERS} queue_max={settings.PASSWORD_HASH_QUEUE_MAX} "
+        f"logins={args.logins} concurrency={args.concurrency} statuses={statuses}"
+    )
+    print(f"elapsed={elapsed:.3f}s throughput={statuses.get(200, 0) / elapsed:.1f} logins/s")
+    print(f"probe requests={len(probe_latencies)} p50={cuts[49]:.1f}ms p99={cuts[98]:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--hash-workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--queue-max", type=int, default=settings.PASSWORD_HASH_QUEUE_MAX)
+    args = parser.parse_args()
+
+    url = resolve_database_url(args.database_url)
+    session_factory = build_session_factory(build_engine(url))
+    async_engine = build_async_engine(async_database_url(url), name="bench_async")
+    async_session_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db() -> Generator[Session, None, None]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_factory() as db:
+            yield db
+
+    auth_endpoints.send_welcome_email = lambda *_args, **_kwargs: True
+    settings.PASSWORD_HASH_WORKERS = args.hash_workers
+    settings.PASSWORD_HASH_QUEUE_MAX = args.queue_max
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    password_hasher.start()
+    try:
+        asyncio.run(run(args))
+    finally:
+        password_hasher.stop()
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure public response submissions per second.
+
+Usage:
+    python benchmarks/bench_public_submit.py [--database-url URL] [--requests N] [--questions Q] [--buffered]
+
+Without ``--database-url`` a throwaway SQLite file is used; pass a
+``postgresql+psycopg2://`` URL to benchmark against Postgres. Insight analysis
+is stubbed out so only the submission write path is measured. ``--buffered``
+switches to the write-behind ingestion mode and includes the final drain in the timing.
+"""
+
+import argparse
+from collections.abc import Generator
+from time import perf_counter
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from common import build_engine, build_session_factory, resolve_database_url, seed_published_survey
+
+from app.api.v1.endpoints import feedback as feedback_endpoints
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+from app.services import ingestion as ingestion_service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--buffered", action="store_true")
+    args = parser.parse_args()
+
+    url = resolve_database_url(args.database_url)
+    engine = build_engine(url)
+    session_factory = build_session_factory(engine)
+    _, slug, question_ids = seed_published_survey(session_factory, args.questions)
+
+    def override_get_db() -> Generator[Session, None, None]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    settings.PUBLIC_RATE_LIMIT_REQUESTS = args.requests * 10
+    feedback_endpoints.run_insight_analysis = lambda *_args, **_kwargs: None
+    ingestion_service.run_insight_analysis = lambda *_args, **_kwargs: None
+    ingestion_service.SessionLocal = session_factory
+    if args.buffered:
+        settings.PUBLIC_INGEST_MODE = "buffered"
+        settings.PUBLIC_INGEST_QUEUE_MAX = args.requests * 2
+    app.dependency_overrides[get_db] = override_get_db
+    payload = {
+        "answers": [{"question_id": str(qid), "value": f"answer {index}"} for index, qid in enumerate(question_ids)],
+        "respondent_meta": {"source": "bench"},
+    }
+
+    with TestClient(app) as client:
+        for _ in range(10):
+            client.post(f"/api/v1/public/surveys/{slug}/responses", json=payload)
+        started = perf_counter()
+        for _ in range(args.requests):
+            response = client.post(f"/api/v1/public/surveys/{slug}/responses", json=payload)
+            if response.status_code not in {201, 202}:
+                raise SystemExit(f"unexpected status {response.status_code}: {response.text}")
+        ingestion_service.submission_buffer.drain()
+        elapsed = perf_counter() - started
+
+    app.dependency_overrides.clear()
+    print(f"backend={engine.dialect.name} mode={settings.PUBLIC_INGEST_MODE} requests={args.requests} questions={args.questions}")
+    print(f"elapsed={elapsed:.3f}s throughput={args.requests / elapsed:.1f} submissions/s")
+
+
+if __name__ == "__main__":
+    main()
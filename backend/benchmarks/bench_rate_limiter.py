@@ -0,0 +1,58 @@
+"""Measure the public rate limiter's per-call cost and memory under a spray of distinct keys.
+
+Usage:
+    python benchmarks/bench_rate_limiter.py [--keys N] [--max-keys CAP] [--hot-ratio R]
+
+Every call uses a fresh ``ip:path`` key except for a ``--hot-ratio`` share that
+reuses a small hot set, the mix an address spray produces. The limiter's
+retained key count must never exceed ``--max-keys``, whatever ``--keys`` is.
+"""
+
+import argparse
+from pathlib import Path
+import sys
+from time import perf_counter
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.rate_limit import SlidingWindowRateLimiter  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    parser.add_argument("--hot-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}:/api/v1/public/surveys/s_{i % 997}" for i in range(args.keys)]
+    hot_every = int(1 / args.hot_ratio) if args.hot_ratio > 0 else 0
+    def spray(limiter: SlidingWindowRateLimiter) -> int:
+        denied = 0
+        for index, key in enumerate(keys):
+            if hot_every and index % hot_every == 0:
+                key = keys[index % 64]
+            if not limiter.allow(key, limit=60, window_seconds=60):
+                denied += 1
+        return denied
+
+    timed = SlidingWindowRateLimiter(max_keys=args.max_keys)
+    started = perf_counter()
+    denied = spray(timed)
+    elapsed = perf_counter() - started
+
+    # Memory is measured on a second pass; tracemalloc slows every allocation.
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    traced = SlidingWindowRateLimiter(max_keys=args.max_keys)
+    spray(traced)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"calls={args.keys} max_keys={args.max_keys} retained={len(timed)} evictions={timed.evictions} denied={denied}")
+    print(f"elapsed={elapsed:.3f}s per_call={elapsed / args.keys * 1e9:.0f}ns throughput={args.keys / elapsed:,.0f} calls/s")
+    print(f"limiter_memory={(current - baseline) / 2**20:.1f}MiB peak={(peak - baseline) / 2**20:.1f}MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Measure report throughput and the latency of an unrelated endpoint while reports render.
+
+Usage:
+    python benchmarks/bench_report_rendering.py [--database-url URL] [--reports N] [--concurrency C] [--render-workers W]
+
+Seeds a survey whose latest summary has ``--themes`` themes, then sends
+``--reports`` report requests, ``--concurrency`` at a time. Each one uses the
+``detailed_analysis`` template with all sections. A probe loop requests
+``GET /api/v1/workspaces`` back to back meanwhile. Over ASGITransport a request
+returns once its background job has finished, so the request latency is the
+job latency. The render cache is bypassed unless ``--cached`` is passed, so
+every job renders. ``--render-workers 0`` renders on the request thread pool,
+which is the baseline to compare the process pool against.
+"""
+
+import argparse
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from datetime import UTC, datetime, timedelta
+from statistics import quantiles
+import tempfile
+from time import perf_counter
+from uuid import UUID, uuid4
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from common import build_session_factory, resolve_database_url, seed_published_survey
+
+from app.core.config import settings
+from app.core.security import access_token_claims, create_access_token
+from app.db.base import Base
+from app.db.session import async_database_url, build_async_engine, build_engine, get_async_db, get_db
+from app.main import app
+from app.models.feedback import InsightRecommendation, InsightRun, InsightRunStatus, InsightSummary, InsightTheme, Persona
+from app.models.hardening import ReportJob, ReportStatus
+from app.models.survey import Survey
+from app.models.user import User
+from app.services import reporting as reporting_service
+from app.services.report_workers import report_renderer
+
+SENTIMENTS = ("positive", "neutral", "negative")
+
+
+def seed(session_factory, themes: int) -> tuple[UUID, str]:
+    survey_id, _, _ = seed_published_survey(session_factory, question_count=3)
+    db = session_factory()
+    try:
+        user = db.get(User, db.scalar(select(Survey.created_by).where(Survey.id == survey_id)))
+        run = InsightRun(id=uuid4(), survey_id=survey_id, status=InsightRunStatus.completed)
+        summary = InsightSummary(
+            id=uuid4(),
+            run_id=run.id,
+            survey_id=survey_id,
+            overview="Respondents found checkout quick but struggled with delivery options. " * 20,
+            sentiment_distribution={"positive": 0.55, "neutral": 0.3, "negative": 0.15},
+            generated_at=datetime.now(UTC),
+        )
+        db.add_all([run, summary])
+        db.add_all(
+            InsightTheme(
+                summary_id=summary.id,
+                label=f"Theme {index}: delivery windows and tracking",
+                count=themes - index,
+                sentiment=SENTIMENTS[index % 3],
+                sample_quote="I could not tell when my parcel would arrive, so I stayed home all day. " * 2,
+            )
+            for index in range(themes)
+        )
+        db.add_all(
+            InsightRecommendation(summary_id=summary.id, title=f"Recommendation {index}", detail="Show delivery slots up front. " * 8, priority="high")
+            for index in range(20)
+        )
+        db.add_all(
+            Persona(
+                survey_id=survey_id,
+                run_id=run.id,
+                name=f"Persona {index}",
+                summary="Busy, shops on mobile, values predictability. " * 4,
+                key_traits=["mobile-first", "time-poor"],
+                frustrations=["vague delivery windows"],
+                goals=["plan around deliveries"],
+            )
+            for index in range(5)
+        )
+        db.commit()
+        return survey_id, create_access_token(str(user.id), timedelta(hours=1), access_token_claims(user))
+    finally:
+        db.close()
+
+
+def percentiles(values: list[float]) -> tuple[float, float]:
+    cuts = quantiles(values, n=100) if len(values) > 1 else values * 99
+    return cuts[49], cuts[98]
+
+
+async def run(args: argparse.Namespace, survey_id: UUID, token: str, async_engine: AsyncEngine) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    body = {"format": "pdf", "template": "detailed_analysis", "include_sections": ["overview", "themes", "recommendations", "personas"]}
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=None) as client:
+        statuses: dict[str, int] = {}
+        job_latencies: list[float] = []
+        probe_latencies: list[float] = []
+        remaining = args.reports
+        done = asyncio.Event()
+
+        async def report_worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = perf_counter()
+                response = await client.post(f"/api/v1/surveys/{survey_id}/reports", json=body, headers=headers)
+                key = f"{response.status_code} {response.json().get('code', '')}".strip() if response.status_code == 503 else str(response.status_code)
+                statuses[key] = statuses.get(key, 0) + 1
+                if response.status_code == 202:
+                    job_latencies.append((perf_counter() - started) * 1000)
+
+        async def probe() -> None:
+            while not done.is_set():
+                started = perf_counter()
+                response = await client.get("/api/v1/workspaces", headers=headers)
+                if response.status_code != 200:
+                    raise RuntimeError(f"probe failed: {response.status_code} {response.text}")
+                probe_latencies.append((perf_counter() - started) * 1000)
+
+        probe_task = asyncio.create_task(probe())
+        started = perf_counter()
+        await asyncio.gather(*(report_worker() for _ in range(args.concurrency)))
+        elapsed = perf_counter() - started
+        done.set()
+        await probe_task
+    await async_engine.dispose()
+
+    print(
+        f"render_workers={settings.REPORT_RENDER_WORKERS} queue_max={settings.REPORT_RENDER_QUEUE_MAX} "
+        f"reports={args.reports} concurrency={args.concurrency} themes={args.themes} cached={args.cached} statuses={statuses}"
+    )
+    if job_latencies:
+        p50, p99 = percentiles(job_latencies)
+        print(f"elapsed={elapsed:.3f}s throughput={len(job_latencies) / elapsed:.1f} reports/s job p50={p50:.0f}ms p99={p99:.0f}ms")
+    p50, p99 = percentiles(probe_latencies)
+    print(f"probe requests={len(probe_latencies)} p50={p50:.1f}ms p99={p99:.1f}ms")
+    print(f"renderer {report_renderer.metrics()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--reports", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--themes", type=int, default=300)
+    parser.add_argument("--render-workers", type=int, default=settings.REPORT_RENDER_WORKERS)
+    parser.add_argument("--queue-max", type=int, default=100)
+    parser.add_argument("--cached", action="store_true", help="keep the content-addressed render cache")
+    # As in bench_async_reads: sync endpoints starve a pool smaller than the thread limiter.
+    parser.add_argument("--pool-size", type=int, default=40)
+    args = parser.parse_args()
+
+    settings.DB_POOL_SIZE = args.pool_size
+    settings.DB_MAX_OVERFLOW = 0
+    url = resolve_database_url(args.database_url)
+    engine = build_engine(url, name="bench")
+    Base.metadata.create_all(bind=engine)
+    session_factory = build_session_factory(engine)
+    async_engine = build_async_engine(async_database_url(url), name="bench_async")
+    async_session_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    survey_id, token = seed(session_factory, args.themes)
+
+    def override_get_db() -> Generator[Session, None, None]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_factory() as db:
+            yield db
+
+    settings.REPORT_RENDER_WORKERS = args.render_workers
+    settings.REPORT_RENDER_QUEUE_MAX = args.queue_max
+    settings.REPORT_EXPORT_DIR = tempfile.mkdtemp(prefix="insightflow-bench-reports-")
+    reporting_service.SessionLocal = session_factory
+    if not args.cached:
+        reporting_service.render_cache_key = lambda *_args: uuid4().hex
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    report_renderer.start()
+    try:
+        asyncio.run(run(args, survey_id, token, async_engine))
+    finally:
+        report_renderer.stop()
+        app.dependency_overrides.clear()
+
+    db = session_factory()
+    try:
+        completed = db.scalar(select(func.count()).select_from(ReportJob).where(ReportJob.status == ReportStatus.completed))
+        failed = db.scalar(select(func.count()).select_from(ReportJob).where(ReportJob.status == ReportStatus.failed))
+        print(f"jobs completed={completed} failed={failed}")
+        for error in db.scalars(select(ReportJob.error).where(ReportJob.status == ReportStatus.failed).distinct().limit(3)):
+            print(f"  failure: {error[:160]}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Measure the CPU cost of building and encoding list payloads, per endpoint and page size.
+
+Usage:
+    python benchmarks/bench_serialization.py [--sizes 100 10000] [--repeat R]
+
+For the response, persona and report lists, builds ``--sizes`` in-memory ORM
+rows (no database), then times three ways of turning them into JSON bytes:
+
+* ``models``: one Pydantic model per item, serialised as FastAPI does for a
+  ``response_model`` on its pydantic-core fast path
+* ``models+json``: the same models, dumped to Python and encoded with
+  ``json.dumps``, the path of FastAPI releases without that fast path
+* ``dicts``: plain dicts encoded by ``FastJSONResponse``, as the list
+  endpoints now return
+
+Each figure is the best of ``--repeat`` runs. All three produce the same payload.
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime, timedelta
+import json
+from pathlib import Path
+import sys
+from time import perf_counter
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.routing import serialize_response  # noqa: E402
+
+from app.api.v1.endpoints import feedback, reporting  # noqa: E402
+from app.api.v1.responses import FastJSONResponse  # noqa: E402
+from app.models.feedback import Persona, ResponseAnswer, SurveyResponse  # noqa: E402
+from app.models.hardening import ExportAsset, ReportJob, ReportStatus  # noqa: E402
+
+
+class Loader:
+    def __init__(self, values: dict) -> None:
+        self.values = values
+
+    def load(self, key):
+        return self.values.get(key)
+
+
+def response_rows(count: int) -> tuple[list, SimpleNamespace]:
+    survey_id, now = uuid4(), datetime.now(UTC)
+    questions = [uuid4() for _ in range(5)]
+    rows = [SurveyResponse(id=uuid4(), survey_id=survey_id, submitted_at=now - timedelta(seconds=i), respondent_meta={"source": "email"}) for i in range(count)]
+    answers = {
+        row.id: [ResponseAnswer(response_id=row.id, question_id=qid, value="Checkout was quick but delivery slots were unclear.") for qid in questions]
+        for row in rows
+    }
+    return rows, SimpleNamespace(answers=Loader(answers))
+
+
+def persona_rows(count: int) -> list:
+    survey_id, run_id = uuid4(), uuid4()
+    return [
+        Persona(
+            id=uuid4(),
+            survey_id=survey_id,
+            run_id=run_id,
+            name=f"Persona {i}",
+            summary="Busy, shops on mobile, values predictability.",
+            key_traits=["mobile-first", "time-poor"],
+            frustrations=["vague delivery windows"],
+            goals=["plan around deliveries"],
+            confidence="medium",
+        )
+        for i in range(count)
+    ]
+
+
+def report_rows(count: int) -> tuple[list, SimpleNamespace]:
+    survey_id, now = uuid4(), datetime.now(UTC)
+    rows = [
+        ReportJob(
+            id=uuid4(),
+            survey_id=survey_id,
+            status=ReportStatus.completed,
+            format="pdf",
+            template="executive_summary",
+            include_sections=["overview", "themes"],
+            created_at=now,
+            updated_at=now,
+            completed_at=now,
+        )
+        for _ in range(count)
+    ]
+    assets = {
+        row.id: ExportAsset(id=uuid4(), file_name=f"report_{row.id}.pdf", mime_type="application/pdf", expires_at=now, download_token=uuid4().hex)
+        for row in rows
+    }
+    return rows, SimpleNamespace(assets=Loader(assets))
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        fn()
+        best = min(best, perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    routes = {route.path: route for route in [*feedback.router.routes, *reporting.router.routes]}
+    for size in args.sizes:
+        responses, response_loaders = response_rows(size)
+        personas = persona_rows(size)
+        reports, report_loaders = report_rows(size)
+        endpoints = {
+            "/surveys/{survey_id}/responses": lambda: {
+                "items": [feedback._response_item(response_loaders, row) for row in responses],
+                "next_cursor": None,
+                "count": size,
+            },
+            "/surveys/{survey_id}/personas": lambda: {"items": [feedback._persona_item(row) for row in personas], "count": size},
+            "/surveys/{survey_id}/reports": lambda: {
+                "items": [reporting._job_item(report_loaders, row) for row in reports],
+                "next_cursor": None,
+                "count": size,
+            },
+        }
+        for path, build in endpoints.items():
+            field = routes[path].response_field
+            model = field.field_info.annotation
+
+            def via_models() -> bytes:
+                return asyncio.run(serialize_response(field=field, response_content=model.model_validate(build()), dump_json=True))
+
+            def via_models_json() -> bytes:
+                content = asyncio.run(serialize_response(field=field, response_content=model.model_validate(build())))
+                return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+            def via_dicts() -> bytes:
+                return FastJSONResponse(build()).body
+
+            assert via_models() == via_models_json() == via_dicts()
+            timings = {name: best_of(args.repeat, fn) for name, fn in (("models", via_models), ("models+json", via_models_json), ("dicts", via_dicts))}
+            print(
+                f"{path:<34} items={size:<6} "
+                + " ".join(f"{name}={ms:.2f}ms" for name, ms in timings.items())
+                + f" speedup={timings['models'] / timings['dicts']:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
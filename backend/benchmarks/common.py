@@ -0,0 +1,92 @@
+"""Shared helpers for the standalone benchmark scripts."""
+
+from datetime import UTC, datetime
+import os
+import sys
+from pathlib import Path
+import tempfile
+from uuid import UUID
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.base import Base  # noqa: E402
+from app.models.project import Project  # noqa: E402
+from app.models.survey import QuestionType, Survey, SurveyPublication, SurveyQuestion, SurveyStatus  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.workspace import Workspace, WorkspaceMember, WorkspaceRole  # noqa: E402
+import app.models.feedback  # noqa: E402,F401
+import app.models.hardening  # noqa: E402,F401
+
+
+def resolve_database_url(url: str | None) -> str:
+    """Return the benchmark database URL, defaulting to a throwaway SQLite file."""
+    if url:
+        return url
+    path = Path(tempfile.mkdtemp(prefix="insightflow-bench-")) / "bench.db"
+    return f"sqlite+pysqlite:///{path}"
+
+
+def build_engine(url: str) -> Engine:
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args, pool_pre_ping=True)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def build_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+
+
+def seed_published_survey(session_factory: sessionmaker, question_count: int = 10) -> tuple[UUID, str, list[UUID]]:
+    """Create a user/workspace/project and a published survey; return (survey_id, slug, question_ids)."""
+    db = session_factory()
+    try:
+        suffix = os.urandom(4).hex()
+        user = User(email=f"bench-{suffix}@insightflow.local", full_name="Bench User", password_hash="x")
+        db.add(user)
+        db.flush()
+        workspace = Workspace(name=f"Bench {suffix}", owner_id=user.id)
+        db.add(workspace)
+        db.flush()
+        db.add(WorkspaceMember(workspace_id=workspace.id, user_id=user.id, role=WorkspaceRole.owner, status="active"))
+        project = Project(workspace_id=workspace.id, name="Bench Project", status="active", created_by=user.id)
+        db.add(project)
+        db.flush()
+        survey = Survey(
+            project_id=project.id,
+            title="Bench Survey",
+            goal="Measure throughput",
+            status=SurveyStatus.published,
+            language="en",
+            created_by=user.id,
+        )
+        db.add(survey)
+        db.flush()
+        questions = [
+            SurveyQuestion(
+                survey_id=survey.id,
+                type=QuestionType.text,
+                text=f"Question {index}",
+                required=True,
+                order_index=index,
+            )
+            for index in range(1, question_count + 1)
+        ]
+        db.add_all(questions)
+        slug = f"s_bench{suffix}"
+        db.add(
+            SurveyPublication(
+                survey_id=survey.id,
+                public_slug=slug,
+                status=SurveyStatus.published,
+                published_at=datetime.now(UTC),
+            )
+        )
+        db.commit()
+        return survey.id, slug, [q.id for q in questions]
+    finally:
+        db.close()
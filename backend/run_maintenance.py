@@ -0,0 +1,26 @@
+"""Entry point script for running a maintenance task once, e.g. from cron."""
+
+import argparse
+import logging
+
+from app.services.exports import run_export_sweep
+from app.services.usage_rollups import run_usage_maintenance
+
+logger = logging.getLogger("app.maintenance")
+
+TASKS = {
+    "exports": run_export_sweep,
+    "usage": run_usage_maintenance,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("task", choices=sorted(TASKS))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logger.info("Maintenance task %s finished: %s", args.task, TASKS[args.task]())
+
+
+if __name__ == "__main__":
+    main()
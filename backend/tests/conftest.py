@@ -1,23 +1,37 @@
 import sys
 from pathlib import Path
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from contextlib import contextmanager
 
+import aiosqlite
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from app.core.config import settings
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.main import app
 from app.api.v1.deps import public_rate_limiter
 from app.api.v1.endpoints import auth as auth_endpoints
 from app.api.v1.endpoints import workspaces as workspace_endpoints
+from app.services import events as events_service
+from app.services import exports as exports_service
+from app.services import ingestion as ingestion_service
 from app.services import insights as insights_service
+from app.services import invalidation as invalidation_service
 from app.services import reporting as reporting_service
+from app.services import usage_rollups as usage_rollups_service
+from app.services.membership_cache import workspace_roles
+from app.services.submissions import submission_plans
+from app.services.survey_cache import public_surveys
+from app.services.token_versions import token_versions
 
 
 @pytest.fixture()
@@ -29,11 +43,32 @@ def client(monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]
     )
     TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
     Base.metadata.create_all(bind=engine)
+    # The async engine wraps the very same in-memory connection, so both session kinds see one database.
+    shared_connection = engine.raw_connection().driver_connection
+    async_engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=StaticPool,
+        async_creator=lambda: aiosqlite.Connection(lambda: shared_connection, iter_chunk_size=64),
+    )
+    TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
     original_session_local = insights_service.SessionLocal
     original_reporting_session_local = reporting_service.SessionLocal
     insights_service.SessionLocal = TestingSessionLocal
     reporting_service.SessionLocal = TestingSessionLocal
+    monkeypatch.setattr(ingestion_service, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(events_service, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(exports_service, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(usage_rollups_service, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(invalidation_service, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    monkeypatch.setattr(settings, "REPORT_RENDER_WORKERS", 0)
+    monkeypatch.setattr(settings, "EXPORT_SWEEP_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "test-metrics-token")
     public_rate_limiter.reset()
+    submission_plans.reset()
+    public_surveys.reset()
+    workspace_roles.reset()
+    token_versions.reset()
     monkeypatch.setattr(auth_endpoints, "send_welcome_email", lambda *args, **kwargs: True)
     monkeypatch.setattr(auth_endpoints, "send_password_reset_email", lambda *args, **kwargs: True)
     monkeypatch.setattr(workspace_endpoints, "send_workspace_invitation_email", lambda *args, **kwargs: True)
@@ -45,10 +80,48 @@ def client(monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]
         finally:
             db.close()
 
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
+        test_client.portal.call(async_engine.dispose)
     app.dependency_overrides.clear()
     insights_service.SessionLocal = original_session_local
     reporting_service.SessionLocal = original_reporting_session_local
     public_rate_limiter.reset()
+
+
+@pytest.fixture()
+def read_metrics(client: TestClient):
+    """Return the ``/metrics`` payload, read with the test token."""
+
+    def _read() -> dict:
+        response = client.get("/metrics", headers={"Authorization": f"Bearer {settings.METRICS_TOKEN}"})
+        assert response.status_code == 200
+        return response.json()
+
+    return _read
+
+
+@pytest.fixture()
+def count_queries():
+    """Context manager collecting every SQL statement executed on any engine."""
+
+    @contextmanager
+    def _count() -> Generator[list[str], None, None]:
+        statements: list[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+    return _count
@@ -0,0 +1,50 @@
+from fastapi import routing
+from fastapi.dependencies import utils as dependency_utils
+from starlette.concurrency import run_in_threadpool
+
+from test_feedback_phase2 import answer_for, build_published_survey
+
+
+def test_async_read_endpoints_never_use_the_threadpool(client, monkeypatch):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    answers = [answer_for(q, "Quick and clear") for q in questions if q["required"]]
+    assert client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers}).status_code == 201
+    run_id = client.get(f"/api/v1/surveys/{survey_id}/insights/latest", headers=headers).json()["run_id"]
+
+    offloaded: list[str] = []
+
+    async def tracking_run_in_threadpool(func, *args, **kwargs):
+        offloaded.append(getattr(func, "__qualname__", repr(func)))
+        return await run_in_threadpool(func, *args, **kwargs)
+
+    monkeypatch.setattr(routing, "run_in_threadpool", tracking_run_in_threadpool)
+    monkeypatch.setattr(dependency_utils, "run_in_threadpool", tracking_run_in_threadpool)
+
+    urls = [
+        f"/api/v1/public/surveys/{slug}",
+        f"/api/v1/surveys/{survey_id}/responses",
+        f"/api/v1/surveys/{survey_id}/insights/latest",
+        f"/api/v1/surveys/{survey_id}/insights/runs/{run_id}",
+    ]
+    for url in urls:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, url
+    assert offloaded == []
+
+    listed = client.get(f"/api/v1/surveys/{survey_id}/responses", headers=headers).json()
+    assert listed["count"] == 1
+    assert len(listed["items"][0]["answers"]) == len(answers)
+    # The sync endpoints still run on the threadpool, which is what the tracker sees.
+    assert client.get(f"/api/v1/surveys/{survey_id}", headers=headers).status_code == 200
+    assert offloaded
+
+
+def test_async_read_endpoints_enforce_roles(client):
+    tokens, survey_id, _, _ = build_published_survey(client)
+    outsider = client.post(
+        "/api/v1/auth/register", json={"email": "outsider@insight.com", "password": "Outsider123!", "full_name": "Out Sider"}
+    ).json()["tokens"]
+    headers = {"Authorization": f"Bearer {outsider['access_token']}"}
+    assert client.get(f"/api/v1/surveys/{survey_id}/responses", headers=headers).status_code == 403
+    assert client.get(f"/api/v1/surveys/{survey_id}/insights/latest").status_code in (401, 403)
@@ -1,6 +1,9 @@
+import asyncio
 from datetime import timedelta
 
-from app.core.security import create_password_reset_token
+from app.core.config import settings
+from app.core.security import create_password_reset_token, get_password_hash
+from app.services.password_hashing import HasherBusyError, password_hasher
 from app.api.v1.endpoints import auth as auth_endpoints
 
 
@@ -116,3 +119,88 @@ def test_password_recovery_sends_reset_email(client, monkeypatch):
     assert forgot_response.status_code == 200
     assert captured["email"] == "recovermail@example.com"
     assert "token=" in captured["reset_link"]
+
+
+def test_stateless_access_tokens_skip_user_lookup_and_revoke_on_password_reset(client, monkeypatch, count_queries):
+    monkeypatch.setattr(settings, "STATELESS_ACCESS_TOKENS", True)
+    reg_response = client.post(
+        "/api/v1/auth/register",
+        json={"email": "stateless@example.com", "password": "Password123!", "full_name": "Stateless User"},
+    )
+    assert reg_response.status_code == 201
+    user_id = reg_response.json()["user"]["id"]
+    tokens = reg_response.json()["tokens"]
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    assert client.get("/api/v1/workspaces", headers=headers).status_code == 200
+    with count_queries() as statements:
+        created = client.post("/api/v1/workspaces", json={"name": "Stateless WS"}, headers=headers)
+    assert created.status_code == 201
+    assert created.json()["owner_id"] == user_id
+    assert not any("FROM users" in statement for statement in statements)
+
+    reset_token = create_password_reset_token(user_id, timedelta(minutes=30))
+    reset_response = client.post(
+        "/api/v1/auth/password/reset",
+        json={"token": reset_token, "new_password": "NewPassword123!"},
+    )
+    assert reset_response.status_code == 200
+
+    revoked = client.get("/api/v1/workspaces", headers=headers)
+    assert revoked.status_code == 401
+    assert revoked.json()["detail"] == "Token revoked"
+    stale_refresh = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert stale_refresh.status_code == 401
+
+    login = client.post("/api/v1/auth/login", json={"email": "stateless@example.com", "password": "NewPassword123!"})
+    fresh_headers = {"Authorization": f"Bearer {login.json()['tokens']['access_token']}"}
+    assert client.get("/api/v1/workspaces", headers=fresh_headers).status_code == 200
+    refreshed = client.post("/api/v1/auth/refresh", json={"refresh_token": login.json()["tokens"]["refresh_token"]})
+    assert refreshed.status_code == 200
+
+
+def test_password_hashing_runs_in_process_pool(client, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    try:
+        register_response = client.post(
+            "/api/v1/auth/register",
+            json={"email": "pooled@example.com", "password": "Password123!", "full_name": "Pooled User"},
+        )
+        assert register_response.status_code == 201
+        login_response = client.post("/api/v1/auth/login", json={"email": "pooled@example.com", "password": "Password123!"})
+        assert login_response.status_code == 200
+        wrong_password = client.post("/api/v1/auth/login", json={"email": "pooled@example.com", "password": "Wrong123!"})
+        assert wrong_password.status_code == 401
+        assert password_hasher.metrics()["completed"] >= 3
+    finally:
+        password_hasher.stop()
+
+
+def test_saturated_password_hasher_fails_fast(client, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_MAX", 0)
+    password_hash = get_password_hash("Password123!")
+
+    async def verify_concurrently() -> list:
+        return await asyncio.gather(
+            password_hasher.verify("Password123!", password_hash),
+            password_hasher.verify("Password123!", password_hash),
+            return_exceptions=True,
+        )
+
+    outcomes = asyncio.run(verify_concurrently())
+    assert sum(outcome is True for outcome in outcomes) == 1
+    assert sum(isinstance(outcome, HasherBusyError) for outcome in outcomes) == 1
+
+    async def busy(*_args):
+        raise HasherBusyError("saturated")
+
+    monkeypatch.setattr(password_hasher, "verify", busy)
+    login_response = client.post("/api/v1/auth/login", json={"email": "nobody@example.com", "password": "Password123!"})
+    assert login_response.status_code == 401
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": "busy@example.com", "password": "Password123!", "full_name": "Busy User"},
+    )
+    busy_login = client.post("/api/v1/auth/login", json={"email": "busy@example.com", "password": "Password123!"})
+    assert busy_login.status_code == 503
+    assert busy_login.headers["retry-after"] == "1"
@@ -0,0 +1,67 @@
+from test_feedback_phase2 import answer_for, build_published_survey, register_and_login
+
+
+def _answers(questions):
+    return [answer_for(q, "Clear and fast") for q in questions if q["required"]]
+
+
+def _count_get(client, count_queries, url: str, headers: dict) -> tuple[int, dict]:
+    with count_queries() as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+def test_list_endpoints_issue_constant_queries(client, count_queries):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    project_id = client.get(f"/api/v1/surveys/{survey_id}", headers=headers).json()["survey"]["project_id"]
+    workspace_id = client.get(f"/api/v1/projects/{project_id}", headers=headers).json()["workspace_id"]
+
+    def add_rows() -> None:
+        submitted = client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": _answers(questions)})
+        assert submitted.status_code == 201
+        created = client.post(f"/api/v1/projects/{project_id}/surveys", json={"title": "Another", "goal": "Batching"}, headers=headers)
+        assert created.status_code == 201
+        report = client.post(
+            f"/api/v1/surveys/{survey_id}/reports",
+            json={"format": "pdf", "template": "executive_summary", "include_sections": ["overview"]},
+            headers=headers,
+        )
+        assert report.status_code == 202
+
+    urls = {
+        "responses": f"/api/v1/surveys/{survey_id}/responses",
+        "surveys": f"/api/v1/projects/{project_id}/surveys",
+        "reports": f"/api/v1/surveys/{survey_id}/reports",
+        "members": f"/api/v1/workspaces/{workspace_id}/members",
+    }
+    add_rows()
+    register_and_login(client, "member0@insight.com", "MemberPass123!", "Member 0")
+    invited = client.post(
+        f"/api/v1/workspaces/{workspace_id}/members/invite",
+        json={"email": "member0@insight.com", "role": "viewer"},
+        headers=headers,
+    )
+    assert invited.status_code == 201
+    small = {name: _count_get(client, count_queries, url, headers) for name, url in urls.items()}
+
+    for index in range(1, 5):
+        add_rows()
+        register_and_login(client, f"member{index}@insight.com", "MemberPass123!", f"Member {index}")
+        invited = client.post(
+            f"/api/v1/workspaces/{workspace_id}/members/invite",
+            json={"email": f"member{index}@insight.com", "role": "viewer"},
+            headers=headers,
+        )
+        assert invited.status_code == 201
+    large = {name: _count_get(client, count_queries, url, headers) for name, url in urls.items()}
+
+    for name in urls:
+        small_count, small_body = small[name]
+        large_count, large_body = large[name]
+        assert len(large_body["items"]) > len(small_body["items"]), name
+        assert large_count == small_count, name
+    assert all(item["answers"] for item in large["responses"][1]["items"])
+    assert all(item["asset"] for item in large["reports"][1]["items"])
+    assert {item["email"] for item in large["members"][1]["items"]} >= {f"member{i}@insight.com" for i in range(5)}
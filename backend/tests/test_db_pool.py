@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.db import session as session_module
+
+
+def test_pool_monitor_tracks_checkouts_waits_and_timeouts(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_module, "pool_monitors", {})
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT_SECONDS", 0.05)
+    engine = session_module.build_engine(f"sqlite+pysqlite:///{tmp_path / 'pool.db'}", name="test")
+    monitor = session_module.pool_monitors["test"]
+    try:
+        held = engine.connect()
+        held.execute(text("SELECT 1"))
+        assert monitor.metrics()["in_use"] == 1
+
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        held.close()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        metrics = monitor.metrics()
+        assert metrics["in_use"] == 0
+        assert metrics["peak_in_use"] == 1
+        assert metrics["connections"] == 1
+        assert metrics["overflow"] == 0
+        assert metrics["checkouts"] == 2
+        assert metrics["timeouts"] == 1
+        assert metrics["checkout_wait_ms"]["count"] == 3
+        assert metrics["checkout_wait_ms"]["max"] >= 50
+    finally:
+        engine.dispose()
+    assert monitor.metrics()["connections"] == 0
+
@@ -0,0 +1,90 @@
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.hardening import AuditEvent, UsageEvent
+from app.services import events as events_service
+from app.services.events import event_pipeline, log_audit_event, log_usage_event
+
+
+def register_and_login(client, email: str, password: str, full_name: str) -> dict:
+    reg = client.post("/api/v1/auth/register", json={"email": email, "password": password, "full_name": full_name})
+    assert reg.status_code == 201
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert login.status_code == 200
+    return login.json()["tokens"]
+
+
+def count_rows(model) -> int:
+    db = events_service.SessionLocal()
+    try:
+        return db.scalar(select(func.count()).select_from(model))
+    finally:
+        db.close()
+
+
+def test_usage_events_are_buffered_and_bulk_flushed(client, read_metrics):
+    tokens = register_and_login(client, "events@insight.com", "EventsPass123!", "Events User")
+    event_pipeline.start(background=False)
+    try:
+        ws = client.post(
+            "/api/v1/workspaces",
+            json={"name": "Events WS"},
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+        assert ws.status_code == 201
+        for name in ("dashboard.viewed", "survey.opened"):
+            tracked = client.post(
+                "/api/v1/events/track",
+                json={"event_name": name, "workspace_id": ws.json()["id"]},
+                headers={"Authorization": f"Bearer {tokens['access_token']}"},
+            )
+            assert tracked.status_code == 202
+
+        # Audit events stay transactional by default; usage events wait for the flusher.
+        assert count_rows(AuditEvent) == 1
+        assert count_rows(UsageEvent) == 0
+        assert read_metrics()["events"]["pending"] == 3
+
+        event_pipeline.drain()
+        metrics = read_metrics()["events"]
+        assert metrics["flushed"] == 3
+        assert metrics["batches"] == 1
+        assert metrics["pending"] == 0
+        assert count_rows(UsageEvent) == 3
+    finally:
+        event_pipeline.stop()
+
+
+def test_rolled_back_events_are_discarded(client):
+    event_pipeline.start(background=False)
+    db = events_service.SessionLocal()
+    try:
+        log_usage_event(db, event_name="never.committed")
+        log_audit_event(db, action="never.committed", entity_type="test", entity_id="1", sync=False)
+        db.rollback()
+        assert event_pipeline.metrics()["enqueued"] == 0
+
+        log_audit_event(db, action="async.audit", entity_type="test", entity_id="2", sync=False)
+        db.commit()
+        assert event_pipeline.metrics()["enqueued"] == 1
+        event_pipeline.drain()
+        assert count_rows(AuditEvent) == 1
+    finally:
+        db.close()
+        event_pipeline.stop()
+
+
+def test_full_queue_drops_events_and_reports_them(client, monkeypatch):
+    monkeypatch.setattr(settings, "EVENT_PIPELINE_QUEUE_MAX", 1)
+    event_pipeline.start(background=False)
+    db = events_service.SessionLocal()
+    try:
+        log_usage_event(db, event_name="first")
+        log_usage_event(db, event_name="second")
+        db.commit()
+        metrics = event_pipeline.metrics()
+        assert metrics["enqueued"] == 1
+        assert metrics["dropped"] == 1
+    finally:
+        db.close()
+        event_pipeline.stop()
@@ -0,0 +1,187 @@
+from datetime import UTC, datetime, timedelta
+import hashlib
+from uuid import UUID
+
+import httpx
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.models.hardening import ExportAsset, ExportBlob
+from app.services import export_storage
+from app.services import reporting as reporting_service
+from app.services.export_storage import S3ExportStorage
+from app.services.exports import sweep_exports
+from test_feedback_phase2 import build_published_survey
+
+
+def _export(client, survey_id: str, headers: dict, **payload) -> dict:
+    body = {"format": "pdf", "template": "executive_summary", "include_sections": ["overview"], **payload}
+    created = client.post(f"/api/v1/surveys/{survey_id}/reports", json=body, headers=headers)
+    job = client.get(f"/api/v1/surveys/{survey_id}/reports/{created.json()['report_id']}", headers=headers).json()
+    assert job["status"] == "completed", job
+    return job["asset"]
+
+
+def _download(client, asset: dict, **headers) -> httpx.Response:
+    return client.get(f"/api/v1/exports/{asset['asset_id']}/download", params={"token": asset["download_token"]}, headers=headers)
+
+
+def _sweep(**kwargs) -> dict:
+    db = reporting_service.SessionLocal()
+    try:
+        return sweep_exports(db, export_storage.get_export_storage(), batch_size=1, **kwargs)
+    finally:
+        db.close()
+
+
+def _expire(asset: dict) -> None:
+    db = reporting_service.SessionLocal()
+    db.execute(update(ExportAsset).where(ExportAsset.id == UUID(asset["asset_id"])).values(expires_at=datetime.now(UTC) - timedelta(minutes=1)))
+    db.commit()
+    db.close()
+
+
+def _blobs() -> list[tuple[int, int]]:
+    db = reporting_service.SessionLocal()
+    try:
+        return [tuple(row) for row in db.execute(select(ExportBlob.ref_count, ExportBlob.size_bytes).order_by(ExportBlob.created_at))]
+    finally:
+        db.close()
+
+
+def test_identical_exports_share_a_blob_until_every_asset_expires(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_EXPORT_DIR", str(tmp_path))
+    tokens, survey_id, _, _ = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    # Without insights both templates render only the cover, so two different exports produce identical bytes.
+    first = _export(client, survey_id, headers, template="executive_summary")
+    second = _export(client, survey_id, headers, template="stakeholder_brief")
+    assert _download(client, first).content == _download(client, second).content
+    assert [ref_count for ref_count, _ in _blobs()] == [2]
+    assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
+
+    _expire(first)
+    assert _sweep()["expired_assets"] == 1
+    assert _download(client, first).status_code == 404
+    assert _download(client, second).status_code == 200
+    assert [ref_count for ref_count, _ in _blobs()] == [1]
+
+    _expire(second)
+    result = _sweep()
+    assert (result["expired_assets"], result["deleted_blobs"]) == (1, 1)
+    assert _blobs() == []
+    assert list((tmp_path / "blobs").glob("*/*")) == []
+
+
+def test_sweeper_evicts_least_recently_used_blobs_beyond_the_cap(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_EXPORT_DIR", str(tmp_path))
+    tokens, survey_id, _, _ = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    old = _export(client, survey_id, headers, format="slides")
+    recent = _export(client, survey_id, headers, format="pdf")
+    db = reporting_service.SessionLocal()
+    db.execute(update(ExportBlob).values(last_accessed_at=datetime.now(UTC) - timedelta(days=1)))
+    db.commit()
+    db.close()
+    assert _download(client, recent).status_code == 200  # refreshes its LRU position
+
+    sizes = [size for _, size in _blobs()]
+    result = _sweep(max_bytes=max(sizes))
+    assert (result["evicted_assets"], result["deleted_blobs"]) == (1, 1)
+    assert _download(client, old).status_code == 404
+    assert _download(client, recent).status_code == 200
+    assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
+
+
+def test_downloads_serve_ranges_of_a_multi_gigabyte_export_and_revalidate_by_etag(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_EXPORT_DIR", str(tmp_path))
+    tokens, survey_id, _, _ = build_published_survey(client)
+    asset = _export(client, survey_id, {"Authorization": f"Bearer {tokens['access_token']}"})
+    db = reporting_service.SessionLocal()
+    blob = db.scalar(select(ExportBlob))
+    size = 5 * 1024**3
+    # A sparse file takes no disk space, and only the requested bytes are read.
+    with open(tmp_path / "blobs" / blob.digest[:2] / blob.digest, "r+b") as handle:
+        handle.truncate(size)
+        handle.seek(size - 6)
+        handle.write(b"THEEND")
+    etag = f'"{blob.digest}"'
+    blob.size_bytes = size
+    db.commit()
+    db.close()
+
+    tail = _download(client, asset, Range="bytes=-6")
+    assert tail.status_code == 206
+    assert tail.content == b"THEEND"
+    assert tail.headers["content-range"] == f"bytes {size - 6}-{size - 1}/{size}"
+    assert tail.headers["etag"] == etag
+    assert tail.headers["cache-control"].startswith("private, max-age=")
+    resumed = _download(client, asset, Range=f"bytes={4 * 1024**3}-{4 * 1024**3 + 3}", **{"If-Range": etag})
+    assert (resumed.status_code, resumed.content) == (206, b"\0" * 4)
+    assert _download(client, asset, Range=f"bytes={size}-").status_code == 416
+
+    not_modified = _download(client, asset, **{"If-None-Match": f'W/"stale", {etag}'})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+
+class FakeS3:
+    """Just enough of the S3 object API, checking what a real server would."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"].startswith("AWS4-HMAC-SHA256 Credential=minio/")
+        key = request.url.path
+        if request.method == "PUT":
+            body = request.read()
+            if hashlib.sha256(body).hexdigest() != request.headers["x-amz-content-sha256"]:
+                return httpx.Response(400, text="XAmzContentSHA256Mismatch")
+            self.objects[key] = body
+            return httpx.Response(200)
+        if key not in self.objects:
+            return httpx.Response(404)
+        if request.method == "DELETE":
+            del self.objects[key]
+            return httpx.Response(204)
+        body = self.objects[key]
+        if "Range" in request.headers:
+            start, end = map(int, request.headers["Range"].removeprefix("bytes=").split("-"))
+            return httpx.Response(206, content=body[start : end + 1])
+        return httpx.Response(200, content=b"" if request.method == "HEAD" else body)
+
+
+def test_s3_backend_stores_serves_and_sweeps_exports(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "EXPORT_STORAGE_BACKEND", "s3")
+    fake = FakeS3()
+    storage = S3ExportStorage(
+        "http://minio:9000", "exports", access_key_id="minio", secret_access_key="secret", prefix="reports/", transport=httpx.MockTransport(fake)
+    )
+    monkeypatch.setattr(export_storage, "get_export_storage", lambda: storage)
+    for module in ("reporting", "exports"):
+        monkeypatch.setattr(f"app.services.{module}.get_export_storage", lambda: storage)
+    monkeypatch.setattr("app.api.v1.endpoints.reporting.get_export_storage", lambda: storage)
+    tokens, survey_id, _, _ = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    asset = _export(client, survey_id, headers)
+    (key, stored), = fake.objects.items()
+    assert key == f"/exports/reports/{hashlib.sha256(stored).hexdigest()}"
+    download = _download(client, asset)
+    assert download.status_code == 200
+    assert download.content == stored and download.headers["content-type"] == "application/pdf"
+    assert list((tmp_path / "tmp").iterdir()) == []
+    etag = f'"{hashlib.sha256(stored).hexdigest()}"'
+    partial = _download(client, asset, Range="bytes=4-")
+    assert partial.status_code == 206 and partial.content == stored[4:]
+    assert partial.headers["content-range"] == f"bytes 4-{len(stored) - 1}/{len(stored)}"
+    stale = _download(client, asset, Range="bytes=4-", **{"If-Range": '"stale"'})
+    assert stale.status_code == 200 and stale.content == stored
+    assert _download(client, asset, **{"If-None-Match": etag}).status_code == 304
+
+    _expire(asset)
+    assert _sweep()["deleted_blobs"] == 1
+    assert fake.objects == {}
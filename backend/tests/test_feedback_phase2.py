@@ -1,4 +1,10 @@
+from uuid import UUID, uuid4
+
 from app.api.v1.endpoints.surveys import get_llm_dep
+from app.core.config import settings
+from app.services import submissions as submissions_service
+from app.services.invalidation import SURVEY_TOPIC, invalidation_bus
+from app.services.submissions import submission_plans
 
 
 class FakeLLM:
@@ -20,6 +26,11 @@ def register_and_login(client, email: str, password: str, full_name: str) -> dic
     return login.json()["tokens"]
 
 
+def answer_for(question: dict, text: str) -> dict:
+    value = {"rating": "4", "nps": "9", "yes_no": "Yes"}.get(question["type"], text)
+    return {"question_id": question["id"], "value": value}
+
+
 def build_published_survey(client):
     client.app.dependency_overrides[get_llm_dep] = lambda: FakeLLM()
     tokens = register_and_login(client, "phase2@insight.com", "PhaseTwo123!", "Phase Two")
@@ -73,7 +84,7 @@ def test_phase2_feedback_and_insights_flow(client):
     submit = client.post(
         f"/api/v1/public/surveys/{slug}/responses",
         json={
-            "answers": [{"question_id": q["id"], "value": "This is good but pricing is confusing"} for q in required_questions],
+            "answers": [answer_for(q, "This is good but pricing is confusing") for q in required_questions],
             "respondent_meta": {"source": "email"},
         },
     )
@@ -134,3 +145,164 @@ def test_phase2_feedback_and_insights_flow(client):
 
     client.app.dependency_overrides.clear()
 
+
+
+def test_public_submission_validation_and_single_transaction(client, count_queries):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    required_questions = [q for q in questions if q["required"]]
+
+    missing = client.post(
+        f"/api/v1/public/surveys/{slug}/responses",
+        json={"answers": [{"question_id": required_questions[0]["id"], "value": "only one"}]},
+    )
+    assert missing.status_code == 422
+    assert missing.json()["detail"] == "Missing required answers"
+
+    unknown = client.post(
+        f"/api/v1/public/surveys/{slug}/responses",
+        json={"answers": [{"question_id": "00000000-0000-0000-0000-000000000000", "value": "x"}]},
+    )
+    assert unknown.status_code == 422
+    assert unknown.json()["detail"] == "Invalid question_id"
+
+    with count_queries() as statements:
+        submit = client.post(
+            f"/api/v1/public/surveys/{slug}/responses",
+            json={"answers": [answer_for(q, "Great and fast") for q in questions]},
+        )
+    assert submit.status_code == 201
+    answer_inserts = [s for s in statements if s.startswith("INSERT INTO response_answers")]
+    assert len(answer_inserts) == 1
+    assert not any("FROM survey_questions" in s for s in statements)
+
+    detail = client.get(
+        f"/api/v1/surveys/{survey_id}/responses/{submit.json()['response_id']}",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert detail.status_code == 200
+    assert len(detail.json()["answers"]) == len(questions)
+
+    client.app.dependency_overrides.clear()
+
+
+def test_submission_plan_is_invalidated_when_questions_change(client):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    answers = [answer_for(q, "ok") for q in questions if q["required"]]
+    first = client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers})
+    assert first.status_code == 201
+
+    added = client.post(
+        f"/api/v1/surveys/{survey_id}/questions",
+        json={"type": "text", "text": "Anything else to add?", "required": True, "order": 4},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert added.status_code == 201
+
+    stale = client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers})
+    assert stale.status_code == 422
+
+    answers.append({"question_id": added.json()["id"], "value": "nothing"})
+    fresh = client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers})
+    assert fresh.status_code == 201
+
+    client.app.dependency_overrides.clear()
+
+
+def test_plan_built_before_an_edit_is_not_cached(client, monkeypatch):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    answers = [answer_for(q, "ok") for q in questions if q["required"]]
+    submission_plans.reset()
+    build = submissions_service.build_submission_plan
+
+    def build_then_edit(db, plan_survey_id):
+        plan = build(db, plan_survey_id)
+        # Another request edits the survey while this plan is being compiled.
+        invalidation_bus.publish(SURVEY_TOPIC, plan_survey_id)
+        return plan
+
+    monkeypatch.setattr(submissions_service, "build_submission_plan", build_then_edit)
+    assert client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers}).status_code == 201
+    assert submission_plans.get(UUID(survey_id)) is None
+
+    monkeypatch.setattr(submissions_service, "build_submission_plan", build)
+    assert client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers}).status_code == 201
+    assert submission_plans.get(UUID(survey_id)) is not None
+
+    monkeypatch.setattr(settings, "SUBMISSION_PLAN_CACHE_MAX_ENTRIES", 1)
+    other = submissions_service.SubmissionPlan(uuid4(), None, frozenset(), frozenset())
+    submission_plans.put(other, submission_plans.generation())
+    assert submission_plans.get(UUID(survey_id)) is None
+    assert submission_plans.get(other.survey_id) is other
+    client.app.dependency_overrides.clear()
+
+
+def test_compiled_plan_rejects_malformed_values(client, count_queries):
+    tokens = register_and_login(client, "plan@insight.com", "PlanPass123!", "Plan User")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    ws_id = client.post("/api/v1/workspaces", json={"name": "Plan WS"}, headers=headers).json()["id"]
+    project_id = client.post(f"/api/v1/workspaces/{ws_id}/projects", json={"name": "Plan Project"}, headers=headers).json()["id"]
+    survey_id = client.post(
+        f"/api/v1/projects/{project_id}/surveys", json={"title": "Plan Survey", "goal": "Validate values"}, headers=headers
+    ).json()["id"]
+    options = [{"label": label, "value": label.lower(), "order": index} for index, label in enumerate(("Red", "Blue"), start=1)]
+    specs = [
+        {"type": "single_choice", "text": "Favourite colour?", "options": options},
+        {"type": "multi_choice", "text": "Colours you like?", "options": options},
+        {"type": "rating", "text": "Rate the product"},
+        {"type": "nps", "text": "Would you recommend us?"},
+        {"type": "yes_no", "text": "Would you buy again?"},
+    ]
+    ids = {}
+    for order, spec in enumerate(specs, start=1):
+        created = client.post(f"/api/v1/surveys/{survey_id}/questions", json={**spec, "order": order}, headers=headers)
+        assert created.status_code == 201
+        ids[spec["type"]] = created.json()["id"]
+    slug = client.post(f"/api/v1/surveys/{survey_id}/publish", json={}, headers=headers).json()["public_slug"]
+
+    valid = {"single_choice": "red", "multi_choice": "red, blue", "rating": "5", "nps": "0", "yes_no": "No"}
+    with count_queries() as statements:
+        accepted = client.post(
+            f"/api/v1/public/surveys/{slug}/responses",
+            json={"answers": [{"question_id": ids[kind], "value": value} for kind, value in valid.items()]},
+        )
+    assert accepted.status_code == 201
+    assert not any("FROM survey_questions" in s or "FROM question_options" in s for s in statements)
+
+    for kind, bad_value in [
+        ("single_choice", "green"),
+        ("multi_choice", "red, green"),
+        ("rating", "6"),
+        ("nps", "ten"),
+        ("yes_no", "maybe"),
+    ]:
+        answers = [{"question_id": ids[k], "value": bad_value if k == kind else v} for k, v in valid.items()]
+        rejected = client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers})
+        assert rejected.status_code == 422, kind
+        assert ids[kind] in rejected.json()["detail"]
+
+
+def test_editing_options_after_publishing_updates_choice_validation(client):
+    tokens = register_and_login(client, "options@insight.com", "OptionPass123!", "Option User")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    ws_id = client.post("/api/v1/workspaces", json={"name": "Option WS"}, headers=headers).json()["id"]
+    project_id = client.post(f"/api/v1/workspaces/{ws_id}/projects", json={"name": "Option Project"}, headers=headers).json()["id"]
+    survey_id = client.post(
+        f"/api/v1/projects/{project_id}/surveys", json={"title": "Option Survey", "goal": "Edit options"}, headers=headers
+    ).json()["id"]
+    options = [{"label": "Red", "value": "red", "order": 1}, {"label": "Blue", "value": "blue", "order": 2}]
+    question_id = client.post(
+        f"/api/v1/surveys/{survey_id}/questions",
+        json={"type": "single_choice", "text": "Favourite colour?", "order": 1, "options": options},
+        headers=headers,
+    ).json()["id"]
+    slug = client.post(f"/api/v1/surveys/{survey_id}/publish", json={}, headers=headers).json()["public_slug"]
+
+    def submit(value: str) -> int:
+        body = {"answers": [{"question_id": question_id, "value": value}]}
+        return client.post(f"/api/v1/public/surveys/{slug}/responses", json=body).status_code
+
+    assert (submit("red"), submit("green")) == (201, 422)
+    options[0] = {"label": "Green", "value": "green", "order": 1}
+    edited = client.patch(f"/api/v1/surveys/{survey_id}/questions/{question_id}", json={"options": options}, headers=headers)
+    assert edited.status_code == 200
+    assert (submit("red"), submit("green"), submit("blue")) == (422, 201, 201)
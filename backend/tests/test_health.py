@@ -1,3 +1,6 @@
+from app.core.config import settings
+
+
 def test_health(client):
     response = client.get("/health")
     assert response.status_code == 200
@@ -11,3 +14,23 @@ def test_meta(client):
     assert data["service"] == "insightflow-backend"
     assert "version" in data
 
+
+
+def test_ready_reports_pool_state(client):
+    response = client.get("/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["checks"]["db_pool"] == "ok"
+    primary = body["pools"]["primary"]
+    assert {"pool_size", "in_use", "overflow", "checkout_wait_ms"} <= primary.keys()
+
+
+def test_metrics_require_the_configured_token(client, monkeypatch, read_metrics):
+    assert client.get("/metrics").status_code == 401
+    wrong = client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert wrong.status_code == 401 and wrong.headers["www-authenticate"] == "Bearer"
+    assert "ingestion" in read_metrics()
+    assert "/metrics" not in client.get("/openapi.json").json()["paths"]
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
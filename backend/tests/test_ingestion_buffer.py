@@ -0,0 +1,216 @@
+from uuid import UUID
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.services import ingestion as ingestion_service
+from app.services.ingestion import SubmissionBuffer, SubmissionWAL, WALLockedError, submission_buffer
+from app.services.submissions import new_pending_submission
+
+from test_feedback_phase2 import answer_for, build_published_survey
+
+
+def _answers(questions):
+    return [answer_for(q, "Clear and fast") for q in questions if q["required"]]
+
+
+def test_buffered_submission_returns_202_and_is_group_committed(client, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_MODE", "buffered")
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_DURABILITY", "memory")
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    submission_buffer.start(background=False)
+    try:
+        accepted = [
+            client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": _answers(questions)}) for _ in range(3)
+        ]
+        assert all(item.status_code == 202 for item in accepted)
+        assert all(item.json()["status"] == "queued" for item in accepted)
+
+        before = client.get(
+            f"/api/v1/surveys/{survey_id}/responses",
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+        assert before.json()["count"] == 0
+
+        submission_buffer.drain()
+        metrics = submission_buffer.metrics()
+        assert metrics["flushed"] == 3
+        assert metrics["batches"] == 1
+    finally:
+        submission_buffer.stop()
+
+    after = client.get(
+        f"/api/v1/surveys/{survey_id}/responses",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert {item["id"] for item in after.json()["items"]} == {item.json()["response_id"] for item in accepted}
+    client.app.dependency_overrides.clear()
+
+
+def test_buffered_submission_backpressure_returns_503(client, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_QUEUE_MAX", 1)
+    _, _, slug, questions = build_published_survey(client)
+    submission_buffer.start(background=False)
+    try:
+        first = client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": _answers(questions)})
+        second = client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": _answers(questions)})
+        assert first.status_code == 202
+        assert second.status_code == 503
+        assert second.headers["Retry-After"] == "1"
+        assert submission_buffer.metrics()["dropped"] == 1
+    finally:
+        submission_buffer.stop()
+    client.app.dependency_overrides.clear()
+
+
+def test_wal_records_are_replayed_once_on_startup(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_DURABILITY", "wal")
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_WAL_PATH", str(tmp_path / "submissions.wal"))
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_WAL_FSYNC", False)
+    tokens, survey_id, _, questions = build_published_survey(client)
+    answers = [(UUID(q["id"]), "replayed") for q in questions]
+
+    crashed = SubmissionBuffer()
+    crashed.start(background=False)
+    queued = new_pending_submission(UUID(survey_id), answers, respondent_meta=None)
+    crashed.enqueue(queued)
+    # Simulate a crash: the writer never flushes and the process goes away.
+    crashed._wal.close()
+    assert (tmp_path / "submissions.wal").read_text().count("\n") == 1
+
+    restarted = SubmissionBuffer()
+    restarted.start(background=False)
+    try:
+        assert (tmp_path / "submissions.wal").read_text() == ""
+        assert restarted.replay() == 0
+    finally:
+        restarted.stop()
+
+    listing = client.get(
+        f"/api/v1/surveys/{survey_id}/responses",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert [item["id"] for item in listing.json()["items"]] == [str(queued.response_id)]
+    client.app.dependency_overrides.clear()
+
+
+
+def test_wal_keeps_submissions_that_could_not_be_written(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_DURABILITY", "wal")
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_WAL_PATH", str(tmp_path / "submissions.wal"))
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_WAL_FSYNC", False)
+    # Insight runs would share the test's single SQLite connection with the retried commits.
+    monkeypatch.setattr(ingestion_service, "run_insight_analysis", lambda run_id: None)
+    tokens, survey_id, _, questions = build_published_survey(client)
+    answers = [(UUID(q["id"]), "kept") for q in questions]
+    wal = tmp_path / "submissions.wal"
+
+    buffer = SubmissionBuffer()
+    buffer.start(background=False)
+    commit = buffer._commit
+
+    def database_down(batch):
+        raise OperationalError("INSERT", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(buffer, "_commit", database_down)
+    failed = [new_pending_submission(UUID(survey_id), answers, respondent_meta=None) for _ in range(2)]
+    for item in failed:
+        buffer.enqueue(item)
+    buffer.drain()
+    assert wal.read_text().count("\n") == 2
+
+    monkeypatch.setattr(buffer, "_commit", commit)
+    written = new_pending_submission(UUID(survey_id), answers, respondent_meta=None)
+    buffer.enqueue(written)
+    buffer.drain()
+    # Failed records are not retried before UNWRITTEN_RETRY_SECONDS, and stay in the log until they are written.
+    assert {str(item.response_id) for item in failed} <= {line.split('"')[3] for line in wal.read_text().splitlines()}
+    assert buffer.metrics()["unwritten"] == 2
+
+    monkeypatch.setattr(buffer, "_retry_at", 0.0)
+    buffer.enqueue(new_pending_submission(UUID(survey_id), answers, respondent_meta=None))
+    buffer.drain()
+    assert buffer.metrics()["unwritten"] == 0
+    assert wal.read_text() == ""
+    buffer.stop()
+    listing = client.get(f"/api/v1/surveys/{survey_id}/responses", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert {str(item.response_id) for item in [*failed, written]} <= {item["id"] for item in listing.json()["items"]}
+    client.app.dependency_overrides.clear()
+
+
+def test_wal_is_compacted_while_the_queue_never_empties(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_DURABILITY", "wal")
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_WAL_PATH", str(tmp_path / "submissions.wal"))
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_WAL_FSYNC", False)
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_FLUSH_MAX_ROWS", 1)
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_UNWRITTEN_MAX", 2)
+    monkeypatch.setattr(ingestion_service, "run_insight_analysis", lambda run_id: None)
+    _, survey_id, _, questions = build_published_survey(client)
+    answers = [(UUID(q["id"]), "steady") for q in questions]
+    wal = tmp_path / "submissions.wal"
+
+    buffer = SubmissionBuffer()
+    buffer.start(background=False)
+    commit = buffer._commit
+    created, log_sizes = [], []
+
+    def submit():
+        item = new_pending_submission(UUID(survey_id), answers, respondent_meta=None)
+        created.append(item.response_id)
+        buffer.enqueue(item)
+
+    def commit_while_busy(batch):
+        if len(log_sizes) < len(created) and batch[0].response_id == created[len(log_sizes)]:
+            # A new submission arrives during every flush, so the queue is never empty.
+            log_sizes.append(wal.read_text().count("\n"))
+            if len(created) < 40:
+                submit()
+        if created.index(batch[0].response_id) % 10 == 9:
+            raise OperationalError("INSERT", {}, Exception("deadlock detected"))
+        return commit(batch)
+
+    monkeypatch.setattr(buffer, "_commit", commit_while_busy)
+    for _ in range(4):
+        submit()
+    buffer.drain()
+    assert len(log_sizes) == 40
+    # The log holds at most the live records (4 queued, up to 2 failed) twice over, plus one arrival.
+    assert max(log_sizes) <= 2 * (4 + 2) + 1
+    # Four writes failed: the newest two are kept for retry, the oldest two set aside past PUBLIC_INGEST_UNWRITTEN_MAX.
+    assert buffer.metrics()["unwritten"] == 2
+    assert [line.split('"')[3] for line in wal.read_text().splitlines()] == [str(created[29]), str(created[39])]
+    set_aside = list(tmp_path.glob("submissions.wal.failed-*"))
+    assert len(set_aside) == 1 and set_aside[0].read_text().count("\n") == 2
+    buffer.stop()
+    client.app.dependency_overrides.clear()
+
+
+def test_each_worker_gets_its_own_wal_and_abandoned_logs_are_replayed(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_DURABILITY", "wal")
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_WAL_PATH", str(tmp_path / "submissions.wal"))
+    monkeypatch.setattr(settings, "PUBLIC_INGEST_WAL_FSYNC", False)
+    tokens, survey_id, _, questions = build_published_survey(client)
+    answers = [(UUID(q["id"]), "per worker") for q in questions]
+
+    workers = [SubmissionBuffer(), SubmissionBuffer()]
+    for worker in workers:
+        worker.start(background=False)
+    assert [worker._wal.path.name for worker in workers] == ["submissions.wal", "submissions.1.wal"]
+    with pytest.raises(WALLockedError):
+        SubmissionWAL(tmp_path / "submissions.1.wal")
+
+    queued = [new_pending_submission(UUID(survey_id), answers, respondent_meta=None) for _ in workers]
+    for worker, item in zip(workers, queued):
+        worker.enqueue(item)
+    # Neither worker flushes: the first is stopped uncleanly too, the second crashes.
+    for worker in workers:
+        worker._wal.close()
+
+    restarted = SubmissionBuffer()
+    restarted.start(background=False)
+    restarted.stop()
+    assert (tmp_path / "submissions.wal").read_text() == (tmp_path / "submissions.1.wal").read_text() == ""
+    listing = client.get(f"/api/v1/surveys/{survey_id}/responses", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert {item["id"] for item in listing.json()["items"]} == {str(item.response_id) for item in queued}
+    client.app.dependency_overrides.clear()
@@ -0,0 +1,30 @@
+from app.core.config import settings
+from app.schemas.feedback import PersonaList, SurveyResponseList
+from app.schemas.reporting import ReportJobList
+from test_feedback_phase2 import answer_for, build_published_survey
+
+
+def test_list_endpoints_serialise_exactly_as_their_response_models(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_EXPORT_DIR", str(tmp_path))
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    answers = [answer_for(q, "Pricing is confusing") for q in questions if q["required"]]
+    for meta in ({"source": "email"}, None):
+        assert client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers, "respondent_meta": meta}).status_code == 201
+    assert client.post(f"/api/v1/surveys/{survey_id}/insights/run", json={"force": True}, headers=headers).status_code == 202
+    generated = client.post(f"/api/v1/surveys/{survey_id}/personas/generate", json={"force": True}, headers=headers)
+    body = {"format": "pdf", "template": "executive_summary", "include_sections": ["overview"]}
+    assert client.post(f"/api/v1/surveys/{survey_id}/reports", json=body, headers=headers).status_code == 202
+
+    # Each list is built as plain dicts; re-encoding through its model must reproduce the exact bytes.
+    pages = [
+        (SurveyResponseList, client.get(f"/api/v1/surveys/{survey_id}/responses", headers=headers)),
+        (PersonaList, generated),
+        (PersonaList, client.get(f"/api/v1/surveys/{survey_id}/personas", headers=headers)),
+        (ReportJobList, client.get(f"/api/v1/surveys/{survey_id}/reports", headers=headers)),
+    ]
+    for model, page in pages:
+        assert page.status_code == 200 and page.headers["content-type"] == "application/json"
+        assert page.json()["count"] >= 1
+        assert model.model_validate_json(page.content).model_dump_json().encode() == page.content
+    assert pages[-1][1].json()["items"][0]["asset"]["download_token"]
@@ -0,0 +1,69 @@
+from uuid import UUID
+
+from app.services.invalidation import MEMBERSHIP_TOPIC, invalidation_bus
+from app.services.membership_cache import MISS, membership_key, workspace_roles
+
+
+def register_and_login(client, email: str, password: str, full_name: str) -> dict:
+    reg = client.post("/api/v1/auth/register", json={"email": email, "password": password, "full_name": full_name})
+    assert reg.status_code == 201
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert login.status_code == 200
+    return login.json()["tokens"]
+
+
+def test_role_checks_are_cached_and_membership_changes_apply_immediately(client, count_queries, read_metrics):
+    owner = {"Authorization": f"Bearer {register_and_login(client, 'owner@roles.com', 'OwnerPass123!', 'Owner')['access_token']}"}
+    member = {"Authorization": f"Bearer {register_and_login(client, 'member@roles.com', 'MemberPass123!', 'Member')['access_token']}"}
+    workspace_id = client.post("/api/v1/workspaces", json={"name": "Roles WS"}, headers=owner).json()["id"]
+    invite = client.post(
+        f"/api/v1/workspaces/{workspace_id}/members/invite",
+        json={"email": "member@roles.com", "role": "editor"},
+        headers=owner,
+    )
+    assert invite.status_code == 201
+    member_id = invite.json()["id"]
+
+    assert client.get(f"/api/v1/workspaces/{workspace_id}", headers=member).status_code == 200
+    with count_queries() as statements:
+        assert client.get(f"/api/v1/workspaces/{workspace_id}", headers=member).status_code == 200
+    assert not any("workspace_members" in statement for statement in statements)
+
+    project = client.post(f"/api/v1/workspaces/{workspace_id}/projects", json={"name": "Cached"}, headers=member)
+    assert project.status_code == 201
+
+    downgrade = client.patch(f"/api/v1/workspaces/{workspace_id}/members/{member_id}", json={"role": "viewer"}, headers=owner)
+    assert downgrade.status_code == 200
+    denied = client.post(f"/api/v1/workspaces/{workspace_id}/projects", json={"name": "Denied"}, headers=member)
+    assert denied.status_code == 403
+    assert denied.json()["detail"] == "Insufficient role"
+
+    assert client.delete(f"/api/v1/workspaces/{workspace_id}/members/{member_id}", headers=owner).status_code == 204
+    removed = client.get(f"/api/v1/workspaces/{workspace_id}", headers=member)
+    assert removed.status_code == 403
+    assert removed.json()["detail"] == "Not a workspace member"
+
+    metrics = read_metrics()["membership_cache"]
+    assert metrics["hits"] >= 1
+    assert metrics["invalidations"] >= 3
+    assert 0 < metrics["hit_rate"] < 1
+
+
+def test_claimed_invitation_replaces_cached_non_member_and_peer_notifications_apply(client):
+    owner = {"Authorization": f"Bearer {register_and_login(client, 'owner@claim.com', 'OwnerPass123!', 'Owner')['access_token']}"}
+    workspace_id = client.post("/api/v1/workspaces", json={"name": "Claim WS"}, headers=owner).json()["id"]
+    invite = client.post(
+        f"/api/v1/workspaces/{workspace_id}/members/invite",
+        json={"email": "later@claim.com", "role": "viewer"},
+        headers=owner,
+    )
+    assert invite.status_code == 201
+
+    later = {"Authorization": f"Bearer {register_and_login(client, 'later@claim.com', 'LaterPass123!', 'Later')['access_token']}"}
+    assert client.get(f"/api/v1/workspaces/{workspace_id}", headers=later).status_code == 200
+
+    me = client.get("/api/v1/auth/me", headers=later).json()
+    user_id = UUID(me["id"])
+    assert workspace_roles.get(user_id, UUID(workspace_id)) is not MISS
+    invalidation_bus.receive(f"{MEMBERSHIP_TOPIC}:{membership_key(workspace_id, user_id)}")
+    assert workspace_roles.get(user_id, UUID(workspace_id)) is MISS
@@ -0,0 +1,114 @@
+from datetime import UTC, datetime
+import uuid
+from uuid import UUID
+
+from sqlalchemy import insert
+
+from app.models.feedback import SurveyResponse
+from app.models.hardening import ReportJob, ReportStatus
+from app.models.survey import Survey
+from app.services import events as events_service
+
+from test_feedback_phase2 import build_published_survey
+
+
+def _collect(client, url: str, headers: dict, limit: int) -> tuple[list[str], int]:
+    seen: list[str] = []
+    pages = 0
+    cursor = None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get(url, params=params, headers=headers)
+        assert page.status_code == 200
+        pages += 1
+        seen.extend(item["id"] for item in page.json()["items"])
+        cursor = page.json()["next_cursor"]
+        if cursor is None:
+            return seen, pages
+
+
+def test_responses_keyset_pagination_is_stable_across_timestamp_ties(client):
+    tokens, survey_id, _, _ = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    submitted_at = datetime(2026, 1, 1, tzinfo=UTC)
+    db = events_service.SessionLocal()
+    try:
+        # Identical timestamps force every page boundary onto the id tie-breaker.
+        db.execute(
+            insert(SurveyResponse),
+            [{"id": uuid.uuid4(), "survey_id": UUID(survey_id), "submitted_at": submitted_at} for _ in range(25)],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    url = f"/api/v1/surveys/{survey_id}/responses"
+    seen, pages = _collect(client, url, headers, limit=10)
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 25
+    assert seen == sorted(seen, reverse=True)
+
+    first = client.get(url, params={"limit": 10}, headers=headers).json()
+    tampered = first["next_cursor"][:-2] + ("AA" if not first["next_cursor"].endswith("AA") else "BB")
+    assert client.get(url, params={"cursor": tampered}, headers=headers).status_code == 400
+    assert client.get(url, params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+
+
+def test_cursors_are_scoped_to_their_listing(client):
+    tokens, survey_id, _, _ = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    survey = client.get(f"/api/v1/surveys/{survey_id}", headers=headers).json()
+    project_id = survey["survey"]["project_id"]
+    for index in range(4):
+        created = client.post(
+            f"/api/v1/projects/{project_id}/surveys",
+            json={"title": f"Extra survey {index}", "goal": "Measure pagination behaviour"},
+            headers=headers,
+        )
+        assert created.status_code == 201
+
+    surveys_url = f"/api/v1/projects/{project_id}/surveys"
+    seen, pages = _collect(client, surveys_url, headers, limit=2)
+    assert len(seen) == len(set(seen)) == 5
+    assert pages == 3
+
+    cursor = client.get(surveys_url, params={"limit": 2}, headers=headers).json()["next_cursor"]
+    other = client.get(f"/api/v1/surveys/{survey_id}/responses", params={"cursor": cursor}, headers=headers)
+    assert other.status_code == 400
+    filtered = client.get(surveys_url, params={"cursor": cursor, "status": "draft"}, headers=headers)
+    assert filtered.status_code == 400
+
+
+def test_frontend_list_helpers_see_every_survey_and_report(client):
+    tokens, survey_id, _, _ = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    project_id = client.get(f"/api/v1/surveys/{survey_id}", headers=headers).json()["survey"]["project_id"]
+    owner = UUID(client.get("/api/v1/auth/me", headers=headers).json()["id"])
+    stamps = {"created_at": datetime(2026, 1, 1, tzinfo=UTC), "updated_at": datetime(2026, 1, 1, tzinfo=UTC)}
+    db = events_service.SessionLocal()
+    try:
+        db.execute(
+            insert(Survey),
+            [
+                {"id": uuid.uuid4(), "project_id": UUID(project_id), "title": f"Survey {i}", "goal": "Page", "created_by": owner, **stamps}
+                for i in range(120)
+            ],
+        )
+        db.execute(
+            insert(ReportJob),
+            [
+                {"id": uuid.uuid4(), "survey_id": UUID(survey_id), "created_by": owner, "status": ReportStatus.completed, "format": "pdf", **stamps}
+                for _ in range(25)
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    # api.listSurveys and api.listReports (frontend/assets/js/common.js) request pages of 100 and follow next_cursor.
+    surveys, survey_pages = _collect(client, f"/api/v1/projects/{project_id}/surveys", headers, limit=100)
+    reports, report_pages = _collect(client, f"/api/v1/surveys/{survey_id}/reports", headers, limit=100)
+    assert (len(set(surveys)), survey_pages) == (121, 2)
+    assert (len(set(reports)), report_pages) == (25, 1)
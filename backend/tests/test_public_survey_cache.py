@@ -0,0 +1,71 @@
+from uuid import UUID, uuid4
+
+from app.core.config import settings
+from app.services.invalidation import SURVEY_TOPIC, InvalidationBus, invalidation_bus
+from app.services.survey_cache import PublicSurveyCache, public_surveys
+
+from test_feedback_phase2 import build_published_survey
+
+
+def test_public_survey_cache_hit_skips_database_and_edits_invalidate(client, count_queries, read_metrics):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    first = client.get(f"/api/v1/public/surveys/{slug}")
+    assert first.status_code == 200
+    with count_queries() as statements:
+        second = client.get(f"/api/v1/public/surveys/{slug}")
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert statements == []
+    assert read_metrics()["public_survey_cache"]["hits"] == 1
+
+    renamed = client.patch(f"/api/v1/surveys/{survey_id}", json={"title": "Renamed survey"}, headers=headers)
+    assert renamed.status_code == 200
+    assert client.get(f"/api/v1/public/surveys/{slug}").json()["survey"]["title"] == "Renamed survey"
+
+    removed = client.delete(f"/api/v1/surveys/{survey_id}/questions/{questions[-1]['id']}", headers=headers)
+    assert removed.status_code == 204
+    assert len(client.get(f"/api/v1/public/surveys/{slug}").json()["questions"]) == len(questions) - 1
+
+    closed = client.post(f"/api/v1/surveys/{survey_id}/close", headers=headers)
+    assert closed.status_code == 200
+    assert client.get(f"/api/v1/public/surveys/{slug}").status_code == 409
+
+
+def test_public_survey_cache_lru_bound_and_stale_fill(monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_SURVEY_CACHE_MAX_ENTRIES", 2)
+    cache = PublicSurveyCache()
+    ids = [uuid4() for _ in range(3)]
+    for index, survey_id in enumerate(ids[:2]):
+        cache.put(f"slug-{index}", survey_id, b"{}", cache.generation())
+    assert cache.get("slug-0") == b"{}"
+    cache.put("slug-2", ids[2], b"{}", cache.generation())
+    assert cache.get("slug-1") is None
+    assert cache.get("slug-0") == b"{}"
+    assert cache.metrics()["evictions"] == 1
+
+    generation = cache.generation()
+    cache.invalidate_survey(ids[0])
+    cache.put("slug-0", ids[0], b'{"stale": true}', generation)
+    assert cache.get("slug-0") is None
+
+
+def test_invalidations_from_another_worker_are_applied_on_poll(client, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_BACKEND", "database")
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_POLL_INTERVAL_MS", 60000)
+    _, survey_id, slug, _ = build_published_survey(client)
+    assert client.get(f"/api/v1/public/surveys/{slug}").status_code == 200
+    assert public_surveys.get(slug) is not None
+
+    other_worker = InvalidationBus()
+    invalidation_bus.start()
+    other_worker.start()
+    try:
+        other_worker.publish(SURVEY_TOPIC, UUID(survey_id))
+        assert public_surveys.get(slug) is not None
+        assert invalidation_bus.poll() == 1
+        assert public_surveys.get(slug) is None
+    finally:
+        other_worker.stop()
+        invalidation_bus.stop()
@@ -0,0 +1,175 @@
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Engine, event, insert, text
+
+from app.db.session import get_db
+from app.models import (
+    InsightRecommendation,
+    InsightRun,
+    InsightSummary,
+    InsightTheme,
+    Persona,
+    ResponseAnswer,
+    Survey,
+    SurveyResponseModel as SurveyResponse,
+    User,
+    Workspace,
+    WorkspaceMember,
+)
+from app.models.feedback import InsightRunStatus
+from app.models.workspace import WorkspaceRole
+from app.services.survey_cache import public_surveys
+from test_feedback_phase2 import build_published_survey
+
+HOT_TABLES = {
+    "survey_responses",
+    "response_answers",
+    "survey_questions",
+    "insight_runs",
+    "insight_summaries",
+    "insight_themes",
+    "insight_recommendations",
+    "personas",
+    "workspace_members",
+    "surveys",
+}
+
+
+def _seed(db, survey_id: uuid.UUID, question_ids: list[uuid.UUID], workspace_id: uuid.UUID, owner_id: uuid.UUID) -> None:
+    now = datetime.now(timezone.utc)
+    survey = db.get(Survey, survey_id)
+    other_surveys = [
+        {
+            "id": uuid.uuid4(),
+            "project_id": survey.project_id,
+            "title": f"Other {i}",
+            "goal": "Volume",
+            "created_by": owner_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(50)
+    ]
+    db.execute(insert(Survey), other_surveys)
+    survey_ids = [survey_id] + [row["id"] for row in other_surveys]
+
+    responses = [
+        {"id": uuid.uuid4(), "survey_id": survey_ids[i % len(survey_ids)], "submitted_at": now - timedelta(seconds=i), "created_at": now, "updated_at": now}
+        for i in range(5000)
+    ]
+    db.execute(insert(SurveyResponse), responses)
+    db.execute(
+        insert(ResponseAnswer),
+        [{"id": uuid.uuid4(), "response_id": row["id"], "question_id": qid, "value": "4"} for row in responses for qid in question_ids],
+    )
+
+    runs, summaries, themes, recommendations, personas = [], [], [], [], []
+    for i in range(1000):
+        run_id, summary_id = uuid.uuid4(), uuid.uuid4()
+        owner_survey = survey_ids[i % len(survey_ids)]
+        runs.append({"id": run_id, "survey_id": owner_survey, "status": InsightRunStatus.completed, "created_at": now, "updated_at": now})
+        summaries.append(
+            {"id": summary_id, "run_id": run_id, "survey_id": owner_survey, "overview": "o", "sentiment_distribution": {}, "generated_at": now - timedelta(minutes=i)}
+        )
+        themes.extend({"id": uuid.uuid4(), "summary_id": summary_id, "label": "t", "count": 1, "sentiment": "neutral"} for _ in range(3))
+        recommendations.extend({"id": uuid.uuid4(), "summary_id": summary_id, "title": "r", "detail": "d", "priority": "low"} for _ in range(3))
+        personas.append(
+            {"id": uuid.uuid4(), "survey_id": owner_survey, "run_id": run_id, "name": "p", "summary": "s", "key_traits": [], "frustrations": [], "goals": [], "created_at": now, "updated_at": now}
+        )
+    for model, rows in (
+        (InsightRun, runs),
+        (InsightSummary, summaries),
+        (InsightTheme, themes),
+        (InsightRecommendation, recommendations),
+        (Persona, personas),
+    ):
+        db.execute(insert(model), rows)
+
+    users = [
+        {"id": uuid.uuid4(), "email": f"volume{i}@insight.com", "password_hash": "x", "full_name": "Volume", "created_at": now, "updated_at": now}
+        for i in range(500)
+    ]
+    db.execute(insert(User), users)
+    workspaces = [{"id": uuid.uuid4(), "name": f"Volume {i}", "owner_id": owner_id, "created_at": now, "updated_at": now} for i in range(100)]
+    db.execute(insert(Workspace), workspaces)
+    workspace_ids = [workspace_id] + [row["id"] for row in workspaces]
+    db.execute(
+        insert(WorkspaceMember),
+        [
+            {
+                "id": uuid.uuid4(),
+                "workspace_id": workspace_ids[i % len(workspace_ids)],
+                "user_id": row["id"],
+                "role": WorkspaceRole.viewer,
+                "status": "active",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, row in enumerate(users)
+        ],
+    )
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+
+def _full_scans(connection, statement: str, parameters) -> list[str]:
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans = []
+    for row in rows:
+        detail = row[-1]
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in HOT_TABLES and "USING" not in detail:
+            scans.append(detail)
+    return scans
+
+
+def test_hot_read_paths_use_indexes(client):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    project_id = client.get(f"/api/v1/surveys/{survey_id}", headers=headers).json()["survey"]["project_id"]
+    workspace_id = client.get(f"/api/v1/projects/{project_id}", headers=headers).json()["workspace_id"]
+    owner_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+
+    sessions = client.app.dependency_overrides[get_db]()
+    db = next(sessions)
+    try:
+        engine = db.get_bind()
+        _seed(db, uuid.UUID(survey_id), [uuid.UUID(q["id"]) for q in questions], uuid.UUID(workspace_id), uuid.UUID(owner_id))
+        run_id = db.scalar(text("SELECT run_id FROM insight_summaries WHERE survey_id = :id LIMIT 1"), {"id": uuid.UUID(survey_id).hex})
+    finally:
+        sessions.close()
+    public_surveys.reset()
+
+    urls = [
+        f"/api/v1/surveys/{survey_id}",
+        f"/api/v1/public/surveys/{slug}",
+        f"/api/v1/surveys/{survey_id}/responses",
+        f"/api/v1/surveys/{survey_id}/insights/latest",
+        f"/api/v1/surveys/{survey_id}/insights/runs/{uuid.UUID(run_id)}",
+        f"/api/v1/surveys/{survey_id}/reports",
+        f"/api/v1/surveys/{survey_id}/personas",
+        f"/api/v1/projects/{project_id}/surveys",
+        "/api/v1/workspaces",
+        f"/api/v1/workspaces/{workspace_id}/members",
+    ]
+    captured: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    # Listening on the Engine class also covers the async engine (its sync_engine) behind the async endpoints.
+    event.listen(Engine, "before_cursor_execute", capture)
+    try:
+        for url in urls:
+            assert client.get(url, headers=headers).status_code == 200, url
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture)
+
+    explained = " ".join(statement for statement, _ in captured)
+    assert all(table in explained for table in ("survey_responses", "response_answers", "insight_summaries", "insight_themes")), explained
+    with engine.connect() as connection:
+        offenders = {statement: scans for statement, parameters in captured if (scans := _full_scans(connection, statement, parameters))}
+    assert not offenders, offenders
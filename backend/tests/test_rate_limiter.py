@@ -0,0 +1,81 @@
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.hardening import RateLimitCounter
+from app.services import rate_limit
+from app.services.rate_limit import DatabaseRateLimitStore, SharedRateLimiter, SlidingWindowRateLimiter
+
+
+def test_sliding_window_weights_previous_window(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit, "monotonic", lambda: clock[0])
+    limiter = SlidingWindowRateLimiter(max_keys=10)
+
+    assert [limiter.allow("ip:/a", limit=4, window_seconds=10) for _ in range(5)] == [True] * 4 + [False]
+    assert limiter.allow("ip:/b", limit=4, window_seconds=10)
+
+    # A quarter into the next window, 3 of the previous 4 hits still count.
+    clock[0] = 1012.5
+    assert limiter.allow("ip:/a", limit=4, window_seconds=10)
+    assert not limiter.allow("ip:/a", limit=4, window_seconds=10)
+
+    # Two windows later the old counts have aged out entirely.
+    clock[0] = 1030.0
+    assert [limiter.allow("ip:/a", limit=4, window_seconds=10) for _ in range(5)] == [True] * 4 + [False]
+
+
+def test_idle_keys_are_evicted_at_the_cap(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(rate_limit, "monotonic", lambda: clock[0])
+    limiter = SlidingWindowRateLimiter(max_keys=3)
+    for key in ("a", "b", "c"):
+        limiter.allow(key, limit=5, window_seconds=60)
+
+    # "a" rolls into a new window, so it becomes the most recent entry.
+    clock[0] = 61.0
+    limiter.allow("a", limit=5, window_seconds=60)
+    limiter.allow("d", limit=5, window_seconds=60)
+
+    assert len(limiter) == 3
+    assert limiter.evictions == 1
+    assert set(limiter._buckets) == {"a", "c", "d"}
+
+
+def test_workers_sharing_a_sqlite_store_enforce_one_limit(monkeypatch, tmp_path):
+    monkeypatch.setattr(rate_limit, "time", lambda: 6000.0)
+    engine = rate_limit._sqlite_engine(str(tmp_path / "limits.db"))
+    workers = [
+        SharedRateLimiter(DatabaseRateLimitStore(engine), batch=3, max_keys=100),
+        SharedRateLimiter(DatabaseRateLimitStore(engine), batch=3, max_keys=100),
+    ]
+
+    decisions = [workers[index % 2].hit("1.2.3.4:/public", limit=10, window_seconds=60) for index in range(30)]
+    allowed = sum(decision.allowed for decision in decisions)
+    round_trips = sum(worker.metrics()["round_trips"] for worker in workers)
+
+    # Permits a worker reserved but never used may be lost, never granted twice.
+    assert 6 <= allowed <= 10
+    assert round_trips < allowed
+    assert decisions[-1].remaining == 0
+    assert decisions[-1].retry_after == 60
+
+    # The next window starts from the previous count, weighted by its overlap.
+    monkeypatch.setattr(rate_limit, "time", lambda: 6090.0)
+    assert workers[0].hit("1.2.3.4:/public", limit=10, window_seconds=60).allowed
+    with engine.connect() as connection:
+        windows = connection.execute(select(RateLimitCounter.window_index, RateLimitCounter.count)).all()
+    assert sorted(window for window, _ in windows) == [100, 101]
+
+
+def test_public_responses_carry_rate_limit_headers(client, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_RATE_LIMIT_REQUESTS", 2)
+    missing = client.get("/api/v1/public/surveys/s_missing")
+    assert missing.status_code == 404
+    assert missing.headers["x-ratelimit-limit"] == "2"
+    assert missing.headers["x-ratelimit-remaining"] == "1"
+    assert client.get("/api/v1/public/surveys/s_missing").headers["x-ratelimit-remaining"] == "0"
+
+    limited = client.get("/api/v1/public/surveys/s_missing")
+    assert limited.status_code == 429
+    assert int(limited.headers["retry-after"]) >= 1
+    assert "x-ratelimit-limit" not in client.get("/health").headers
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+import pytest
+
+from app.core.config import settings
+from app.db import session as session_module
+from app.db.base import Base
+from app.db.replicas import ReplicaSet, replicas
+from test_feedback_phase2 import answer_for, build_published_survey
+
+
+@pytest.fixture()
+def standby(client, monkeypatch, tmp_path):
+    """Route reads to an empty SQLite file, i.e. a replica that has not caught up with anything."""
+    monkeypatch.setattr(session_module, "pool_monitors", dict(session_module.pool_monitors))
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_MAX_LAG_SECONDS", 5.0)
+    replica_set = ReplicaSet([f"sqlite:///{tmp_path / 'replica.db'}"], lag_probe=lambda connection: 0.0)
+    Base.metadata.create_all(bind=replica_set.replicas[0].engine)
+    monkeypatch.setattr(replicas, "replicas", replica_set.replicas)
+    monkeypatch.setattr(replicas, "lag_probe", replica_set.lag_probe)
+    monkeypatch.setattr(replicas, "_recent_writers", OrderedDict())
+    yield replica_set
+    for replica in replica_set.replicas:
+        replica.engine.dispose()
+        client.portal.call(replica.async_engine.dispose)
+
+
+def _submit(client, slug: str, questions: list[dict]) -> None:
+    answers = [answer_for(q, "Clear enough") for q in questions if q["required"]]
+    assert client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers}).status_code == 201
+
+
+def test_reads_follow_the_replica_unless_the_caller_just_wrote(client, standby):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    _submit(client, slug, questions)
+    responses_url = f"/api/v1/surveys/{survey_id}/responses"
+
+    # The owner just wrote (survey setup), so their reads stay on the primary.
+    assert client.get(responses_url, headers=headers).json()["count"] == 1
+    assert replicas.metrics()["sticky_reads"] >= 1
+
+    replicas._recent_writers.clear()
+    # The empty replica answers now; access checks still ran against the primary.
+    assert client.get(responses_url, headers=headers).json()["count"] == 0
+    assert client.get(f"/api/v1/surveys/{survey_id}/personas", headers=headers).json()["items"] == []
+
+    assert client.patch(f"/api/v1/surveys/{survey_id}", json={"goal": "Sharper goal"}, headers=headers).status_code == 200
+    assert client.get(responses_url, headers=headers).json()["count"] == 1
+
+
+def test_lagging_or_unreachable_replicas_fall_back_to_the_primary(client, standby, monkeypatch, tmp_path, read_metrics):
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    _submit(client, slug, questions)
+    replicas._recent_writers.clear()
+    responses_url = f"/api/v1/surveys/{survey_id}/responses"
+    assert client.get(responses_url, headers=headers).json()["count"] == 0
+
+    monkeypatch.setattr(replicas, "lag_probe", lambda connection: 60.0)
+    replicas.check()
+    assert client.get(responses_url, headers=headers).json()["count"] == 1
+    assert client.get("/ready").json()["checks"]["replicas"] == "primary_fallback"
+
+    monkeypatch.setattr(replicas, "lag_probe", lambda connection: 0.0)
+    replicas.check()
+    assert client.get(responses_url, headers=headers).json()["count"] == 0
+
+    unreachable = ReplicaSet([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+    monkeypatch.setattr(replicas, "replicas", unreachable.replicas)
+    replicas.check()
+    assert client.get(responses_url, headers=headers).json()["count"] == 1
+    metrics = read_metrics()["read_replicas"]
+    assert metrics["replicas"]["replica0"]["healthy"] is False
+    assert metrics["primary_fallbacks"] >= 1
+
+
+def test_reads_rotate_across_replicas(monkeypatch, tmp_path):
+    monkeypatch.setattr(session_module, "pool_monitors", dict(session_module.pool_monitors))
+    replica_set = ReplicaSet([f"sqlite:///{tmp_path / 'a.db'}", f"sqlite:///{tmp_path / 'b.db'}"], lag_probe=lambda connection: 0.0)
+    try:
+        assert [replica_set.pick().name for _ in range(4)] == ["replica0", "replica1", "replica0", "replica1"]
+        replica_set.replicas[0].healthy = False
+        assert {replica_set.pick().name for _ in range(4)} == {"replica1"}
+    finally:
+        for replica in replica_set.replicas:
+            replica.engine.dispose()
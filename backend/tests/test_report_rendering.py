@@ -0,0 +1,170 @@
+from datetime import UTC, datetime, timedelta
+import gzip
+from io import BytesIO
+import re
+import tracemalloc
+import uuid
+import zlib
+
+from app.core.config import settings
+from app.models.feedback import ResponseAnswer, SurveyResponse
+from app.models.survey import QuestionType, Survey, SurveyQuestion
+from app.services import report_rendering
+from app.services import reporting as reporting_service
+from app.services.pdf import PdfWriter, wrap_text
+from app.services.report_rendering import QuestionRow, ReportContent, load_report_content, render_cache_key
+from app.services.report_workers import render_to_file
+from test_feedback_phase2 import answer_for, build_published_survey
+
+
+def _export(client, survey_id: str, headers: dict, **payload) -> tuple[dict, bytes]:
+    body = {"format": "pdf", "template": "executive_summary", "include_sections": ["overview", "themes", "recommendations"], **payload}
+    created = client.post(f"/api/v1/surveys/{survey_id}/reports", json=body, headers=headers)
+    assert created.status_code == 202
+    job = client.get(f"/api/v1/surveys/{survey_id}/reports/{created.json()['report_id']}", headers=headers).json()
+    assert job["status"] == "completed", job
+    download = client.get(f"/api/v1/exports/{job['asset']['asset_id']}/download", params={"token": job["asset"]["download_token"]})
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/pdf"
+    return job["asset"], download.content
+
+
+def test_repeat_exports_reuse_the_cached_render(client, monkeypatch, tmp_path, read_metrics):
+    monkeypatch.setattr(settings, "REPORT_EXPORT_DIR", str(tmp_path))
+    monkeypatch.setitem(reporting_service.render_cache_stats, "hits", 0)
+    monkeypatch.setitem(reporting_service.render_cache_stats, "misses", 0)
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    answers = [answer_for(q, "Checkout was quick and clear") for q in questions if q["required"]]
+    assert client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers}).status_code == 201
+
+    first_asset, first = _export(client, survey_id, headers)
+    second_asset, second = _export(client, survey_id, headers, include_sections=["recommendations", "themes", "overview"])
+    assert first.startswith(b"%PDF-1.4") and first.rstrip().endswith(b"%%EOF")
+    assert first == second
+    assert first_asset["asset_id"] != second_asset["asset_id"]
+    assert first_asset["download_token"] != second_asset["download_token"]
+    assert reporting_service.render_cache_stats == {"hits": 1, "misses": 1}
+    assert len(list((tmp_path / "blobs").glob("*/*"))) == 1
+
+    _, slides = _export(client, survey_id, headers, format="slides")
+    assert b"/MediaBox [0 0 960 540]" in slides
+    _, detailed = _export(client, survey_id, headers, template="detailed_analysis")
+    assert detailed != first
+    assert reporting_service.render_cache_stats == {"hits": 1, "misses": 3}
+    assert read_metrics()["report_render_cache"] == {"hits": 1, "misses": 3}
+
+    rejected = client.post(f"/api/v1/surveys/{survey_id}/reports", json={"template": "unknown"}, headers=headers)
+    assert rejected.status_code == 422
+
+
+def test_pdf_writer_cross_reference_table_points_at_objects():
+    def write() -> bytes:
+        out = BytesIO()
+        writer = PdfWriter(out, title="Résumé (draft)")
+        for number in range(3):
+            page = writer.add_page()
+            page.text(56, 80, f"Page {number} \\ (escaped) — ok", size=14, bold=True)
+            page.rect(56, 100, 200, 12, fill=(0.2, 0.6, 0.4))
+            page.line(56, 120, 256, 120)
+        writer.close()
+        return out.getvalue()
+
+    data = write()
+    assert data == write()
+
+    xref_at = int(re.search(rb"startxref\n(\d+)\n%%EOF", data).group(1))
+    assert data[xref_at:].startswith(b"xref\n0 12\n")
+    offsets = [int(entry[:10]) for entry in re.findall(rb"(\d{10} 00000 n )", data[xref_at:])]
+    assert len(offsets) == 11
+    for number, offset in enumerate(offsets, start=1):
+        assert data[offset:].startswith(f"{number} 0 obj\n".encode())
+    assert b"/Count 3" in data
+
+
+def test_render_cache_key_changes_when_an_appendix_question_is_reworded():
+    question_id = uuid.uuid4()
+    keys = []
+    for text in ("What should we improve?", "What should we fix first?"):
+        content = ReportContent(survey_id=uuid.UUID(int=1), survey_title="Survey", open_questions=[QuestionRow(question_id, text)])
+        keys.append(render_cache_key(content, "executive_summary", ["overview", "responses"], "pdf"))
+    assert keys[0] != keys[1]
+
+
+def test_wrap_text_respects_width():
+    lines = wrap_text("alpha beta gamma delta " * 10 + "x" * 200, 10, 120)
+    assert len(lines) > 5
+    assert all(line for line in lines)
+    assert "".join(lines).replace(" ", "") == ("alphabetagammadelta" * 10) + "x" * 200
+
+
+def _page_text(pdf: bytes) -> bytes:
+    return b"\n".join(zlib.decompress(stream) for stream in re.findall(rb"stream\n(.*?)\nendstream", pdf, re.S))
+
+
+def test_responses_appendix_streams_every_open_text_answer(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_EXPORT_DIR", str(tmp_path))
+    tokens, survey_id, slug, questions = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    for index in range(3):
+        answers = [answer_for(q, f"Answer {index} to {q['text']}") for q in questions]
+        assert client.post(f"/api/v1/public/surveys/{slug}/responses", json={"answers": answers}).status_code == 201
+
+    created = client.post(
+        f"/api/v1/surveys/{survey_id}/reports",
+        json={"include_sections": ["overview", "responses"], "compression": "gzip"},
+        headers=headers,
+    )
+    job = client.get(f"/api/v1/surveys/{survey_id}/reports/{created.json()['report_id']}", headers=headers).json()
+    assert job["status"] == "completed", job
+    assert job["compression"] == "gzip"
+    assert job["asset"]["file_name"].endswith(".pdf.gz") and job["asset"]["mime_type"] == "application/gzip"
+    download = client.get(f"/api/v1/exports/{job['asset']['asset_id']}/download", params={"token": job["asset"]["download_token"]})
+    text = _page_text(gzip.decompress(download.content))
+    assert b"Appendix: responses" in text
+    for question in (q for q in questions if q["type"] == "text"):
+        assert question["text"].encode() in text
+        for index in range(3):
+            assert f"Answer {index} to {question['text']}".encode() in text
+    assert b"Answer 0 to Rate us" not in text
+
+
+def _render_peak_bytes(survey_id: uuid.UUID, path) -> int:
+    db = reporting_service.SessionLocal()
+    try:
+        content = load_report_content(db, db.get(Survey, survey_id), None, ["responses"])
+    finally:
+        db.close()
+    tracemalloc.start()
+    try:
+        render_to_file(content, "detailed_analysis", ["responses"], "pdf", path, None, reporting_service.SessionLocal)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_responses_appendix_memory_does_not_grow_with_answers(client, monkeypatch, tmp_path):
+    # Both renders span several cursor batches, so only what accumulates across them could differ.
+    monkeypatch.setattr(report_rendering, "APPENDIX_BATCH_ROWS", 100)
+    survey_id = uuid.uuid4()
+    db = reporting_service.SessionLocal()
+    # SQLite does not enforce foreign keys here, so the survey needs no owner or project rows.
+    db.add(Survey(id=survey_id, project_id=uuid.uuid4(), title="Bulk", goal="Scale", created_by=uuid.uuid4()))
+    question = SurveyQuestion(id=uuid.uuid4(), survey_id=survey_id, type=QuestionType.text, text="Anything else?", order_index=1)
+    db.add(question)
+    started = datetime(2026, 1, 1, tzinfo=UTC)
+
+    def add_answers(first: int, last: int) -> None:
+        responses = [SurveyResponse(id=uuid.uuid4(), survey_id=survey_id, submitted_at=started + timedelta(seconds=i)) for i in range(first, last)]
+        db.add_all(responses)
+        db.add_all(ResponseAnswer(response_id=r.id, question_id=question.id, value=f"Answer {i}: delivery tracking was vague " * 3) for i, r in enumerate(responses))
+        db.commit()
+
+    add_answers(0, 500)
+    small = _render_peak_bytes(survey_id, tmp_path / "small.pdf")
+    add_answers(500, 2500)
+    large = _render_peak_bytes(survey_id, tmp_path / "large.pdf")
+    db.close()
+
+    assert (tmp_path / "large.pdf").stat().st_size > 3 * (tmp_path / "small.pdf").stat().st_size
+    assert large < small * 1.25
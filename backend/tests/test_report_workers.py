@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.services.report_rendering import ReportContent, ThemeRow
+from app.services.report_workers import ReportRenderer, RenderLimitError, report_renderer
+from test_feedback_phase2 import build_published_survey
+
+
+def test_reports_render_in_worker_processes_and_queue_is_bounded(client, monkeypatch, tmp_path, read_metrics):
+    monkeypatch.setattr(settings, "REPORT_EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "REPORT_RENDER_WORKERS", 1)
+    tokens, survey_id, _, _ = build_published_survey(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    body = {"format": "slides", "template": "executive_summary", "include_sections": ["overview"]}
+    try:
+        created = client.post(f"/api/v1/surveys/{survey_id}/reports", json=body, headers=headers)
+        assert created.status_code == 202
+        job = client.get(f"/api/v1/surveys/{survey_id}/reports/{created.json()['report_id']}", headers=headers).json()
+        assert job["status"] == "completed", job
+        metrics = read_metrics()["report_rendering"]
+        assert metrics["workers"] == 1 and metrics["completed"] >= 1 and metrics["in_flight"] == 0
+
+        monkeypatch.setattr(settings, "REPORT_RENDER_QUEUE_MAX", 0)
+        report_renderer.admit()
+        try:
+            busy = client.post(f"/api/v1/surveys/{survey_id}/reports", json=body, headers=headers)
+        finally:
+            report_renderer.release()
+        assert busy.status_code == 503
+        assert busy.headers["Retry-After"] == "5"
+        assert client.post(f"/api/v1/surveys/{survey_id}/reports", json=body, headers=headers).status_code == 202
+    finally:
+        report_renderer.stop()
+
+
+def test_render_caps_fail_the_job_but_keep_the_worker(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_RENDER_WORKERS", 1)
+    content = ReportContent(
+        survey_id=uuid.uuid4(),
+        survey_title="Large",
+        summary_id=uuid.uuid4(),
+        generated_at=datetime(2026, 1, 1),
+        themes=[ThemeRow(f"Theme {i}", i, "neutral", "A representative quote " * 20) for i in range(2000)],
+    )
+    renderer = ReportRenderer()
+    try:
+        monkeypatch.setattr(settings, "REPORT_RENDER_TIMEOUT_SECONDS", 0.05)
+        with pytest.raises(RenderLimitError, match="exceeded 0.05s"):
+            asyncio.run(renderer.render(content, "detailed_analysis", ["themes"], "pdf", tmp_path / "slow.pdf"))
+
+        monkeypatch.setattr(settings, "REPORT_RENDER_TIMEOUT_SECONDS", 60.0)
+        monkeypatch.setattr(settings, "REPORT_RENDER_MEMORY_MB", 2)
+        # Pages stream to disk, so only one block larger than the cap trips it.
+        content.themes = [ThemeRow("Long", 1, "neutral", "word " * 200_000)]
+        with pytest.raises(RenderLimitError, match="exceeded 2 MB"):
+            asyncio.run(renderer.render(content, "detailed_analysis", ["themes"], "pdf", tmp_path / "large.pdf"))
+
+        monkeypatch.setattr(settings, "REPORT_RENDER_MEMORY_MB", 512)
+        asyncio.run(renderer.render(content, "executive_summary", ["themes"], "pdf", tmp_path / "ok.pdf"))
+        assert (tmp_path / "ok.pdf").read_bytes().startswith(b"%PDF")
+        assert not (tmp_path / "slow.pdf").exists() and not (tmp_path / "large.pdf").exists()
+        metrics = renderer.metrics()
+        assert (metrics["completed"], metrics["limit_exceeded"], metrics["workers_replaced"]) == (1, 2, 0)
+    finally:
+        renderer.stop()
+
+
+def test_a_stuck_render_does_not_fail_jobs_running_beside_it(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_RENDER_WORKERS", 2)
+    content = ReportContent(
+        survey_id=uuid.uuid4(),
+        survey_title="Large",
+        summary_id=uuid.uuid4(),
+        generated_at=datetime(2026, 1, 1),
+        themes=[ThemeRow(f"Theme {i}", i, "neutral", "A representative quote " * 20) for i in range(4000)],
+    )
+    renderer = ReportRenderer()
+
+    async def scenario() -> None:
+        small = ReportContent(survey_id=uuid.uuid4(), survey_title="Small", summary_id=uuid.uuid4(), generated_at=datetime(2026, 1, 1))
+        # Start both workers before timing anything.
+        await asyncio.gather(*(renderer.render(small, "executive_summary", [], "pdf", tmp_path / f"warm{i}.pdf") for i in range(2)))
+        healthy = asyncio.create_task(renderer.render(content, "detailed_analysis", ["themes"], "pdf", tmp_path / "healthy.pdf"))
+        await asyncio.sleep(0.1)
+        # The parent gives up on this one long before the worker's own deadline, as it would on a worker that ignores it.
+        monkeypatch.setattr("app.services.report_workers.TIMEOUT_GRACE_SECONDS", 0.3 - settings.REPORT_RENDER_TIMEOUT_SECONDS)
+        with pytest.raises(RenderLimitError):
+            await renderer.render(content, "detailed_analysis", ["themes"], "pdf", tmp_path / "stuck.pdf")
+        monkeypatch.undo()
+        monkeypatch.setattr(settings, "REPORT_RENDER_WORKERS", 2)
+        digest, size = await healthy
+        assert size == (tmp_path / "healthy.pdf").stat().st_size
+        await renderer.render(small, "executive_summary", [], "pdf", tmp_path / "after.pdf")
+
+    try:
+        asyncio.run(scenario())
+        metrics = renderer.metrics()
+        assert (metrics["workers_replaced"], metrics["limit_exceeded"], metrics["failed"]) == (1, 1, 1)
+    finally:
+        renderer.stop()
@@ -199,3 +199,92 @@ def test_ai_generate_normalizes_alias_question_types(client):
     assert detail.json()["questions"][1]["type"] == "multi_choice"
 
     client.app.dependency_overrides.clear()
+
+
+def test_survey_detail_query_count_is_constant(client, count_queries):
+    tokens, _, project_id = setup_project(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    def build_survey(question_count: int) -> tuple[str, str]:
+        survey = client.post(
+            f"/api/v1/projects/{project_id}/surveys",
+            json={"title": f"Sized survey {question_count}", "goal": "Count queries"},
+            headers=headers,
+        )
+        assert survey.status_code == 201
+        survey_id = survey.json()["id"]
+        for order in range(1, question_count + 1):
+            added = client.post(
+                f"/api/v1/surveys/{survey_id}/questions",
+                json={
+                    "type": "single_choice",
+                    "text": f"Question number {order}",
+                    "order": order,
+                    "options": [
+                        {"label": label, "value": label.lower(), "order": index}
+                        for index, label in enumerate(("Yes", "No", "Maybe"), start=1)
+                    ],
+                },
+                headers=headers,
+            )
+            assert added.status_code == 201
+        publish = client.post(f"/api/v1/surveys/{survey_id}/publish", json={}, headers=headers)
+        assert publish.status_code == 200
+        return survey_id, publish.json()["public_slug"]
+
+    counts = {}
+    for question_count in (2, 40):
+        survey_id, slug = build_survey(question_count)
+        with count_queries() as detail_statements:
+            detail = client.get(f"/api/v1/surveys/{survey_id}", headers=headers)
+        with count_queries() as public_statements:
+            public = client.get(f"/api/v1/public/surveys/{slug}")
+        assert detail.status_code == 200
+        assert public.status_code == 200
+        assert len(detail.json()["questions"]) == question_count
+        assert [option["value"] for option in public.json()["questions"][0]["options"]] == ["yes", "no", "maybe"]
+        counts[question_count] = (len(detail_statements), len(public_statements))
+
+    assert counts[2] == counts[40]
+
+
+def test_survey_authorization_is_one_joined_query(client, count_queries):
+    tokens, ws_id, project_id = setup_project(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    viewer_tokens = register_and_login(client, "viewer@survey.com", "ViewerPass123!", "Viewer User")
+    viewer_headers = {"Authorization": f"Bearer {viewer_tokens['access_token']}"}
+    outsider_tokens = register_and_login(client, "outsider@survey.com", "Outsider123!", "Outsider User")
+    outsider_headers = {"Authorization": f"Bearer {outsider_tokens['access_token']}"}
+    invite = client.post(
+        f"/api/v1/workspaces/{ws_id}/members/invite",
+        json={"email": "viewer@survey.com", "role": "viewer"},
+        headers=headers,
+    )
+    assert invite.status_code == 201
+    survey = client.post(
+        f"/api/v1/projects/{project_id}/surveys",
+        json={"title": "Access survey", "goal": "Check authorization"},
+        headers=headers,
+    )
+    assert survey.status_code == 201
+    survey_id = survey.json()["id"]
+
+    with count_queries() as statements:
+        detail = client.get(f"/api/v1/surveys/{survey_id}", headers=viewer_headers)
+    assert detail.status_code == 200
+    membership_lookups = [statement for statement in statements if "workspace_members" in statement]
+    assert len(membership_lookups) == 1
+    assert "JOIN projects" in membership_lookups[0]
+    assert not any(statement.lstrip().startswith("SELECT projects.") for statement in statements)
+
+    viewer_edit = client.patch(f"/api/v1/surveys/{survey_id}", json={"title": "Renamed"}, headers=viewer_headers)
+    assert viewer_edit.status_code == 403
+    assert viewer_edit.json()["detail"] == "Insufficient role"
+    outsider = client.get(f"/api/v1/surveys/{survey_id}", headers=outsider_headers)
+    assert outsider.status_code == 403
+    assert outsider.json()["detail"] == "Not a workspace member"
+    missing = client.get("/api/v1/surveys/00000000-0000-0000-0000-000000000000", headers=headers)
+    assert missing.status_code == 404
+    assert missing.json()["detail"] == "Survey not found"
+    outsider_reports = client.get(f"/api/v1/surveys/{survey_id}/reports", headers=outsider_headers)
+    assert outsider_reports.status_code == 403
@@ -0,0 +1,124 @@
+from datetime import UTC, datetime, timedelta
+import gzip
+import uuid
+
+from sqlalchemy import delete, func, select
+
+from app.models.hardening import UsageEvent, UsageEventRollup
+from app.services import usage_rollups as usage_rollups_service
+from app.services.usage_rollups import (
+    HyperLogLog,
+    compact_usage_events,
+    maintenance_lock,
+    rollup_usage_events,
+    run_usage_maintenance,
+)
+
+
+def register_and_login(client, email: str, password: str, full_name: str) -> dict:
+    reg = client.post("/api/v1/auth/register", json={"email": email, "password": password, "full_name": full_name})
+    assert reg.status_code == 201
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert login.status_code == 200
+    return login.json()["tokens"]
+
+
+def test_hyperloglog_estimates_and_merges():
+    left, right = HyperLogLog(), HyperLogLog()
+    for index in range(3000):
+        left.add(uuid.UUID(int=index).bytes)
+    for index in range(2000, 5000):
+        right.add(uuid.UUID(int=index).bytes)
+    assert abs(left.estimate() - 3000) < 3000 * 0.1
+    left.merge(HyperLogLog.from_text(right.to_text()))
+    assert abs(left.estimate() - 5000) < 5000 * 0.1
+    assert HyperLogLog().estimate() == 0
+
+
+def test_rollups_serve_overview_and_retention_compacts_raw_events(client, tmp_path, count_queries):
+    tokens = register_and_login(client, "rollup@insight.com", "RollupPass123!", "Rollup User")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    ws = client.post("/api/v1/workspaces", json={"name": "Rollup WS"}, headers=headers)
+    assert ws.status_code == 201
+    workspace_id = uuid.UUID(ws.json()["id"])
+
+    today = datetime.now(UTC).replace(hour=12, minute=0, second=0, microsecond=0)
+    users = [uuid.uuid4() for _ in range(3)]
+    db = usage_rollups_service.SessionLocal()
+    try:
+        # Drop the workspace.created event so counts only cover the seeded rows.
+        db.execute(delete(UsageEvent))
+        for days_ago in (0, 1, 200):
+            for user_id in users:
+                for event_name in ("dashboard.viewed", "survey.opened"):
+                    db.add(
+                        UsageEvent(
+                            workspace_id=workspace_id,
+                            user_id=user_id,
+                            event_name=event_name,
+                            created_at=today - timedelta(days=days_ago),
+                        )
+                    )
+        db.commit()
+
+        rolled_days = rollup_usage_events(db)
+        assert len(rolled_days) == 201
+        assert db.scalar(select(func.count()).select_from(UsageEventRollup)) == 6
+
+        deleted = compact_usage_events(db, retention_days=90, batch_size=4, archive_dir=tmp_path)
+        assert deleted == 6
+        assert db.scalar(select(func.count()).select_from(UsageEvent)) == 12
+        archive = next(tmp_path.glob("usage_events_*.jsonl.gz"))
+        with gzip.open(archive, "rt", encoding="utf-8") as handle:
+            assert len(handle.read().splitlines()) == 6
+    finally:
+        db.close()
+
+    with count_queries() as statements:
+        overview = client.get(
+            f"/api/v1/workspaces/{workspace_id}/analytics/overview",
+            params={"from": (today - timedelta(days=300)).date().isoformat()},
+            headers=headers,
+        )
+    assert overview.status_code == 200
+    body = overview.json()
+    assert body["total_events"] == 18
+    assert body["distinct_users"] == 3
+    assert {item["event_name"]: item["count"] for item in body["events"]} == {"dashboard.viewed": 9, "survey.opened": 9}
+    assert len(body["daily"]) == 3
+    assert not any("FROM usage_events" in statement for statement in statements)
+
+    default_window = client.get(f"/api/v1/workspaces/{workspace_id}/analytics/overview", headers=headers)
+    assert default_window.json()["total_events"] == 12
+
+    outsider = register_and_login(client, "outsider@insight.com", "OutsiderPass123!", "Outsider")
+    denied = client.get(
+        f"/api/v1/workspaces/{workspace_id}/analytics/overview",
+        headers={"Authorization": f"Bearer {outsider['access_token']}"},
+    )
+    assert denied.status_code == 403
+
+
+def test_usage_maintenance_runs_in_one_process_at_a_time(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(usage_rollups_service.settings, "USAGE_EVENT_RETENTION_DAYS", 30)
+    monkeypatch.setattr(usage_rollups_service.settings, "USAGE_EVENT_ARCHIVE_DIR", str(tmp_path))
+    db = usage_rollups_service.SessionLocal()
+    try:
+        db.execute(delete(UsageEvent))
+        old = datetime.now(UTC) - timedelta(days=60)
+        db.add_all(UsageEvent(event_name="dashboard.viewed", created_at=old) for _ in range(3))
+        db.commit()
+
+        # Another worker holds the lock: this one skips rather than rolling up and archiving the same rows.
+        with maintenance_lock(db) as acquired:
+            assert acquired
+            assert run_usage_maintenance() == {"skipped": True}
+        assert db.scalar(select(func.count()).select_from(UsageEvent)) == 3
+
+        assert run_usage_maintenance() == {"rolled_up_days": 61, "deleted_events": 3}
+        assert db.scalar(select(func.count()).select_from(UsageEvent)) == 0
+        archive = next(tmp_path.glob("usage_events_*.jsonl.gz"))
+        with gzip.open(archive, "rt", encoding="utf-8") as handle:
+            assert len(handle.read().splitlines()) == 3
+    finally:
+        db.close()
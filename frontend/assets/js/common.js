@@ -308,6 +308,19 @@
     return loaded;
   }
 
+  // Keyset-paginated lists return at most `limit` items plus a `next_cursor`; follow it to the end.
+  async function listAllPages(path) {
+    var items = [];
+    var cursor = null;
+    do {
+      var response = await apiCall('GET', path + '?limit=100' + (cursor ? '&cursor=' + encodeURIComponent(cursor) : ''));
+      if (!response.ok) return response;
+      items = items.concat(response.data.items || []);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return { ok: true, status: 200, data: { items: items, next_cursor: null, count: items.length } };
+  }
+
   var api = {
     call: apiCall,
 
@@ -357,7 +370,7 @@
     listPersonas: function (surveyId) { return apiCall('GET', '/surveys/' + surveyId + '/personas'); },
 
     createReport: function (surveyId, body) { return apiCall('POST', '/surveys/' + surveyId + '/reports', body); },
-    listReports: function (surveyId) { return apiCall('GET', '/surveys/' + surveyId + '/reports'); },
+    listReports: function (surveyId) { return listAllPages('/surveys/' + surveyId + '/reports'); },
     getReport: function (surveyId, reportId) { return apiCall('GET', '/surveys/' + surveyId + '/reports/' + reportId); },
 
     surveyAnalytics: async function (surveyId) {
@@ -370,7 +383,7 @@
     },
 
     listSurveys: async function (projectId) {
-      var response = await apiCall('GET', '/projects/' + projectId + '/surveys');
+      var response = await listAllPages('/projects/' + projectId + '/surveys');
       if (!response.ok) return response;
       var items = response.data.items || response.data || [];
       var enriched = await Promise.all(items.map(async function (survey) {